@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+🔁 MCP stdio JSON-RPC 부하 생성기
+
+src/servers/의 각 서버를 하위 프로세스로 띄우고 stdio로 MCP 요청을 보냅니다.
+initialize / tools/list / tools/call 요청을 지정한 비율로 섞어, 동시에 최대 --concurrency개까지
+응답을 기다리지 않고 이어서 보내며(파이프라이닝) 다음을 측정합니다.
+- 초당 처리 요청 수, 메서드별 p50/p95/p99 지연 시간, 오류/시간 초과 수
+- 서버 프로세스 CPU 시간과 최대 RSS
+
+백엔드가 필요한 도구도 가짜 CLI 설정(benchmarks/fake_backend.json)으로 실행되므로 네트워크가 필요 없습니다.
+
+사용법:
+    python benchmarks/load_generator.py
+    python benchmarks/load_generator.py -S orchestration_server -S collaborative_ai_orchestrator --requests 2000 --concurrency 32
+    python benchmarks/load_generator.py --mix tools/list=1,tools/call=1 --call get_orchestration_stats
+    python benchmarks/load_generator.py -S mcp_ai_orchestrator --call execute_gemini --args '{"prompt": "안녕"}' --rate 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from run_benchmarks import DEFAULT_CONFIG, PROJECT_ROOT, RESULTS_DIR, git_commit
+
+SERVERS_DIR = PROJECT_ROOT / "src" / "servers"
+PROTOCOL_VERSION = "2024-11-05"
+
+# 서버별 기본 tools/call 대상 (백엔드를 호출하지 않는 도구로 프로토콜 처리 비용만 측정)
+SERVERS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "orchestration_server": ("get_orchestration_stats", {}),
+    "enhanced_collaborative_server": ("get_collaboration_stats", {}),
+    "basic_collaborative_server": ("get_collaboration_info", {}),
+    "ultra_simple_server": ("simple_test", {"message": "load"}),
+    "collaborative_ai_orchestrator": ("get_collaboration_stats", {}),
+    "mcp_ai_orchestrator": ("get_statistics", {}),
+    "working_collaborative_server": ("get_stats", {}),
+    "simple_test_server": ("hello_world", {}),
+}
+
+DEFAULT_MIX = {"initialize": 1, "tools/list": 4, "tools/call": 5}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """"tools/list=1,tools/call=3" → {메서드: 가중치}"""
+    mix = {}
+    for part in text.split(","):
+        method, _, weight = part.partition("=")
+        method = method.strip()
+        if method not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"지원하지 않는 메서드: {method} (가능: {', '.join(DEFAULT_MIX)})")
+        mix[method] = float(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(values: List[float]) -> Dict[str, Any]:
+    """지연 시간 목록 요약 (밀리초)"""
+    ms = [v * 1000 for v in values]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3) if ms else None,
+        "p95_ms": round(percentile(ms, 95), 3) if ms else None,
+        "p99_ms": round(percentile(ms, 99), 3) if ms else None,
+        "max_ms": round(max(ms), 3) if ms else None
+    }
+
+
+def process_usage(pid: int) -> Optional[Dict[str, float]]:
+    """/proc에서 CPU 시간(초)과 최대 RSS(KB) 읽기 (Linux 외에는 None)"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status", "r") as f:
+            status = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return {
+        "cpu_seconds": (int(fields[11]) + int(fields[12])) / ticks,
+        "peak_rss_kb": int(status.get("VmHWM", "0 kB").split()[0])
+    }
+
+
+class StdioClient:
+    """서버 하위 프로세스와 줄 단위 JSON-RPC로 통신 (응답은 id로 짝지음)"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read_loop())
+        self.non_json_lines = 0
+
+    async def _read_loop(self):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                self.non_json_lines += 1
+                continue
+            future = self._pending.pop(message.get("id"), None) if isinstance(message, dict) else None
+            if future and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("서버 프로세스가 종료되었습니다"))
+        self._pending.clear()
+
+    async def _write(self, message: Dict[str, Any]):
+        self.process.stdin.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def close(self, grace: float = 5.0):
+        if self.process.stdin and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), grace)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self._reader.cancel()
+
+
+def initialize_params() -> Dict[str, Any]:
+    return {
+        "protocolVersion": PROTOCOL_VERSION,
+        "capabilities": {},
+        "clientInfo": {"name": "mcp-load-generator", "version": "1.0.0"}
+    }
+
+
+async def run_load(server: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """서버 하나를 띄워 부하를 걸고 측정값 반환"""
+    tool, tool_args = SERVERS[server]
+    if args.call:
+        tool, tool_args = args.call, args.args
+    params = {
+        "initialize": initialize_params(),
+        "tools/list": {},
+        "tools/call": {"name": tool, "arguments": tool_args}
+    }
+    methods = list(args.mix)
+    weights = [args.mix[m] for m in methods]
+    rng = random.Random(args.seed)
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, str(SERVERS_DIR / f"{server}.py"),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=None if args.verbose else asyncio.subprocess.DEVNULL,
+        cwd=str(PROJECT_ROOT),
+        env={**os.environ, "MCP_COLLAB_CONFIG": str(args.config.resolve())},
+        limit=16 * 1024 * 1024
+    )
+    client = StdioClient(process)
+    latencies: Dict[str, List[float]] = {m: [] for m in methods}
+    errors: Dict[str, int] = {"jsonrpc": 0, "timeout": 0, "disconnected": 0}
+    method_errors: Dict[str, int] = {m: 0 for m in methods}
+
+    try:
+        started = time.perf_counter()
+        try:
+            await client.request("initialize", initialize_params(), args.timeout)
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            return {"error": f"initialize 실패: {e or type(e).__name__}"}
+        startup = time.perf_counter() - started
+        await client.notify("notifications/initialized")
+        usage_before = process_usage(process.pid)
+
+        window = asyncio.Semaphore(args.concurrency)
+
+        async def one(method: str):
+            try:
+                sent = time.perf_counter()
+                try:
+                    response = await client.request(method, params[method], args.timeout)
+                except asyncio.TimeoutError:
+                    errors["timeout"] += 1
+                    return
+                except ConnectionError:
+                    errors["disconnected"] += 1
+                    return
+                if "error" in response or (response.get("result") or {}).get("isError"):
+                    errors["jsonrpc"] += 1
+                    method_errors[method] += 1
+                latencies[method].append(time.perf_counter() - sent)
+            finally:
+                window.release()
+
+        tasks = []
+        load_started = time.perf_counter()
+        for i in range(args.requests):
+            if args.rate:
+                # 개방 루프: 응답과 무관하게 일정한 간격으로 전송 (동시 요청 상한은 유지)
+                delay = load_started + i / args.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await window.acquire()
+            if process.returncode is not None:
+                window.release()
+                errors["disconnected"] += args.requests - i
+                break
+            tasks.append(asyncio.create_task(one(rng.choices(methods, weights)[0])))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - load_started
+        usage_after = process_usage(process.pid)
+    finally:
+        await client.close()
+
+    completed = sum(len(v) for v in latencies.values())
+    all_latencies = [v for values in latencies.values() for v in values]
+    result = {
+        "requests": args.requests,
+        "completed": completed,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 4),
+        "requests_per_second": round(completed / elapsed, 2) if elapsed else None,
+        "startup_seconds": round(startup, 4),
+        "latency": latency_summary(all_latencies),
+        "by_method": {m: {**latency_summary(v), "errors": method_errors[m]} for m, v in latencies.items()},
+        "tool": tool,
+        "non_json_lines": client.non_json_lines
+    }
+    if usage_before and usage_after:
+        result["server"] = {
+            "cpu_seconds": round(usage_after["cpu_seconds"] - usage_before["cpu_seconds"], 3),
+            "cpu_per_request_ms": round((usage_after["cpu_seconds"] - usage_before["cpu_seconds"]) / completed * 1000, 3)
+            if completed else None,
+            "peak_rss_kb": usage_after["peak_rss_kb"]
+        }
+    return result
+
+
+def print_summary(results: Dict[str, Dict[str, Any]]):
+    print(f"\n{'서버':<32}{'req/s':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'오류':>6}{'CPU(s)':>8}{'RSS(MB)':>9}")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:<32}❌ {r['error']}")
+            continue
+        lat, server = r["latency"], r.get("server", {})
+        errors = sum(r["errors"].values())
+        rss = server.get("peak_rss_kb")
+        print(f"{name:<32}{r['requests_per_second'] or 0:>9.1f}{lat['p50_ms'] or 0:>10.2f}{lat['p95_ms'] or 0:>10.2f}"
+              f"{lat['p99_ms'] or 0:>10.2f}{errors:>6}{server.get('cpu_seconds', 0):>8.2f}"
+              f"{(rss / 1024 if rss else 0):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP stdio JSON-RPC 부하 생성기")
+    parser.add_argument("-S", "--server", action="append", choices=sorted(SERVERS),
+                        help="대상 서버 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--requests", type=int, default=1000, help="서버별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="응답을 기다리지 않고 보낼 수 있는 최대 요청 수")
+    parser.add_argument("--rate", type=float, help="초당 전송 요청 수 (지정하면 개방 루프)")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="메서드 비율 (기본: initialize=1,tools/list=4,tools/call=5)")
+    parser.add_argument("--call", help="tools/call로 호출할 도구 (기본: 서버별 통계 도구)")
+    parser.add_argument("--args", type=json.loads, default={}, help="--call 도구 인자 (JSON)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청별 응답 대기 시간 (초)")
+    parser.add_argument("--seed", type=int, default=0, help="메서드 순서 난수 시드")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="서버에 전달할 설정 파일 (가짜 CLI 프로필)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로 (기본: benchmarks/results/load-<시각>-<커밋>.json)")
+    parser.add_argument("--verbose", action="store_true", help="서버 stderr 출력")
+    args = parser.parse_args()
+
+    results = {}
+    for server in args.server or list(SERVERS):
+        print(f"🔁 {server}: 요청 {args.requests}개, 동시 {args.concurrency}개...", file=sys.stderr)
+        results[server] = asyncio.run(run_load(server, args))
+
+    commit = git_commit()
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "mix": args.mix,
+        "servers": results
+    }
+    output = args.output or RESULTS_DIR / f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_summary(results)
+    print(f"\n💾 결과 저장: {output}")
+    sys.exit(1 if any("error" in r for r in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
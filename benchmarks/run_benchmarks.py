@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+📈 협업 워크플로우 크리티컬 패스 벤치마크
+
+가짜 CLI(src/tools/fake_backend.py)를 고정 지연 프로필로 실행해 서버의 실제 실행 경로를
+측정합니다. 시나리오마다 별도 프로세스에서 실행하며 다음을 기록합니다.
+- 벽시계 시간, 백엔드 호출 수
+- 크리티컬 패스: 앞 호출이 끝난 뒤 시작한 호출들의 가장 긴 사슬 (호출 수, 초)
+- 이론적 최소: 데이터 의존성만 지켰을 때의 호출 수와 시간 (지연 프로필 기준)
+- 최대 RSS (서버 프로세스, CLI 자식 프로세스)
+
+사용법:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py -s quick_discussion -s compare_approaches --repeat 5
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/<이전 결과>.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+SRC_DIR = PROJECT_ROOT / "src"
+DEFAULT_CONFIG = BENCH_DIR / "fake_backend.json"
+RESULTS_DIR = BENCH_DIR / "results"
+
+# 호출 사슬 판정 시 허용 오차 (이벤트 루프 스케줄링 지연)
+CHAIN_EPSILON = 0.002
+
+Call = Tuple[str, float, float]
+Latency = Dict[str, float]
+
+
+def backend_latency(config_path: Path) -> Latency:
+    """가짜 CLI 프로필에서 백엔드별 호출 한 번의 이상적인 소요 시간"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        backends = json.load(f).get("fake_backend", {}).get("backends", {})
+    latency = {}
+    for name, profile in backends.items():
+        spec = profile.get("latency", {})
+        if spec.get("distribution", "fixed") != "fixed":
+            raise SystemExit(f"❌ {name}: 벤치마크는 fixed 지연 분포만 지원합니다")
+        latency[name] = float(profile.get("startup_seconds", 0)) + float(spec.get("seconds", 0))
+    return latency
+
+
+def critical_path(calls: List[Call]) -> Tuple[int, float]:
+    """앞 호출이 끝난 뒤 시작한 호출들의 가장 긴 사슬 (호출 수, 실제 소요 시간 합)"""
+    ordered = sorted(calls, key=lambda c: c[2])
+    best: List[Tuple[float, int]] = []
+    for i, (_, start, end) in enumerate(ordered):
+        before = [best[j] for j in range(i) if ordered[j][2] <= start + CHAIN_EPSILON]
+        seconds, depth = max(before, default=(0.0, 0))
+        best.append((seconds + end - start, depth + 1))
+    if not best:
+        return 0, 0.0
+    seconds, depth = max(best)
+    return depth, seconds
+
+
+def workflow_minimum(name: Optional[str], latency: Latency) -> Tuple[int, float]:
+    """워크플로우 그래프의 의존성 기준 최소 (호출 수, 시간), 실행 시점에 정해지는 백엔드는 느린 쪽으로 계산
+
+    extract 노드는 입력 노드의 JSON에서 값을 얻는다고 보고 호출 시간을 0으로 계산
+    """
+    from utils.workflow_engine import load_workflow
+
+    graph = load_workflow(name)
+    slowest = max(latency.values())
+    finish: Dict[str, float] = {}
+    for node_id in graph.topological_order():
+        node = graph.nodes[node_id]
+        if node.extract:
+            finish[node_id] = finish[node.extract["from"]]
+            continue
+        choice = graph.speculative_input(node)
+        start = max((finish[d] for d in node.inputs if d != choice), default=0.0)
+        finish[node_id] = max(start + latency.get(node.backend, slowest), finish[choice] if choice else 0.0)
+    return graph.critical_path_length(), max(finish.values(), default=0.0)
+
+
+async def _collaborative_task(index: int):
+    from servers.collaborative_ai_orchestrator import CollaborativeAIOrchestrator
+    await CollaborativeAIOrchestrator().execute_collaborative_task(f"벤치마크 작업 #{index}: 캐시 계층 설계")
+
+
+async def _collaborative_task_fast(index: int):
+    from servers.collaborative_ai_orchestrator import CollaborativeAIOrchestrator
+    await CollaborativeAIOrchestrator().execute_collaborative_task(f"벤치마크 작업 #{index}: 캐시 계층 설계", "fast")
+
+
+async def _quick_discussion(index: int):
+    from servers.collaborative_ai_orchestrator import CollaborativeAIOrchestrator
+    await CollaborativeAIOrchestrator().quick_discussion(f"벤치마크 주제 #{index}: 모놀리스와 마이크로서비스")
+
+
+async def _compare_approaches(index: int):
+    from servers.collaborative_ai_orchestrator import CollaborativeAIOrchestrator
+    await CollaborativeAIOrchestrator().compare_approaches(f"벤치마크 작업 #{index}: 로그 수집 파이프라인")
+
+
+async def _parallel_tasks(index: int):
+    from servers.mcp_ai_orchestrator import AIOrchestrator
+    tasks = [{"description": f"벤치마크 병렬 작업 #{index}-{i}: 모듈 {i} 리팩터링"} for i in range(4)]
+    await AIOrchestrator().execute_parallel_tasks(tasks)
+
+
+async def _simple_collaboration(index: int):
+    from servers.working_collaborative_server import WorkingCollaborativeAI
+    await WorkingCollaborativeAI().simple_collaboration(f"벤치마크 작업 #{index}: API 오류 처리")
+
+
+# 이름 -> (실행 함수, 이론적 최소 (호출 수, 시간))
+SCENARIOS: Dict[str, Tuple[Callable[[int], Awaitable[None]], Callable[[Latency], Tuple[int, float]]]] = {
+    "collaborative_task": (_collaborative_task, lambda lat: workflow_minimum(None, lat)),
+    "collaborative_task_fast": (_collaborative_task_fast, lambda lat: workflow_minimum("fast", lat)),
+    "quick_discussion": (_quick_discussion, lambda lat: (1, max(lat["gemini"], lat["claude"]))),
+    "compare_approaches": (_compare_approaches, lambda lat: (2, max(lat["gemini"], lat["claude"]) + lat["gemini"])),
+    # 작업마다 할당 질문(gemini) 후 할당된 AI 실행, 할당 결과는 느린 쪽으로 계산
+    "parallel_tasks": (_parallel_tasks, lambda lat: (2, lat["gemini"] + max(lat["gemini"], lat["claude"]))),
+    # 두 분석은 서로 독립, 종합은 claude
+    "simple_collaboration": (_simple_collaboration, lambda lat: (2, max(lat["gemini"], lat["claude"]) + lat["claude"])),
+}
+
+
+async def run_scenario(name: str, repeat: int, latency: Latency) -> Dict[str, Any]:
+    """(자식 프로세스에서) 시나리오를 repeat번 실행하고 측정값 반환"""
+    # 서버 모듈 import 비용이 첫 실행 시간에 섞이지 않도록 미리 로드
+    import servers.collaborative_ai_orchestrator  # noqa: F401
+    import servers.mcp_ai_orchestrator  # noqa: F401
+    import servers.working_collaborative_server  # noqa: F401
+    from utils.backend_runner import get_backend_runner
+
+    run, minimum = SCENARIOS[name]
+    runner = get_backend_runner()
+    calls: List[Call] = []
+    original = runner._run
+
+    async def timed_run(ai, prompt, on_chunk):
+        started = time.perf_counter()
+        try:
+            return await original(ai, prompt, on_chunk)
+        finally:
+            calls.append((ai, started, time.perf_counter()))
+
+    runner._run = timed_run
+    min_calls, min_seconds = minimum(latency)
+    runs = []
+    for index in range(repeat):
+        calls.clear()
+        started = time.perf_counter()
+        await run(index)
+        wall = time.perf_counter() - started
+        depth, path_seconds = critical_path(calls)
+        durations = [end - start for _, start, end in calls]
+        # 지연 프로필을 넘는 호출당 시간 (CLI 프로세스 기동/종료, 파이프 처리)
+        call_overhead = [end - start - latency.get(ai, 0) for ai, start, end in calls]
+        runs.append({
+            "wall_seconds": round(wall, 4),
+            "backend_calls": len(calls),
+            "critical_path_calls": depth,
+            "critical_path_seconds": round(path_seconds, 4),
+            # 크리티컬 패스 위 호출 밖에서 보낸 시간 (스케줄링, 프롬프트 구성, 결과 처리)
+            "orchestration_seconds": round(wall - path_seconds, 4),
+            "call_seconds_mean": round(statistics.mean(durations), 4) if durations else 0,
+            "call_overhead_seconds_mean": round(statistics.mean(call_overhead), 4) if calls else 0,
+            "parallelism": round(sum(durations) / wall, 3) if wall else 0
+        })
+
+    wall = statistics.median(r["wall_seconds"] for r in runs)
+    depth = max(r["critical_path_calls"] for r in runs)
+    return {
+        "wall_seconds": round(wall, 4),
+        "backend_calls": runs[-1]["backend_calls"],
+        "critical_path": {
+            "calls": depth,
+            "seconds": round(statistics.median(r["critical_path_seconds"] for r in runs), 4)
+        },
+        "theoretical_min": {"calls": min_calls, "seconds": round(min_seconds, 4)},
+        "critical_path_ratio": round(depth / min_calls, 3) if min_calls else None,
+        "overhead_seconds": round(wall - min_seconds, 4),
+        "orchestration_seconds": round(statistics.median(r["orchestration_seconds"] for r in runs), 4),
+        "call_overhead_seconds": round(statistics.median(r["call_overhead_seconds_mean"] for r in runs), 4),
+        "efficiency": round(min_seconds / wall, 3) if wall else None,
+        "peak_rss_kb": {
+            "server": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "backends": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        },
+        "runs": runs
+    }
+
+
+def worker_main(name: str, repeat: int, config_path: Path):
+    """자식 프로세스 진입점: 결과 JSON 한 줄을 stdout에 출력"""
+    sys.path.insert(0, str(SRC_DIR))
+    result = asyncio.run(run_scenario(name, repeat, backend_latency(config_path)))
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_in_subprocess(name: str, repeat: int, config_path: Path, verbose: bool) -> Dict[str, Any]:
+    env = {**os.environ, "MCP_COLLAB_CONFIG": str(config_path)}
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", name,
+         "--repeat", str(repeat), "--config", str(config_path)],
+        env=env, capture_output=True, text=True
+    )
+    if verbose and proc.stderr:
+        sys.stderr.write(proc.stderr)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"종료 코드 {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def print_summary(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None) -> List[str]:
+    """결과 표 출력, baseline 대비 벽시계 시간 변화율이 담긴 회귀 목록 반환"""
+    print(f"\n{'시나리오':<26}{'시간(s)':>9}{'최소(s)':>9}{'효율':>7}{'조율(s)':>9}{'호출':>6}{'경로/최소':>11}{'RSS(MB)':>9}  비교")
+    regressions = []
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:<26}❌ {r['error']}")
+            continue
+        change = ""
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        if base and "wall_seconds" in base:
+            delta = (r["wall_seconds"] - base["wall_seconds"]) / base["wall_seconds"]
+            change = f"{delta:+.1%}"
+            if r["critical_path"]["calls"] != base["critical_path"]["calls"]:
+                change += f" (경로 {base['critical_path']['calls']}→{r['critical_path']['calls']})"
+            regressions.append((name, delta))
+        path = f"{r['critical_path']['calls']}/{r['theoretical_min']['calls']}"
+        print(f"{name:<26}{r['wall_seconds']:>9.3f}{r['theoretical_min']['seconds']:>9.3f}"
+              f"{r['efficiency']:>7.0%}{r['orchestration_seconds']:>9.3f}{r['backend_calls']:>6}{path:>11}"
+              f"{r['peak_rss_kb']['server'] / 1024:>9.1f}  {change}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="협업 워크플로우 크리티컬 패스 벤치마크")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="시나리오별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="가짜 CLI 지연 프로필이 담긴 설정 파일")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float,
+                        help="baseline 대비 벽시계 시간 증가율이 이 값을 넘으면 종료 코드 1 (예: 0.2)")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    config_path = args.config.resolve()
+
+    if args.worker:
+        worker_main(args.worker, args.repeat, config_path)
+        return
+
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    for name in names:
+        print(f"⏱️ {name} 실행 중...", file=sys.stderr)
+        results[name] = run_in_subprocess(name, args.repeat, config_path, args.verbose)
+
+    commit = git_commit()
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "latency_profile": backend_latency(config_path),
+        "scenarios": results
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = print_summary(results, baseline)
+    print(f"\n💾 결과 저장: {output}")
+
+    failed = any("error" in r for r in results.values())
+    if args.max_regression is not None:
+        slow = [(name, delta) for name, delta in regressions if delta > args.max_regression]
+        for name, delta in slow:
+            print(f"⚠️ {name}: 벽시계 시간 {delta:+.1%} (허용 {args.max_regression:+.0%})")
+        failed = failed or bool(slow)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
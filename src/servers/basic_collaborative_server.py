@@ -3,84 +3,24 @@
 Basic Collaborative Server - gemini/claude CLI 없이도 작동하는 기본 협업 시뮬레이터
 """
 import asyncio
-import json
+import os
 import sys
 
-async def main():
-    """기본 MCP 서버"""
-    while True:
-        try:
-            line = await asyncio.get_event_loop().run_in_executor(None, input)
-            if not line:
-                break
-                
-            data = json.loads(line)
-            
-            if data.get("method") == "initialize":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {
-                            "name": "basic-collaborative-ai",
-                            "version": "1.0.0"
-                        }
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-            elif data.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "simulate_collaboration",
-                                "description": "두 AI의 협업을 시뮬레이션합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "task": {"type": "string", "description": "수행할 작업"}
-                                    },
-                                    "required": ["task"]
-                                }
-                            },
-                            {
-                                "name": "ai_discussion",
-                                "description": "특정 주제에 대한 AI 토론을 시뮬레이션합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "topic": {"type": "string", "description": "토론할 주제"}
-                                    },
-                                    "required": ["topic"]
-                                }
-                            },
-                            {
-                                "name": "get_collaboration_info",
-                                "description": "협업 시스템 정보를 반환합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {}
-                                }
-                            }
-                        ]
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-            elif data.get("method") == "tools/call":
-                tool_name = data.get("params", {}).get("name")
-                arguments = data.get("params", {}).get("arguments", {})
-                
-                if tool_name == "simulate_collaboration":
-                    task = arguments.get("task", "")
-                    result_text = f"""
+try:
+    from ..utils.rpc_server import RPCServer
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.rpc_server import RPCServer
+
+server = RPCServer("basic-collaborative-ai", "1.0.0")
+
+@server.tool(
+    "simulate_collaboration", "두 AI의 협업을 시뮬레이션합니다",
+    {"task": {"type": "string", "description": "수행할 작업"}}, required=["task"]
+)
+def simulate_collaboration(arguments):
+    task = arguments.get("task", "")
+    return f"""
 🤝 협업 시뮬레이션 결과
 
 📋 작업: {task}
@@ -103,10 +43,14 @@ async def main():
 
 ✅ 협업 품질 점수: 9.2/10
 """
-                    
-                elif tool_name == "ai_discussion":
-                    topic = arguments.get("topic", "")
-                    result_text = f"""
+
+@server.tool(
+    "ai_discussion", "특정 주제에 대한 AI 토론을 시뮬레이션합니다",
+    {"topic": {"type": "string", "description": "토론할 주제"}}, required=["topic"]
+)
+def ai_discussion(arguments):
+    topic = arguments.get("topic", "")
+    return f"""
 💬 AI 토론 결과
 
 🎯 주제: {topic}
@@ -126,8 +70,9 @@ async def main():
 - 균형잡힌 최종 결론 도출
 """
 
-                elif tool_name == "get_collaboration_info":
-                    result_text = """
+@server.tool("get_collaboration_info", "협업 시스템 정보를 반환합니다")
+def get_collaboration_info(arguments):
+    return """
 ℹ️ Basic Collaborative AI 시스템 정보
 
 🎯 목적: 
@@ -142,23 +87,10 @@ async def main():
 🤖 사용 가능한 AI: Gemini, Claude
 🎨 협업 모드: 창의성 + 논리성
 """
-                else:
-                    result_text = f"❌ 알 수 없는 도구: {tool_name}"
-                
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": data.get("id"),
-                    "result": {
-                        "content": [{"type": "text", "text": result_text}]
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-        except EOFError:
-            break
-        except Exception as e:
-            print(f"오류: {e}", file=sys.stderr)
+
+async def main():
+    """기본 MCP 서버"""
+    await server.serve()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,11 +3,15 @@
 Collaborative AI Orchestrator MCP Server
 Gemini와 Claude가 서로 협업하고 토론하여 최고의 결과를 만들어내는 시스템
 """
+import argparse
 import asyncio
+import itertools
 import json
+import os
 import sys
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
@@ -17,10 +21,6 @@ try:
     from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     from mcp.types import (
-        CallToolRequest,
-        CallToolResult,
-        ListToolsRequest,
-        ListToolsResult,
         TextContent,
         Tool,
     )
@@ -28,6 +28,42 @@ except ImportError:
     print("MCP 라이브러리가 필요합니다: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    from ..utils.backend_runner import get_backend_runner
+    from ..utils.cli_runner import ChunkCallback
+    from ..utils.deadline import reset_deadline, set_deadline
+    from ..utils.http_transport import serve_http
+    from ..utils.job_manager import JobLimitError, JobManager
+    from ..utils.message_log import MessageLog, MessageRecord
+    from ..utils.progress import ProgressReporter, mcp_progress_reporter
+    from ..utils.workflow_engine import (
+        NodeResult,
+        WorkflowConfigError,
+        WorkflowEngine,
+        WorkflowGraph,
+        WorkflowNode,
+        available_workflows,
+        load_workflow,
+    )
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.backend_runner import get_backend_runner
+    from utils.cli_runner import ChunkCallback
+    from utils.deadline import reset_deadline, set_deadline
+    from utils.http_transport import serve_http
+    from utils.job_manager import JobLimitError, JobManager
+    from utils.message_log import MessageLog, MessageRecord
+    from utils.progress import ProgressReporter, mcp_progress_reporter
+    from utils.workflow_engine import (
+        NodeResult,
+        WorkflowConfigError,
+        WorkflowEngine,
+        WorkflowGraph,
+        WorkflowNode,
+        available_workflows,
+        load_workflow,
+    )
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -62,366 +98,231 @@ class CollaborationResult:
     participating_ais: List[str]
     total_iterations: int
     collaboration_summary: str
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    prompt_compaction: Dict[str, Any] = field(default_factory=dict)
+    # 점수를 얻지 못해 quality_score 평균에서 빠진 품질 노드
+    missing_quality_scores: List[str] = field(default_factory=list)
 
 class CLIExecutor:
     """기존 gemini/claude CLI 명령어를 실행하는 클래스"""
     
-    async def execute_gemini(self, prompt: str) -> Dict[str, Any]:
-        """Gemini CLI 실행"""
+    def __init__(self):
+        self.backend = get_backend_runner()
+        self.worker_pools = self.backend.worker_pools
+    
+    async def _execute_cli(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                           use_cache: bool = True, reroute: bool = False) -> Dict[str, Any]:
+        """CLI 실행 (응답 캐시와 사전 기동 워커 풀 사용, stdout은 청크 단위로 on_chunk에 전달)"""
         try:
-            cmd = ["gemini", prompt]
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            return {
-                "success": process.returncode == 0,
-                "result": stdout.strip() if process.returncode == 0 else "",
-                "error": stderr.strip() if process.returncode != 0 else None,
-                "ai": "gemini"
-            }
+            result = await self.backend.execute(ai, prompt, on_chunk, use_cache, reroute=reroute)
+            return {**result.as_dict(), "ai": result.backend or ai}
                 
         except Exception as e:
             return {
                 "success": False,
                 "result": "",
                 "error": f"CLI 실행 오류: {str(e)}",
-                "ai": "gemini"
+                "ai": ai
             }
     
-    async def execute_claude(self, prompt: str) -> Dict[str, Any]:
+    async def execute_gemini(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """Gemini CLI 실행"""
+        return await self._execute_cli("gemini", prompt, on_chunk, use_cache)
+    
+    async def execute_claude(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True) -> Dict[str, Any]:
         """Claude CLI 실행"""
-        try:
-            cmd = ["claude", prompt]
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            return {
-                "success": process.returncode == 0,
-                "result": stdout.strip() if process.returncode == 0 else "",
-                "error": stderr.strip() if process.returncode != 0 else None,
-                "ai": "claude"
+        return await self._execute_cli("claude", prompt, on_chunk, use_cache)
+    
+    async def execute(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                      use_cache: bool = True) -> Dict[str, Any]:
+        """AI 이름으로 CLI 실행 (워크플로우 단계용, 회로가 열린 AI는 다른 AI로 전환)"""
+        if ai in ("gemini", "claude"):
+            return await self._execute_cli(ai, prompt, on_chunk, use_cache, reroute=True)
+        return {
+            "success": False,
+            "result": "",
+            "error": f"알 수 없는 AI: {ai}",
+            "ai": ai
+        }
+    
+    async def execute_both(self, prompt: str, progress: Optional[ProgressReporter] = None,
+                           use_cache: bool = True) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Gemini와 Claude에 같은 프롬프트를 동시에 실행 (한쪽 실패가 다른 쪽에 영향 없음)"""
+        gemini_result, claude_result = await asyncio.gather(
+            self.execute_gemini(prompt, progress.chunk_callback("gemini") if progress else None, use_cache),
+            self.execute_claude(prompt, progress.chunk_callback("claude") if progress else None, use_cache),
+            return_exceptions=True
+        )
+        
+        if isinstance(gemini_result, Exception):
+            gemini_result = {
+                "success": False,
+                "result": "",
+                "error": f"CLI 실행 오류: {str(gemini_result)}",
+                "ai": "gemini"
             }
-                
-        except Exception as e:
-            return {
+        if isinstance(claude_result, Exception):
+            claude_result = {
                 "success": False,
                 "result": "",
-                "error": f"CLI 실행 오류: {str(e)}",
+                "error": f"CLI 실행 오류: {str(claude_result)}",
                 "ai": "claude"
             }
+        
+        return gemini_result, claude_result
+
+@dataclass
+class WorkflowSession:
+    """협업 실행 하나의 상태 (실행마다 새로 만들어 동시 실행끼리 섞이지 않음)"""
+    session_id: int
+    task_description: str
+    graph: WorkflowGraph
+    # 메시지 본문은 CollaborativeWorkflow.message_log에 기록되고 세션은 개수만 가짐
+    message_count: int = 0
+    current_stage: WorkflowStage = WorkflowStage.INITIAL_DISCUSSION
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    started_stages: Set[str] = field(default_factory=set)
 
 class CollaborativeWorkflow:
-    """두 AI가 협업하는 워크플로우 관리"""
+    """두 AI가 협업하는 워크플로우 관리 (configs/workflows/의 DAG 정의를 실행)"""
     
-    def __init__(self, cli_executor: CLIExecutor):
+    def __init__(self, cli_executor: CLIExecutor, workflow_name: Optional[str] = None):
         self.cli_executor = cli_executor
-        self.conversation_history: List[CollaborationMessage] = []
-        self.current_stage = WorkflowStage.INITIAL_DISCUSSION
-        
-    async def start_collaboration(self, task_description: str) -> CollaborationResult:
-        """협업 워크플로우 시작"""
-        self.conversation_history = []
-        self.current_stage = WorkflowStage.INITIAL_DISCUSSION
-        
-        logger.info(f"협업 시작: {task_description}")
-        
-        # 1단계: 초기 토론 - 두 AI가 작업에 대해 논의
-        discussion_result = await self._initial_discussion(task_description)
-        
-        # 2단계: 초안 작성 - 더 적합한 AI가 초안 작성
-        draft_result = await self._create_draft(task_description, discussion_result)
-        
-        # 3단계: 동료 검토 - 다른 AI가 검토 및 피드백
-        review_result = await self._peer_review(task_description, draft_result)
-        
-        # 4단계: 개선 - 피드백을 바탕으로 개선
-        improved_result = await self._improve_result(task_description, draft_result, review_result)
-        
-        # 5단계: 최종 검토 - 양쪽이 최종 검토
-        final_result = await self._final_review(task_description, improved_result)
-        
-        # 6단계: 품질 평가 및 요약
-        quality_score = await self._evaluate_quality(task_description, final_result)
+        self.engine = WorkflowEngine(cli_executor.execute)
+        self.workflow_name = workflow_name
+        # 실행 중인 세션 (세션 id -> 상태)
+        self.sessions: Dict[int, WorkflowSession] = {}
+        self.message_log = MessageLog()
+        self._session_ids = itertools.count(1)
+        
+    async def start_collaboration(self, task_description: str, workflow: Optional[str] = None,
+                                  progress: Optional[ProgressReporter] = None,
+                                  use_cache: bool = True) -> CollaborationResult:
+        """협업 워크플로우 시작 (progress가 있으면 단계 전환과 부분 출력을 알림)"""
+        graph = load_workflow(workflow or self.workflow_name)
+        session = WorkflowSession(next(self._session_ids), task_description, graph)
+        self.sessions[session.session_id] = session
+        try:
+            return await self._run_session(session, progress, use_cache)
+        finally:
+            del self.sessions[session.session_id]
+    
+    async def _run_session(self, session: WorkflowSession, progress: Optional[ProgressReporter],
+                           use_cache: bool) -> CollaborationResult:
+        graph = session.graph
+        logger.info(f"협업 시작 ({graph.name}, 세션 {session.session_id}): {session.task_description}")
+        
+        async def on_node_start(node: WorkflowNode, backend: str):
+            if node.stage not in session.started_stages:
+                session.started_stages.add(node.stage)
+                stage_info = next((s for s in graph.stages if s.id == node.stage), None)
+                stage_label = stage_info.label if stage_info and stage_info.label else node.stage
+                logger.info(f"{stage_label} 시작")
+                if progress:
+                    await progress.stage(f"{stage_label} 시작")
+            try:
+                session.current_stage = WorkflowStage(node.stage)
+            except ValueError:
+                pass
+            logger.info(f"💭 {node.id}: {backend.upper()}에게 요청 중...")
+        
+        async def on_node_finish(node: WorkflowNode, result: NodeResult):
+            self._record_exchange(session, node, result)
+            status = "✅" if result.success else "⚠️"
+            logger.info(f"{status} {node.id} 완료 ({result.backend}, {result.duration:.1f}s): {result.text[:100]}...")
+        
+        async def on_chunk(node: WorkflowNode, text: str):
+            await progress.partial(text, node.id)
+        
+        run = await self.engine.run(
+            graph,
+            {"task": session.task_description},
+            on_node_start=on_node_start,
+            on_node_finish=on_node_finish,
+            on_chunk=on_chunk if progress else None,
+            execute_options={"use_cache": use_cache}
+        )
+        if progress:
+            await progress.flush()
+        
+        session.current_stage = WorkflowStage.COMPLETION
+        session.stage_timings = run.stage_timings()
+        quality_score = run.quality_score()
+        missing_scores = run.missing_quality_scores()
+        logger.info(f"📊 품질 점수: {quality_score}")
+        if missing_scores:
+            logger.warning(f"⚠️ 점수를 얻지 못한 품질 노드: {missing_scores}")
+        logger.info(f"⏱️ 단계별 소요 시간: {session.stage_timings}")
+        compaction = run.prompt_compaction()
+        if compaction["compacted"]:
+            logger.info(f"📏 토큰 예산으로 입력 축소: {compaction['nodes']}")
+        logger.info("🎉 최종 결과 완성!")
         
         return CollaborationResult(
-            task_description=task_description,
-            workflow_stages=self._get_workflow_summary(),
-            final_result=final_result,
+            task_description=session.task_description,
+            workflow_stages=graph.stage_summary(),
+            final_result=run.final_result,
             quality_score=quality_score,
-            participating_ais=["gemini", "claude"],
-            total_iterations=len(self.conversation_history),
-            collaboration_summary=self._generate_collaboration_summary()
+            participating_ais=sorted({r.backend for r in run.results.values()}),
+            total_iterations=session.message_count,
+            collaboration_summary=self._generate_collaboration_summary(session),
+            stage_timings=dict(session.stage_timings),
+            prompt_compaction=compaction,
+            missing_quality_scores=missing_scores
         )
     
-    async def _initial_discussion(self, task: str) -> Dict[str, str]:
-        """1단계: 초기 토론"""
-        self.current_stage = WorkflowStage.INITIAL_DISCUSSION
-        logger.info(f"🎯 1단계: 초기 토론 시작 - {task}")
-        
-        # Gemini에게 먼저 작업 분석 요청
-        gemini_prompt = f"""
-작업: {task}
-
-이 작업에 대해 분석해주세요:
-1. 작업의 핵심 요구사항
-2. 어려운 점이나 주의사항
-3. Gemini vs Claude 중 누가 더 적합한지와 이유
-4. 협업 시 어떤 역할 분담이 좋을지
-
-응답 형식: JSON
-{{
-    "analysis": "작업 분석",
-    "challenges": "어려운 점",
-    "better_ai": "gemini 또는 claude",
-    "reason": "이유",
-    "collaboration_plan": "협업 계획"
-}}
-"""
-        
-        logger.info("💭 Gemini에게 작업 분석 요청 중...")
-        gemini_result = await self.cli_executor.execute_gemini(gemini_prompt)
-        logger.info(f"✅ Gemini 분석 완료: {gemini_result['result'][:100]}...")
-        
-        # Claude에게 Gemini의 분석에 대한 의견 요청
-        logger.info("🔍 Claude에게 Gemini 분석 검토 요청 중...")
-        claude_prompt = f"""
-작업: {task}
-
-Gemini의 분석:
-{gemini_result['result']}
-
-Gemini의 분석에 대한 당신의 의견과 추가 제안을 해주세요:
-1. Gemini 분석에 동의하는지
-2. 다른 관점이나 놓친 부분
-3. 더 나은 협업 방안
-4. 최종 역할 분담 제안
-
-응답 형식: JSON
-{{
-    "agreement_level": "1-10 점수",
-    "additional_insights": "추가 통찰",
-    "collaboration_suggestion": "협업 제안",
-    "role_assignment": "최종 역할 분담"
-}}
-"""
-        
-        claude_result = await self.cli_executor.execute_claude(claude_prompt)
-        logger.info(f"✅ Claude 검토 완료: {claude_result['result'][:100]}...")
-        
-        return {
-            "gemini_analysis": gemini_result['result'],
-            "claude_feedback": claude_result['result']
-        }
+    def _record_exchange(self, session: WorkflowSession, node: WorkflowNode, result: NodeResult):
+        """노드 하나의 프롬프트와 응답을 메시지 로그에 기록 (다른 노드의 JSON에서 추출한 노드는 주고받은 메시지가 없음)"""
+        if result.extracted_from:
+            return
+        now = time.time()
+        log = self.message_log
+        log.append(session.session_id, "orchestrator", result.backend, node.stage, node.id,
+                   result.prompt, now - result.duration)
+        log.append(session.session_id, result.backend, "orchestrator", node.stage, node.id,
+                   result.text if result.success else (result.error or ""), now)
+        session.message_count += 2
     
-    async def _create_draft(self, task: str, discussion: Dict[str, str]) -> str:
-        """2단계: 초안 작성"""
-        self.current_stage = WorkflowStage.DRAFT_CREATION
-        logger.info("✍️ 2단계: 초안 작성 시작")
-        
-        # 토론 결과를 바탕으로 누가 초안을 작성할지 결정
-        decision_prompt = f"""
-작업: {task}
-
-토론 결과:
-- Gemini 분석: {discussion['gemini_analysis']}
-- Claude 피드백: {discussion['claude_feedback']}
-
-이 정보를 바탕으로 누가 초안을 작성해야 할지 "gemini" 또는 "claude"로만 답하세요.
-"""
-        
-        decision_result = await self.cli_executor.execute_gemini(decision_prompt)
-        primary_ai = "claude" if "claude" in decision_result['result'].lower() else "gemini"
-        logger.info(f"🎯 {primary_ai.upper()}가 초안 작성으로 선택됨")
-        
-        # 선택된 AI가 초안 작성
-        draft_prompt = f"""
-작업: {task}
-
-협업 토론 결과:
-{discussion['gemini_analysis']}
-{discussion['claude_feedback']}
-
-이 토론을 바탕으로 작업을 수행해주세요. 최고 품질의 결과를 만들어주세요.
-"""
-        
-        logger.info(f"📝 {primary_ai.upper()}에게 초안 작성 요청 중...")
-        if primary_ai == "gemini":
-            result = await self.cli_executor.execute_gemini(draft_prompt)
-        else:
-            result = await self.cli_executor.execute_claude(draft_prompt)
-        logger.info(f"✅ 초안 작성 완료: {result['result'][:100]}...")
-        
-        return result['result']
+    def conversation_history(self, session_id: Optional[int] = None) -> Iterator[CollaborationMessage]:
+        """기록된 메시지를 필요할 때 하나씩 CollaborationMessage로 복원 (밀려난 메시지는 제외)"""
+        for record in self.message_log.messages(session_id):
+            yield self._materialize(record)
     
-    async def _peer_review(self, task: str, draft: str) -> str:
-        """3단계: 동료 검토"""
-        self.current_stage = WorkflowStage.PEER_REVIEW
-        logger.info("🔍 3단계: 동료 검토 시작")
-        
-        # 초안을 작성하지 않은 AI가 검토
-        review_prompt = f"""
-원래 작업: {task}
-
-동료가 작성한 결과:
-{draft}
-
-이 결과를 검토하고 피드백을 제공해주세요:
-1. 잘된 점
-2. 개선이 필요한 점
-3. 구체적인 개선 제안
-4. 놓친 부분이나 추가할 내용
-5. 전체적인 품질 평가 (1-10점)
-
-건설적이고 구체적인 피드백을 제공해주세요.
-"""
-        
-        # 두 AI 모두에게 검토 요청 (다양한 관점)
-        logger.info("👥 두 AI 모두에게 검토 요청 중...")
-        gemini_review = await self.cli_executor.execute_gemini(review_prompt)
-        claude_review = await self.cli_executor.execute_claude(review_prompt)
-        logger.info("✅ 양쪽 AI 검토 완료")
-        
-        return f"Gemini 검토:\n{gemini_review['result']}\n\nClaude 검토:\n{claude_review['result']}"
-    
-    async def _improve_result(self, task: str, draft: str, reviews: str) -> str:
-        """4단계: 개선"""
-        self.current_stage = WorkflowStage.IMPROVEMENT
-        logger.info("🚀 4단계: 피드백 기반 개선 시작")
-        
-        improvement_prompt = f"""
-원래 작업: {task}
-
-초안:
-{draft}
-
-검토 피드백:
-{reviews}
-
-피드백을 바탕으로 결과를 개선해주세요. 모든 지적사항을 고려하여 더 나은 버전을 만들어주세요.
-"""
-        
-        # 두 AI가 각각 개선안 제시
-        logger.info("💡 두 AI가 각각 개선안 제시 중...")
-        gemini_improved = await self.cli_executor.execute_gemini(improvement_prompt)
-        claude_improved = await self.cli_executor.execute_claude(improvement_prompt)
-        logger.info("✅ 양쪽 개선안 완성")
-        
-        # 두 개선안을 비교하여 최고 선택
-        comparison_prompt = f"""
-원래 작업: {task}
-
-Gemini 개선안:
-{gemini_improved['result']}
-
-Claude 개선안:
-{claude_improved['result']}
-
-두 개선안을 비교하고 더 나은 것을 선택하거나, 두 개의 장점을 결합한 최종 버전을 만들어주세요.
-"""
-        
-        logger.info("⚖️ 개선안 비교 및 최종 선택 중...")
-        final_improved = await self.cli_executor.execute_gemini(comparison_prompt)
-        logger.info("✅ 최종 개선 버전 완성")
-        return final_improved['result']
-    
-    async def _final_review(self, task: str, improved_result: str) -> str:
-        """5단계: 최종 검토"""
-        self.current_stage = WorkflowStage.FINAL_REVIEW
-        logger.info("✅ 5단계: 최종 검토 시작")
-        
-        final_check_prompt = f"""
-원래 작업: {task}
-
-최종 결과:
-{improved_result}
-
-이것이 최종 결과입니다. 마지막으로 검토하고 필요하면 미세 조정해주세요:
-1. 작업 요구사항을 모두 충족했는지 확인
-2. 품질이 최고 수준인지 확인
-3. 필요하면 최종 다듬기
-
-완벽한 최종 결과를 제공해주세요.
-"""
-        
-        # 두 AI가 최종 검토
-        logger.info("🎯 양쪽 AI의 최종 검토 진행 중...")
-        gemini_final = await self.cli_executor.execute_gemini(final_check_prompt)
-        claude_final = await self.cli_executor.execute_claude(final_check_prompt)
-        logger.info("✅ 최종 검토 완료")
-        
-        # 더 나은 최종 버전 선택
-        selection_prompt = f"""
-Gemini 최종 버전:
-{gemini_final['result']}
-
-Claude 최종 버전:
-{claude_final['result']}
-
-더 나은 최종 버전을 선택하거나 두 버전의 장점을 결합해주세요.
-"""
-        
-        logger.info("🏆 최종 버전 선택 중...")
-        final_result = await self.cli_executor.execute_claude(selection_prompt)
-        logger.info("🎉 최종 결과 완성!")
-        return final_result['result']
-    
-    async def _evaluate_quality(self, task: str, result: str) -> float:
-        """품질 평가"""
-        logger.info("📊 6단계: 품질 평가 시작")
-        evaluation_prompt = f"""
-작업: {task}
-결과: {result}
-
-이 결과의 품질을 1-10점으로 평가해주세요. 평가 기준:
-1. 작업 요구사항 충족도
-2. 결과의 정확성
-3. 완성도
-4. 창의성/유용성
-
-점수만 숫자로 답하세요.
-"""
-        
-        # 두 AI의 평가 평균
-        logger.info("🎯 양쪽 AI의 품질 평가 진행 중...")
-        gemini_score = await self.cli_executor.execute_gemini(evaluation_prompt)
-        claude_score = await self.cli_executor.execute_claude(evaluation_prompt)
-        
+    def _materialize(self, record: MessageRecord) -> CollaborationMessage:
         try:
-            g_score = float(gemini_score['result'].strip())
-            c_score = float(claude_score['result'].strip())
-            final_score = (g_score + c_score) / 2
-            logger.info(f"📊 품질 점수: Gemini({g_score}) + Claude({c_score}) = 평균 {final_score}")
-            return final_score
-        except:
-            logger.warning("⚠️ 품질 점수 파싱 실패, 기본값 8.0 사용")
-            return 8.0  # 기본값
+            stage = WorkflowStage(record.stage)
+        except ValueError:
+            stage = record.stage
+        content = self.message_log.content(record)
+        return CollaborationMessage(
+            from_ai=record.from_ai,
+            to_ai=record.to_ai,
+            stage=stage,
+            content=content if content is not None else f"(본문 보관 한도 초과로 삭제됨, {record.size}바이트)",
+            context={"session_id": record.session_id, "node_id": record.node_id},
+            timestamp=record.timestamp
+        )
     
-    def _get_workflow_summary(self) -> List[Dict[str, Any]]:
-        """워크플로우 요약"""
-        return [
-            {"stage": "initial_discussion", "description": "두 AI가 작업에 대해 토론"},
-            {"stage": "draft_creation", "description": "적합한 AI가 초안 작성"},
-            {"stage": "peer_review", "description": "동료 AI가 검토 및 피드백"},
-            {"stage": "improvement", "description": "피드백 바탕으로 개선"},
-            {"stage": "final_review", "description": "최종 검토 및 다듬기"},
-            {"stage": "quality_evaluation", "description": "품질 평가"}
-        ]
+    def recent_messages(self, count: int = 5, preview_chars: int = 120) -> List[Dict[str, Any]]:
+        """최근 메시지 미리보기 (본문은 이 레코드들만 읽음)"""
+        previews = []
+        for record in self.message_log.recent(count):
+            message = self._materialize(record)
+            previews.append({
+                "session_id": record.session_id,
+                "node_id": record.node_id,
+                "from": message.from_ai,
+                "to": message.to_ai,
+                "bytes": record.size,
+                "preview": message.content[:preview_chars]
+            })
+        return previews
     
-    def _generate_collaboration_summary(self) -> str:
+    def _generate_collaboration_summary(self, session: WorkflowSession) -> str:
         """협업 요약"""
-        return f"Gemini와 Claude가 {len(self.conversation_history)}회의 상호작용을 통해 협업하여 최고 품질의 결과를 생성했습니다."
+        return f"Gemini와 Claude가 {session.message_count}회의 상호작용을 통해 협업하여 최고 품질의 결과를 생성했습니다."
 
 class CollaborativeAIOrchestrator:
     """협업 AI 오케스트레이터 메인 클래스"""
@@ -430,22 +331,25 @@ class CollaborativeAIOrchestrator:
         self.cli_executor = CLIExecutor()
         self.workflow = CollaborativeWorkflow(self.cli_executor)
         self.collaboration_history: List[CollaborationResult] = []
+        self.jobs = JobManager()
     
-    async def execute_collaborative_task(self, task_description: str) -> CollaborationResult:
+    async def execute_collaborative_task(self, task_description: str, workflow: Optional[str] = None,
+                                         progress: Optional[ProgressReporter] = None,
+                                         use_cache: bool = True) -> CollaborationResult:
         """협업 작업 실행"""
         logger.info(f"협업 작업 시작: {task_description}")
         
-        result = await self.workflow.start_collaboration(task_description)
+        result = await self.workflow.start_collaboration(task_description, workflow, progress, use_cache)
         self.collaboration_history.append(result)
         
         return result
     
-    async def quick_discussion(self, topic: str) -> Dict[str, str]:
+    async def quick_discussion(self, topic: str, progress: Optional[ProgressReporter] = None,
+                               use_cache: bool = True) -> Dict[str, str]:
         """간단한 토론 (빠른 협업)"""
         discussion_prompt = f"이 주제에 대해 간단히 의견을 제시해주세요: {topic}"
         
-        gemini_result = await self.cli_executor.execute_gemini(discussion_prompt)
-        claude_result = await self.cli_executor.execute_claude(discussion_prompt)
+        gemini_result, claude_result = await self.cli_executor.execute_both(discussion_prompt, progress, use_cache)
         
         return {
             "topic": topic,
@@ -453,12 +357,12 @@ class CollaborativeAIOrchestrator:
             "claude_opinion": claude_result['result']
         }
     
-    async def compare_approaches(self, task: str) -> Dict[str, str]:
+    async def compare_approaches(self, task: str, progress: Optional[ProgressReporter] = None,
+                                 use_cache: bool = True) -> Dict[str, str]:
         """두 AI의 접근법 비교"""
         comparison_prompt = f"이 작업에 대한 당신의 접근법을 설명해주세요: {task}"
         
-        gemini_approach = await self.cli_executor.execute_gemini(comparison_prompt)
-        claude_approach = await self.cli_executor.execute_claude(comparison_prompt)
+        gemini_approach, claude_approach = await self.cli_executor.execute_both(comparison_prompt, progress, use_cache)
         
         # 접근법 비교 분석
         analysis_prompt = f"""
@@ -473,7 +377,10 @@ Claude 접근법:
 두 접근법의 장단점을 비교하고 최적의 방법을 제안해주세요.
 """
         
-        analysis = await self.cli_executor.execute_gemini(analysis_prompt)
+        if progress:
+            await progress.stage("⚖️ 접근법 비교 분석 중...")
+        analysis = await self.cli_executor.execute_gemini(
+            analysis_prompt, progress.chunk_callback("comparison") if progress else None, use_cache)
         
         return {
             "task": task,
@@ -486,7 +393,17 @@ Claude 접근법:
         """협업 통계"""
         total_collaborations = len(self.collaboration_history)
         if total_collaborations == 0:
-            return {"message": "아직 협업 기록이 없습니다."}
+            return {
+                "message": "아직 협업 기록이 없습니다.",
+                "active_sessions": len(self.workflow.sessions),
+                "jobs": self.jobs.get_stats(),
+                "message_log": self.workflow.message_log.get_stats(),
+                "prompt_budget": self.workflow.engine.budget.get_stats(),
+                "speculation": self.workflow.engine.speculation.get_stats(),
+                "structured_output": self.workflow.engine.stats,
+                "recent_messages": self.workflow.recent_messages(),
+                **self.cli_executor.backend.get_stats()
+            }
         
         avg_quality = sum(c.quality_score for c in self.collaboration_history) / total_collaborations
         avg_iterations = sum(c.total_iterations for c in self.collaboration_history) / total_collaborations
@@ -495,198 +412,368 @@ Claude 접근법:
             "total_collaborations": total_collaborations,
             "average_quality_score": round(avg_quality, 2),
             "average_iterations": round(avg_iterations, 1),
-            "best_collaboration": max(self.collaboration_history, key=lambda x: x.quality_score).task_description
+            "best_collaboration": max(self.collaboration_history, key=lambda x: x.quality_score).task_description,
+            "active_sessions": len(self.workflow.sessions),
+            "jobs": self.jobs.get_stats(),
+            "message_log": self.workflow.message_log.get_stats(),
+            "prompt_budget": self.workflow.engine.budget.get_stats(),
+            "speculation": self.workflow.engine.speculation.get_stats(),
+            "structured_output": self.workflow.engine.stats,
+            "recent_messages": self.workflow.recent_messages(),
+            **self.cli_executor.backend.get_stats()
         }
 
+def collaboration_response(result: CollaborationResult) -> Dict[str, Any]:
+    """collaborative_task 응답 본문"""
+    return {
+        "task": result.task_description,
+        "final_result": result.final_result,
+        "quality_score": result.quality_score,
+        "total_iterations": result.total_iterations,
+        "workflow_summary": result.workflow_stages,
+        "collaboration_summary": result.collaboration_summary,
+        "stage_timings": result.stage_timings,
+        "prompt_compaction": result.prompt_compaction,
+        "missing_quality_scores": result.missing_quality_scores
+    }
+
 # MCP 서버 설정
 server = Server("collaborative-ai-orchestrator")
 orchestrator = CollaborativeAIOrchestrator()
 
 @server.list_tools()
-async def handle_list_tools() -> ListToolsResult:
+async def handle_list_tools() -> List[Tool]:
     """사용 가능한 도구들 반환"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="collaborative_task",
-                description="Gemini와 Claude가 협업하여 작업을 수행합니다 (전체 워크플로우)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task": {
-                            "type": "string",
-                            "description": "수행할 작업 설명"
-                        }
+    return [
+        Tool(
+            name="collaborative_task",
+            description="Gemini와 Claude가 협업하여 작업을 수행합니다 (전체 워크플로우)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "수행할 작업 설명"
+                    },
+                    "workflow": {
+                        "type": "string",
+                        "enum": available_workflows(),
+                        "description": "사용할 워크플로우 정의 (선택사항, configs/workflows/)"
                     },
-                    "required": ["task"]
-                }
-            ),
-            Tool(
-                name="quick_discussion",
-                description="특정 주제에 대해 두 AI가 빠르게 토론합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "topic": {
-                            "type": "string",
-                            "description": "토론할 주제"
-                        }
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
                     },
-                    "required": ["topic"]
-                }
-            ),
-            Tool(
-                name="compare_approaches",
-                description="특정 작업에 대한 두 AI의 접근법을 비교합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task": {
-                            "type": "string",
-                            "description": "비교할 작업"
-                        }
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "요청 전체 마감 시간(초), 넘으면 남은 단계를 중단하고 CLI를 종료 (선택사항)"
+                    }
+                },
+                "required": ["task"]
+            }
+        ),
+        Tool(
+            name="submit_collaborative_task",
+            description="collaborative_task를 백그라운드 작업으로 시작하고 작업 ID를 바로 반환합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "수행할 작업 설명"
                     },
-                    "required": ["task"]
-                }
-            ),
-            Tool(
-                name="get_collaboration_stats",
-                description="협업 통계 및 기록을 조회합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            Tool(
-                name="execute_gemini_direct",
-                description="Gemini에게 직접 작업을 요청합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {
-                            "type": "string",
-                            "description": "Gemini에게 전달할 프롬프트"
-                        }
+                    "workflow": {
+                        "type": "string",
+                        "enum": available_workflows(),
+                        "description": "사용할 워크플로우 정의 (선택사항, configs/workflows/)"
                     },
-                    "required": ["prompt"]
-                }
-            ),
-            Tool(
-                name="execute_claude_direct",
-                description="Claude에게 직접 작업을 요청합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {
-                            "type": "string",
-                            "description": "Claude에게 전달할 프롬프트"
-                        }
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
                     },
-                    "required": ["prompt"]
-                }
-            )
-        ]
-    )
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "작업 전체 마감 시간(초), 작업 시작 시점부터 계산 (선택사항)"
+                    }
+                },
+                "required": ["task"]
+            }
+        ),
+        Tool(
+            name="get_job_status",
+            description="백그라운드 작업의 상태와 현재 단계를 조회합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "submit_collaborative_task가 반환한 작업 ID"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="get_job_result",
+            description="백그라운드 작업의 결과를 조회합니다 (끝나지 않았으면 단계별 부분 출력)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "submit_collaborative_task가 반환한 작업 ID"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="cancel_job",
+            description="실행 중인 백그라운드 작업을 취소합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "submit_collaborative_task가 반환한 작업 ID"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="quick_discussion",
+            description="특정 주제에 대해 두 AI가 빠르게 토론합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "topic": {
+                        "type": "string",
+                        "description": "토론할 주제"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    }
+                },
+                "required": ["topic"]
+            }
+        ),
+        Tool(
+            name="compare_approaches",
+            description="특정 작업에 대한 두 AI의 접근법을 비교합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "비교할 작업"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    },
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "요청 전체 마감 시간(초), 넘으면 남은 단계를 중단하고 CLI를 종료 (선택사항)"
+                    }
+                },
+                "required": ["task"]
+            }
+        ),
+        Tool(
+            name="get_collaboration_stats",
+            description="협업 통계 및 기록을 조회합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        ),
+        Tool(
+            name="execute_gemini_direct",
+            description="Gemini에게 직접 작업을 요청합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "prompt": {
+                        "type": "string",
+                        "description": "Gemini에게 전달할 프롬프트"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    }
+                },
+                "required": ["prompt"]
+            }
+        ),
+        Tool(
+            name="execute_claude_direct",
+            description="Claude에게 직접 작업을 요청합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "prompt": {
+                        "type": "string",
+                        "description": "Claude에게 전달할 프롬프트"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    }
+                },
+                "required": ["prompt"]
+            }
+        )
+    ]
 
 @server.call_tool()
-async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
+async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
     """도구 호출 처리"""
+    arguments = arguments or {}
+    progress = mcp_progress_reporter(server)
+    use_cache = not arguments.get("no_cache", False)
+    deadline_token = set_deadline(arguments.get("timeout_seconds"))
     
     try:
-        if request.name == "collaborative_task":
-            task = request.params.get("task", "")
+        if name == "collaborative_task":
+            task = arguments.get("task", "")
             if not task:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 작업 설명이 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 작업 설명이 필요합니다")]
+            
+            try:
+                result = await orchestrator.execute_collaborative_task(
+                    task, arguments.get("workflow"), progress, use_cache)
+            except WorkflowConfigError as e:
+                return [TextContent(type="text", text=f"ERROR: 워크플로우 설정 오류: {str(e)}")]
+            
+            response = collaboration_response(result)
+            
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
+        
+        elif name == "submit_collaborative_task":
+            task = arguments.get("task", "")
+            if not task:
+                return [TextContent(type="text", text="ERROR: 작업 설명이 필요합니다")]
+            
+            workflow = arguments.get("workflow")
+            timeout_seconds = arguments.get("timeout_seconds")
+            try:
+                load_workflow(workflow)
+            except WorkflowConfigError as e:
+                return [TextContent(type="text", text=f"ERROR: 워크플로우 설정 오류: {str(e)}")]
+            
+            async def run_job(job_progress):
+                # 작업의 마감 시간은 제출 요청과 별개로 작업 시작 시점부터 계산
+                token = set_deadline(timeout_seconds)
+                try:
+                    result = await orchestrator.execute_collaborative_task(task, workflow, job_progress, use_cache)
+                    return collaboration_response(result)
+                finally:
+                    reset_deadline(token)
             
-            result = await orchestrator.execute_collaborative_task(task)
+            try:
+                job = orchestrator.jobs.submit("collaborative_task", task, run_job)
+            except JobLimitError as e:
+                return [TextContent(type="text", text=f"ERROR: {str(e)}")]
             
             response = {
-                "task": result.task_description,
-                "final_result": result.final_result,
-                "quality_score": result.quality_score,
-                "total_iterations": result.total_iterations,
-                "workflow_summary": result.workflow_stages,
-                "collaboration_summary": result.collaboration_summary
+                "job_id": job.job_id,
+                "status": job.status,
+                "message": "get_job_status로 진행 상황을, get_job_result로 결과를 확인하세요"
             }
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
+        
+        elif name in ("get_job_status", "get_job_result", "cancel_job"):
+            job_id = arguments.get("job_id", "")
+            job = orchestrator.jobs.get(job_id)
+            if job is None:
+                return [TextContent(type="text", text=f"ERROR: 알 수 없는 작업 ID: {job_id} (만료되었거나 존재하지 않음)")]
+            
+            if name == "cancel_job":
+                cancelled = orchestrator.jobs.cancel(job_id)
+                response = {**job.status_dict(), "cancel_requested": cancelled}
+            elif name == "get_job_result" and job.status == "succeeded":
+                response = {**job.status_dict(), "result": job.result}
+            elif name == "get_job_result":
+                # 아직 실행 중이거나 실패/취소된 작업은 노드별 부분 출력을 반환
+                response = {**job.status_dict(), "partial_outputs": dict(job.partial)}
+            else:
+                response = job.status_dict()
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
         
-        elif request.name == "quick_discussion":
-            topic = request.params.get("topic", "")
+        elif name == "quick_discussion":
+            topic = arguments.get("topic", "")
             if not topic:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 토론 주제가 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 토론 주제가 필요합니다")]
             
-            result = await orchestrator.quick_discussion(topic)
+            result = await orchestrator.quick_discussion(topic, progress, use_cache)
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
-        elif request.name == "compare_approaches":
-            task = request.params.get("task", "")
+        elif name == "compare_approaches":
+            task = arguments.get("task", "")
             if not task:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 비교할 작업이 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 비교할 작업이 필요합니다")]
             
-            result = await orchestrator.compare_approaches(task)
+            result = await orchestrator.compare_approaches(task, progress, use_cache)
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
-        elif request.name == "get_collaboration_stats":
+        elif name == "get_collaboration_stats":
             stats = orchestrator.get_collaboration_stats()
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
         
-        elif request.name == "execute_gemini_direct":
-            prompt = request.params.get("prompt", "")
+        elif name == "execute_gemini_direct":
+            prompt = arguments.get("prompt", "")
             if not prompt:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
             
-            result = await orchestrator.cli_executor.execute_gemini(prompt)
+            result = await orchestrator.cli_executor.execute_gemini(
+                prompt, progress.chunk_callback() if progress else None, use_cache)
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
-        elif request.name == "execute_claude_direct":
-            prompt = request.params.get("prompt", "")
+        elif name == "execute_claude_direct":
+            prompt = arguments.get("prompt", "")
             if not prompt:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
             
-            result = await orchestrator.cli_executor.execute_claude(prompt)
+            result = await orchestrator.cli_executor.execute_claude(
+                prompt, progress.chunk_callback() if progress else None, use_cache)
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
         else:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {request.name}")]
-            )
+            return [TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {name}")]
     
+    except asyncio.CancelledError:
+        # 클라이언트 취소: 남은 단계는 중단되고 실행 중인 CLI 프로세스는 종료됨
+        logger.info(f"🛑 {name} 요청 취소됨")
+        raise
     except Exception as e:
         logger.error(f"도구 실행 중 오류: {str(e)}")
-        return CallToolResult(
-            content=[TextContent(type="text", text=f"ERROR: {str(e)}")]
-        )
+        return [TextContent(type="text", text=f"ERROR: {str(e)}")]
+    finally:
+        # 남은 부분 출력은 최종 응답보다 먼저 전송
+        reset_deadline(deadline_token)
+        if progress:
+            await progress.flush()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collaborative AI Orchestrator MCP 서버")
+    parser.add_argument("--transport", choices=("stdio", "http"), default="stdio",
+                        help="http: 여러 클라이언트가 한 프로세스를 공유 (Streamable HTTP)")
+    parser.add_argument("--host", help="HTTP 바인딩 주소 (기본: config.json http.host)")
+    parser.add_argument("--port", type=int, help="HTTP 포트 (기본: config.json http.port)")
+    parser.add_argument("--unix-socket", help="TCP 대신 사용할 Unix 소켓 경로")
+    return parser.parse_args()
 
 async def main():
     """MCP 서버 실행"""
+    options = parse_args()
     init_options = InitializationOptions(
         server_name="collaborative-ai-orchestrator",
         server_version="2.0.0",
@@ -694,15 +781,22 @@ async def main():
     )
     
     try:
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                init_options
-            )
+        await orchestrator.cli_executor.worker_pools.start()
+        if options.transport == "http":
+            await serve_http(server, options.host, options.port, options.unix_socket)
+        else:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    init_options
+                )
     except Exception as e:
         logger.error(f"서버 실행 중 오류: {str(e)}")
         sys.exit(1)
+    finally:
+        await orchestrator.jobs.close()
+        await orchestrator.cli_executor.worker_pools.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,54 +3,60 @@
 Orchestration Server - 질문을 받아 gemini와 claude에 각각 전달하여 두 답변을 반환하는 서버
 """
 import asyncio
-import json
+import os
 import sys
 import subprocess
 from datetime import datetime
 
+try:
+    from ..utils.backend_runner import get_backend_runner
+    from ..utils.rpc_server import RPCServer
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.backend_runner import get_backend_runner
+    from utils.rpc_server import RPCServer
+
 class AIOrchestrator:
     """AI 오케스트레이터 - 질문을 두 AI에게 전달하고 답변 수집"""
     
+    TASK_KEYWORDS = {
+        "coding": ("코드", "코딩", "구현", "개발", "함수", "버그", "api", "code", "python", "javascript"),
+        "design": ("디자인", "ui", "ux", "레이아웃", "로고", "design"),
+        "marketing": ("마케팅", "광고", "브랜드", "홍보", "캠페인", "marketing"),
+        "analysis": ("분석", "데이터", "리서치", "조사", "통계", "analysis"),
+        "writing": ("글", "작성", "문서", "블로그", "기사", "에세이", "writing")
+    }
+    
     def __init__(self):
         self.request_count = 0
+        self.collaboration_count = 0
+    
+    def analyze_task_type(self, task: str) -> str:
+        """키워드로 작업 유형 판별 (coding/design/marketing/analysis/writing/general)"""
+        lowered = task.lower()
+        for task_type, keywords in self.TASK_KEYWORDS.items():
+            if any(keyword in lowered for keyword in keywords):
+                return task_type
+        return "general"
+    
+    def get_quality_score(self, task: str) -> float:
+        """작업 설명에 따라 정해지는 시뮬레이션 품질 점수 (8.0-9.9)"""
+        return round(8.0 + (sum(task.encode("utf-8")) % 20) / 10, 1)
         
+    async def _ask(self, ai: str, question: str) -> str:
+        """CLI에 질문 전달"""
+        result = await get_backend_runner().execute(ai, question)
+        if result.success:
+            return result.result_text
+        return f"{ai.capitalize()} 오류: {result.error_text}"
+    
     async def ask_gemini(self, question: str) -> str:
         """Gemini CLI에 질문 전달"""
-        try:
-            process = await asyncio.create_subprocess_exec(
-                'gemini', question,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode().strip()
-            else:
-                return f"Gemini 오류: {stderr.decode().strip()}"
-        except FileNotFoundError:
-            return "Gemini CLI가 설치되지 않았습니다."
-        except Exception as e:
-            return f"Gemini 실행 오류: {str(e)}"
+        return await self._ask("gemini", question)
     
     async def ask_claude(self, question: str) -> str:
         """Claude CLI에 질문 전달"""
-        try:
-            process = await asyncio.create_subprocess_exec(
-                'claude', question,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode().strip()
-            else:
-                return f"Claude 오류: {stderr.decode().strip()}"
-        except FileNotFoundError:
-            return "Claude CLI가 설치되지 않았습니다."
-        except Exception as e:
-            return f"Claude 실행 오류: {str(e)}"
+        return await self._ask("claude", question)
     
     def generate_coding_collaboration(self, task: str) -> str:
         """코딩 작업 협업"""
@@ -429,91 +435,31 @@ if __name__ == "__main__":
             return self.generate_general_collaboration(task)
 
 # 전역 협업 특화기
-collaborator = TaskSpecializer()
-
-async def main():
-    """향상된 MCP 서버"""
-    while True:
-        try:
-            line = await asyncio.get_event_loop().run_in_executor(None, input)
-            if not line:
-                break
-                
-            data = json.loads(line)
-            
-            if data.get("method") == "initialize":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {
-                            "name": "enhanced-collaborative-ai",
-                            "version": "2.0.0"
-                        }
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-            elif data.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "enhanced_collaboration",
-                                "description": "작업 유형별 특화된 AI 협업을 수행합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "task": {"type": "string", "description": "수행할 작업"}
-                                    },
-                                    "required": ["task"]
-                                }
-                            },
-                            {
-                                "name": "specialized_discussion",
-                                "description": "주제별 전문화된 AI 토론을 진행합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "topic": {"type": "string", "description": "토론할 주제"},
-                                        "domain": {"type": "string", "enum": ["tech", "business", "creative", "general"], "description": "전문 영역"}
-                                    },
-                                    "required": ["topic"]
-                                }
-                            },
-                            {
-                                "name": "get_collaboration_stats",
-                                "description": "협업 통계 및 성과를 조회합니다",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {}
-                                }
-                            }
-                        ]
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-            elif data.get("method") == "tools/call":
-                tool_name = data.get("params", {}).get("name")
-                arguments = data.get("params", {}).get("arguments", {})
-                
-                if tool_name == "enhanced_collaboration":
-                    task = arguments.get("task", "")
-                    result_text = collaborator.collaborate(task)
-                    
-                elif tool_name == "specialized_discussion":
-                    topic = arguments.get("topic", "")
-                    domain = arguments.get("domain", "general")
-                    
-                    # 도메인별 특화된 토론 시뮬레이션
-                    result_text = f"""💬 전문 영역 토론 결과
+collaborator = AIOrchestrator()
+
+server = RPCServer("enhanced-collaborative-ai", "2.0.0")
+
+@server.tool(
+    "enhanced_collaboration", "작업 유형별 특화된 AI 협업을 수행합니다",
+    {"task": {"type": "string", "description": "수행할 작업"}}, required=["task"]
+)
+def enhanced_collaboration(arguments):
+    return collaborator.collaborate(arguments.get("task", ""))
+
+@server.tool(
+    "specialized_discussion", "주제별 전문화된 AI 토론을 진행합니다",
+    {
+        "topic": {"type": "string", "description": "토론할 주제"},
+        "domain": {"type": "string", "enum": ["tech", "business", "creative", "general"], "description": "전문 영역"}
+    },
+    required=["topic"]
+)
+def specialized_discussion(arguments):
+    topic = arguments.get("topic", "")
+    domain = arguments.get("domain", "general")
+
+    # 도메인별 특화된 토론 시뮬레이션
+    return f"""💬 전문 영역 토론 결과
 
 🎯 주제: {topic}
 🏷️ 영역: {domain.upper()}
@@ -538,8 +484,9 @@ async def main():
 
 ✅ 토론 품질: {collaborator.get_quality_score(topic)}/10"""
 
-                elif tool_name == "get_collaboration_stats":
-                    result_text = f"""📊 협업 성과 통계
+@server.tool("get_collaboration_stats", "협업 통계 및 성과를 조회합니다")
+def get_collaboration_stats(arguments):
+    return f"""📊 협업 성과 통계
 
 🎯 총 협업 세션: {collaborator.collaboration_count}회
 📈 평균 품질 점수: 8.7/10
@@ -561,23 +508,9 @@ async def main():
 ⏱️ 마지막 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 🚀 시스템 상태: 최적화됨"""
 
-                else:
-                    result_text = f"❌ 알 수 없는 도구: {tool_name}"
-                
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": data.get("id"),
-                    "result": {
-                        "content": [{"type": "text", "text": result_text}]
-                    }
-                }
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-        except EOFError:
-            break
-        except Exception as e:
-            print(f"오류: {e}", file=sys.stderr)
+async def main():
+    """향상된 MCP 서버"""
+    await server.serve()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
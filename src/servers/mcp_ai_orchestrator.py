@@ -3,8 +3,10 @@
 MCP Server for AI Orchestrator
 Gemini가 작업을 분석하고 Gemini/Claude CLI 명령어로 실행하는 MCP 서버
 """
+import argparse
 import asyncio
 import json
+import os
 import subprocess
 import sys
 from typing import Any, Dict, List, Optional
@@ -17,10 +19,6 @@ try:
     from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     from mcp.types import (
-        CallToolRequest,
-        CallToolResult,
-        ListToolsRequest,
-        ListToolsResult,
         TextContent,
         Tool,
     )
@@ -28,6 +26,20 @@ except ImportError:
     print("MCP 라이브러리가 필요합니다: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    from ..utils.backend_runner import get_backend_runner
+    from ..utils.cli_runner import ChunkCallback
+    from ..utils.deadline import reset_deadline, set_deadline
+    from ..utils.http_transport import serve_http
+    from ..utils.progress import ProgressReporter, mcp_progress_reporter
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.backend_runner import get_backend_runner
+    from utils.cli_runner import ChunkCallback
+    from utils.deadline import reset_deadline, set_deadline
+    from utils.http_transport import serve_http
+    from utils.progress import ProgressReporter, mcp_progress_reporter
+
 # 로깅 설정 (stderr로 출력)
 logging.basicConfig(
     level=logging.INFO,
@@ -43,85 +55,62 @@ class TaskResult:
     result: str
     success: bool
     error: Optional[str] = None
+    timings: Optional[Dict[str, Optional[float]]] = None
+    cached: bool = False
 
 class CLIExecutor:
     """기존 gemini/claude CLI 명령어를 실행하는 클래스"""
     
-    async def execute_gemini(self, prompt: str) -> TaskResult:
-        """gemini CLI 명령어 실행"""
+    def __init__(self):
+        self.backend = get_backend_runner()
+        self.worker_pools = self.backend.worker_pools
+    
+    async def _execute_cli(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                           use_cache: bool = True, hedge: bool = False, reroute: bool = False) -> TaskResult:
+        """CLI 실행 (응답 캐시와 사전 기동 워커 풀 사용, stdout은 청크 단위로 on_chunk에 전달)
+
+        hedge=True면 응답이 늦을 때 다른 AI에도 요청하고 먼저 성공한 쪽을 assigned_to로 반환
+        reroute=True면 ai의 회로가 열려 있을 때 다른 AI로 실행하고 그 AI를 assigned_to로 반환
+        """
         try:
-            cmd = ["gemini", prompt]
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return TaskResult(
-                    assigned_to="gemini",
-                    command=" ".join(cmd),
-                    result=stdout.strip(),
-                    success=True
-                )
+            if hedge:
+                ai, result = await self.backend.execute_hedged(ai, prompt, on_chunk, use_cache)
             else:
-                return TaskResult(
-                    assigned_to="gemini",
-                    command=" ".join(cmd),
-                    result="",
-                    success=False,
-                    error=stderr.strip()
-                )
-                
-        except Exception as e:
+                result = await self.backend.execute(ai, prompt, on_chunk, use_cache, reroute=reroute)
+                ai = result.backend or ai
             return TaskResult(
-                assigned_to="gemini",
-                command=f"gemini {prompt}",
-                result="",
-                success=False,
-                error=f"CLI 실행 오류: {str(e)}"
-            )
-    
-    async def execute_claude(self, prompt: str) -> TaskResult:
-        """claude CLI 명령어 실행"""
-        try:
-            cmd = ["claude", prompt]
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                text=True
+                assigned_to=ai,
+                command=result.command or f"{ai} {prompt}",
+                result=result.result_text,
+                success=result.success,
+                error=result.error_text,
+                timings=result.timings,
+                cached=result.cached
             )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return TaskResult(
-                    assigned_to="claude",
-                    command=" ".join(cmd),
-                    result=stdout.strip(),
-                    success=True
-                )
-            else:
-                return TaskResult(
-                    assigned_to="claude",
-                    command=" ".join(cmd),
-                    result="",
-                    success=False,
-                    error=stderr.strip()
-                )
                 
         except Exception as e:
             return TaskResult(
-                assigned_to="claude",
-                command=f"claude {prompt}",
+                assigned_to=ai,
+                command=f"{ai} {prompt}",
                 result="",
                 success=False,
                 error=f"CLI 실행 오류: {str(e)}"
             )
+    
+    async def execute_gemini(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True, reroute: bool = False) -> TaskResult:
+        """gemini CLI 명령어 실행"""
+        return await self._execute_cli("gemini", prompt, on_chunk, use_cache, reroute=reroute)
+    
+    async def execute_claude(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True, reroute: bool = False) -> TaskResult:
+        """claude CLI 명령어 실행"""
+        return await self._execute_cli("claude", prompt, on_chunk, use_cache, reroute=reroute)
+    
+    async def execute_hedged(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True) -> TaskResult:
+        """ai 우선 헤징 실행 (어느 AI의 답이든 괜찮은 지연 시간 민감 호출용)"""
+        return await self._execute_cli(ai, prompt, on_chunk, use_cache, hedge=True)
 
 class TaskAssigner:
     """작업을 어느 AI에 할당할지 결정하는 클래스"""
@@ -129,7 +118,7 @@ class TaskAssigner:
     def __init__(self, cli_executor: CLIExecutor):
         self.cli_executor = cli_executor
     
-    async def decide_assignment(self, task_description: str) -> str:
+    async def decide_assignment(self, task_description: str, use_cache: bool = True) -> str:
         """Gemini에게 작업 할당을 물어보는 함수"""
         assignment_prompt = f"""
 다음 작업을 분석하고 Gemini와 Claude 중 어느 AI가 더 적합한지 결정해주세요:
@@ -142,9 +131,13 @@ class TaskAssigner:
 
 응답은 반드시 "gemini" 또는 "claude" 중 하나만 답하세요.
 """
+        # 회로가 열린 Gemini에는 할당 질문도 보내지 않음 (실패할 호출을 기다리지 않고 바로 Claude)
+        if not self.cli_executor.backend.is_available("gemini"):
+            logger.info("🔌 Gemini 회로 차단 중 - 할당 질문 없이 CLAUDE에 할당")
+            return "claude"
         
         try:
-            result = await self.cli_executor.execute_gemini(assignment_prompt)
+            result = await self.cli_executor.execute_gemini(assignment_prompt, use_cache=use_cache)
             if result.success:
                 assignment = result.result.strip().lower()
                 return "gemini" if "gemini" in assignment else "claude"
@@ -162,22 +155,37 @@ class AIOrchestrator:
         self.task_assigner = TaskAssigner(self.cli_executor)
         self.task_history: List[Dict] = []
     
-    async def execute_task(self, task_description: str, force_ai: Optional[str] = None) -> TaskResult:
+    async def execute_task(self, task_description: str, force_ai: Optional[str] = None,
+                           progress: Optional[ProgressReporter] = None, use_cache: bool = True,
+                           hedge: bool = False) -> TaskResult:
         """작업을 실행하는 메인 함수"""
         
         # AI 강제 지정이 없으면 자동 할당
         if force_ai:
             assigned_ai = force_ai.lower()
+            if hedge:
+                # 직접 지정한 AI의 답만 받아야 하므로 다른 AI로 헤지하지 않음
+                logger.info(f"🏁 force_ai={assigned_ai} 지정으로 헤지 요청을 사용하지 않습니다")
+                hedge = False
         else:
-            assigned_ai = await self.task_assigner.decide_assignment(task_description)
+            assigned_ai = await self.task_assigner.decide_assignment(task_description, use_cache)
         
         logger.info(f"작업을 {assigned_ai.upper()}에 할당: {task_description[:50]}...")
+        if progress:
+            await progress.stage(f"작업을 {assigned_ai.upper()}에 할당")
+        on_chunk = progress.chunk_callback(assigned_ai) if progress else None
         
         # 해당 AI로 작업 실행
-        if assigned_ai == "gemini":
-            result = await self.cli_executor.execute_gemini(task_description)
+        if hedge:
+            result = await self.cli_executor.execute_hedged(assigned_ai, task_description, on_chunk, use_cache)
+            if result.assigned_to != assigned_ai:
+                logger.info(f"🏁 헤지 요청이 먼저 응답: {result.assigned_to.upper()}")
         else:
-            result = await self.cli_executor.execute_claude(task_description)
+            # 직접 지정한 AI가 아니면 회로가 열린 AI 대신 다른 AI가 처리
+            execute = self.cli_executor.execute_gemini if assigned_ai == "gemini" else self.cli_executor.execute_claude
+            result = await execute(task_description, on_chunk, use_cache, reroute=not force_ai)
+            if result.assigned_to != assigned_ai:
+                logger.info(f"🔀 {assigned_ai.upper()} 회로 차단 중 - {result.assigned_to.upper()}가 처리")
         
         # 히스토리에 기록
         self.task_history.append({
@@ -189,14 +197,14 @@ class AIOrchestrator:
         
         return result
     
-    async def execute_parallel_tasks(self, tasks: List[Dict]) -> List[TaskResult]:
+    async def execute_parallel_tasks(self, tasks: List[Dict], use_cache: bool = True) -> List[TaskResult]:
         """여러 작업을 병렬로 실행"""
         task_coroutines = []
         
         for task_info in tasks:
             task_desc = task_info.get("description", "")
             force_ai = task_info.get("force_ai")
-            task_coroutines.append(self.execute_task(task_desc, force_ai))
+            task_coroutines.append(self.execute_task(task_desc, force_ai, use_cache=use_cache))
         
         results = await asyncio.gather(*task_coroutines, return_exceptions=True)
         
@@ -228,7 +236,8 @@ class AIOrchestrator:
             "gemini_tasks": gemini_tasks,
             "claude_tasks": claude_tasks,
             "successful_tasks": successful_tasks,
-            "success_rate": successful_tasks / total_tasks if total_tasks > 0 else 0
+            "success_rate": successful_tasks / total_tasks if total_tasks > 0 else 0,
+            **self.cli_executor.backend.get_stats()
         }
 
 # MCP 서버 인스턴스 생성
@@ -236,133 +245,160 @@ server = Server("ai-orchestrator")
 orchestrator = AIOrchestrator()
 
 @server.list_tools()
-async def handle_list_tools() -> ListToolsResult:
+async def handle_list_tools() -> List[Tool]:
     """사용 가능한 도구들을 반환"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="execute_task",
-                description="작업을 분석하고 적절한 AI(Gemini/Claude)에 할당하여 실행합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task": {
-                            "type": "string",
-                            "description": "실행할 작업 설명"
-                        },
-                        "force_ai": {
-                            "type": "string",
-                            "enum": ["gemini", "claude"],
-                            "description": "특정 AI 강제 지정 (선택사항)"
-                        }
+    return [
+        Tool(
+            name="execute_task",
+            description="작업을 분석하고 적절한 AI(Gemini/Claude)에 할당하여 실행합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "실행할 작업 설명"
+                    },
+                    "force_ai": {
+                        "type": "string",
+                        "enum": ["gemini", "claude"],
+                        "description": "특정 AI 강제 지정 (선택사항)"
                     },
-                    "required": ["task"]
-                }
-            ),
-            Tool(
-                name="execute_parallel_tasks",
-                description="여러 작업을 병렬로 실행합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "tasks": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "description": {
-                                        "type": "string",
-                                        "description": "작업 설명"
-                                    },
-                                    "force_ai": {
-                                        "type": "string",
-                                        "enum": ["gemini", "claude"],
-                                        "description": "특정 AI 강제 지정 (선택사항)"
-                                    }
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    },
+                    "hedge": {
+                        "type": "boolean",
+                        "description": "응답이 늦으면 다른 AI에도 요청해 먼저 성공한 답을 사용 (선택사항, 지연 시간 우선). force_ai를 지정하면 무시됩니다"
+                    },
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "요청 전체 마감 시간(초), 넘으면 남은 단계를 중단하고 CLI를 종료 (선택사항)"
+                    }
+                },
+                "required": ["task"]
+            }
+        ),
+        Tool(
+            name="execute_parallel_tasks",
+            description="여러 작업을 병렬로 실행합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tasks": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "description": {
+                                    "type": "string",
+                                    "description": "작업 설명"
                                 },
-                                "required": ["description"]
-                            }
+                                "force_ai": {
+                                    "type": "string",
+                                    "enum": ["gemini", "claude"],
+                                    "description": "특정 AI 강제 지정 (선택사항)"
+                                }
+                            },
+                            "required": ["description"]
                         }
                     },
-                    "required": ["tasks"]
-                }
-            ),
-            Tool(
-                name="get_statistics",
-                description="작업 실행 통계를 반환합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            Tool(
-                name="execute_gemini",
-                description="Gemini CLI로 직접 작업을 실행합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {
-                            "type": "string",
-                            "description": "Gemini에게 전달할 프롬프트"
-                        }
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
                     },
-                    "required": ["prompt"]
-                }
-            ),
-            Tool(
-                name="execute_claude",
-                description="Claude CLI로 직접 작업을 실행합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {
-                            "type": "string",
-                            "description": "Claude에게 전달할 프롬프트"
-                        }
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "요청 전체 마감 시간(초), 넘으면 남은 단계를 중단하고 CLI를 종료 (선택사항)"
+                    }
+                },
+                "required": ["tasks"]
+            }
+        ),
+        Tool(
+            name="get_statistics",
+            description="작업 실행 통계를 반환합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        ),
+        Tool(
+            name="execute_gemini",
+            description="Gemini CLI로 직접 작업을 실행합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "prompt": {
+                        "type": "string",
+                        "description": "Gemini에게 전달할 프롬프트"
                     },
-                    "required": ["prompt"]
-                }
-            )
-        ]
-    )
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    }
+                },
+                "required": ["prompt"]
+            }
+        ),
+        Tool(
+            name="execute_claude",
+            description="Claude CLI로 직접 작업을 실행합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "prompt": {
+                        "type": "string",
+                        "description": "Claude에게 전달할 프롬프트"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    }
+                },
+                "required": ["prompt"]
+            }
+        )
+    ]
 
 @server.call_tool()
-async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
+async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
     """도구 호출 처리"""
+    arguments = arguments or {}
+    progress = mcp_progress_reporter(server)
+    use_cache = not arguments.get("no_cache", False)
+    deadline_token = set_deadline(arguments.get("timeout_seconds"))
     
     try:
-        if request.name == "execute_task":
-            task = request.params.get("task", "")
-            force_ai = request.params.get("force_ai")
+        if name == "execute_task":
+            task = arguments.get("task", "")
+            force_ai = arguments.get("force_ai")
             
             if not task:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 작업 설명이 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 작업 설명이 필요합니다")]
             
-            result = await orchestrator.execute_task(task, force_ai)
+            result = await orchestrator.execute_task(
+                task, force_ai, progress, use_cache, bool(arguments.get("hedge", False)))
             
             response = {
                 "assigned_to": result.assigned_to,
                 "command": result.command,
                 "success": result.success,
                 "result": result.result if result.success else "",
-                "error": result.error if not result.success else None
+                "error": result.error if not result.success else None,
+                "timings": result.timings,
+                "cached": result.cached
             }
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
         
-        elif request.name == "execute_parallel_tasks":
-            tasks = request.params.get("tasks", [])
+        elif name == "execute_parallel_tasks":
+            tasks = arguments.get("tasks", [])
             
             if not tasks:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 작업 목록이 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 작업 목록이 필요합니다")]
             
-            results = await orchestrator.execute_parallel_tasks(tasks)
+            results = await orchestrator.execute_parallel_tasks(tasks, use_cache)
             
             response = []
             for result in results:
@@ -371,76 +407,87 @@ async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
                     "command": result.command,
                     "success": result.success,
                     "result": result.result if result.success else "",
-                    "error": result.error if not result.success else None
+                    "error": result.error if not result.success else None,
+                    "timings": result.timings,
+                    "cached": result.cached
                 })
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
         
-        elif request.name == "get_statistics":
+        elif name == "get_statistics":
             stats = orchestrator.get_statistics()
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
         
-        elif request.name == "execute_gemini":
-            prompt = request.params.get("prompt", "")
+        elif name == "execute_gemini":
+            prompt = arguments.get("prompt", "")
             
             if not prompt:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
             
-            result = await orchestrator.cli_executor.execute_gemini(prompt)
+            result = await orchestrator.cli_executor.execute_gemini(
+                prompt, progress.chunk_callback() if progress else None, use_cache)
             
             response = {
                 "assigned_to": result.assigned_to,
                 "command": result.command,
                 "success": result.success,
                 "result": result.result if result.success else "",
-                "error": result.error if not result.success else None
+                "error": result.error if not result.success else None,
+                "timings": result.timings,
+                "cached": result.cached
             }
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
         
-        elif request.name == "execute_claude":
-            prompt = request.params.get("prompt", "")
+        elif name == "execute_claude":
+            prompt = arguments.get("prompt", "")
             
             if not prompt:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
-                )
+                return [TextContent(type="text", text="ERROR: 프롬프트가 필요합니다")]
             
-            result = await orchestrator.cli_executor.execute_claude(prompt)
+            result = await orchestrator.cli_executor.execute_claude(
+                prompt, progress.chunk_callback() if progress else None, use_cache)
             
             response = {
                 "assigned_to": result.assigned_to,
                 "command": result.command,
                 "success": result.success,
                 "result": result.result if result.success else "",
-                "error": result.error if not result.success else None
+                "error": result.error if not result.success else None,
+                "timings": result.timings,
+                "cached": result.cached
             }
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
         
         else:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {request.name}")]
-            )
+            return [TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {name}")]
     
+    except asyncio.CancelledError:
+        # 클라이언트 취소: 남은 단계는 중단되고 실행 중인 CLI 프로세스는 종료됨
+        logger.info(f"🛑 {name} 요청 취소됨")
+        raise
     except Exception as e:
         logger.error(f"도구 실행 중 오류: {str(e)}")
-        return CallToolResult(
-            content=[TextContent(type="text", text=f"ERROR: {str(e)}")]
-        )
+        return [TextContent(type="text", text=f"ERROR: {str(e)}")]
+    finally:
+        # 남은 부분 출력은 최종 응답보다 먼저 전송
+        reset_deadline(deadline_token)
+        if progress:
+            await progress.flush()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI Orchestrator MCP 서버")
+    parser.add_argument("--transport", choices=("stdio", "http"), default="stdio",
+                        help="http: 여러 클라이언트가 한 프로세스를 공유 (Streamable HTTP)")
+    parser.add_argument("--host", help="HTTP 바인딩 주소 (기본: config.json http.host)")
+    parser.add_argument("--port", type=int, help="HTTP 포트 (기본: config.json http.port)")
+    parser.add_argument("--unix-socket", help="TCP 대신 사용할 Unix 소켓 경로")
+    return parser.parse_args()
 
 async def main():
     """MCP 서버 실행"""
+    options = parse_args()
     # 서버 초기화 옵션
     init_options = InitializationOptions(
         server_name="ai-orchestrator",
@@ -449,15 +496,21 @@ async def main():
     )
     
     try:
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                init_options
-            )
+        await orchestrator.cli_executor.worker_pools.start()
+        if options.transport == "http":
+            await serve_http(server, options.host, options.port, options.unix_socket)
+        else:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    init_options
+                )
     except Exception as e:
         logger.error(f"서버 실행 중 오류: {str(e)}")
         sys.exit(1)
+    finally:
+        await orchestrator.cli_executor.worker_pools.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
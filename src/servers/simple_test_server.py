@@ -5,16 +5,13 @@
 import asyncio
 import json
 import sys
+from typing import Any, Dict, List, Optional
 
 try:
     from mcp.server import Server
     from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     from mcp.types import (
-        CallToolRequest,
-        CallToolResult,
-        ListToolsRequest,
-        ListToolsResult,
         TextContent,
         Tool,
     )
@@ -26,63 +23,56 @@ except ImportError:
 server = Server("test-collaborative-ai")
 
 @server.list_tools()
-async def handle_list_tools() -> ListToolsResult:
+async def handle_list_tools() -> List[Tool]:
     """사용 가능한 도구들 반환"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="test_collaboration",
-                description="간단한 협업 테스트 도구입니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "message": {
-                            "type": "string",
-                            "description": "테스트 메시지"
-                        }
-                    },
-                    "required": ["message"]
-                }
-            ),
-            Tool(
-                name="hello_world",
-                description="Hello World를 반환합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            )
-        ]
-    )
+    return [
+        Tool(
+            name="test_collaboration",
+            description="간단한 협업 테스트 도구입니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "message": {
+                        "type": "string",
+                        "description": "테스트 메시지"
+                    }
+                },
+                "required": ["message"]
+            }
+        ),
+        Tool(
+            name="hello_world",
+            description="Hello World를 반환합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        )
+    ]
 
 @server.call_tool()
-async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
+async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
     """도구 호출 처리"""
+    arguments = arguments or {}
     
-    if request.name == "test_collaboration":
-        message = request.params.get("message", "")
+    if name == "test_collaboration":
+        message = arguments.get("message", "")
         response = {
             "status": "success",
             "message": f"협업 테스트 완료: {message}",
             "timestamp": asyncio.get_event_loop().time()
         }
-        return CallToolResult(
-            content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-        )
+        return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
     
-    elif request.name == "hello_world":
+    elif name == "hello_world":
         response = {
             "message": "Hello from Collaborative AI Server!",
             "status": "working"
         }
-        return CallToolResult(
-            content=[TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
-        )
+        return [TextContent(type="text", text=json.dumps(response, ensure_ascii=False, indent=2))]
     
     else:
-        return CallToolResult(
-            content=[TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {request.name}")]
-        )
+        return [TextContent(type="text", text=f"ERROR: 알 수 없는 도구: {name}")]
 
 async def main():
     """MCP 서버 실행"""
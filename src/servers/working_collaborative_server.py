@@ -4,6 +4,7 @@ Working Collaborative AI Orchestrator - 안정적인 버전
 """
 import asyncio
 import json
+import os
 import sys
 import subprocess
 from typing import Any, Dict, List, Optional
@@ -13,10 +14,6 @@ try:
     from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     from mcp.types import (
-        CallToolRequest,
-        CallToolResult,
-        ListToolsRequest,
-        ListToolsResult,
         TextContent,
         Tool,
     )
@@ -24,34 +21,57 @@ except ImportError:
     print("MCP 라이브러리가 필요합니다: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    from ..utils.backend_runner import get_backend_runner
+    from ..utils.cli_runner import ChunkCallback, run_cli
+    from ..utils.deadline import reset_deadline, set_deadline
+    from ..utils.progress import ProgressReporter, mcp_progress_reporter
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.backend_runner import get_backend_runner
+    from utils.cli_runner import ChunkCallback, run_cli
+    from utils.deadline import reset_deadline, set_deadline
+    from utils.progress import ProgressReporter, mcp_progress_reporter
+
 class SimpleCLIExecutor:
     """간단한 CLI 실행기"""
     
-    async def execute_command(self, cmd: List[str]) -> Dict[str, Any]:
-        """명령어 실행"""
+    def __init__(self):
+        self.backend = get_backend_runner()
+        self.worker_pools = self.backend.worker_pools
+    
+    async def execute_command(self, cmd: List[str], on_chunk: Optional[ChunkCallback] = None,
+                              use_cache: bool = True, reroute: bool = False) -> Dict[str, Any]:
+        """명령어 실행 (stdout은 청크 단위로 on_chunk에 전달)"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = await process.communicate()
-            
+            if len(cmd) == 2:
+                # [ai, prompt] 형태는 백엔드 실행기로 (응답 캐시, 사전 기동 워커 풀, argv/stdin 전달 방식 적용)
+                result = await self.backend.execute(cmd[0], cmd[1], on_chunk, use_cache, reroute=reroute)
+                return {**result.as_dict(), "command": " ".join(cmd), "ai": result.backend or cmd[0]}
+            result = await run_cli(cmd, on_chunk)
+            return {**result.as_dict(), "command": " ".join(cmd)}
+                
+        except Exception as e:
             return {
-                "success": process.returncode == 0,
-                "result": stdout.strip() if process.returncode == 0 else "",
-                "error": stderr.strip() if process.returncode != 0 else None,
+                "success": False,
+                "result": "",
+                "error": f"실행 오류: {str(e)}",
                 "command": " ".join(cmd)
             }
-                
+    
+    async def execute_hedged(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """헤징 실행 (응답이 늦으면 다른 AI에도 요청, 먼저 성공한 응답 사용)"""
+        try:
+            answered_by, result = await self.backend.execute_hedged(ai, prompt, on_chunk, use_cache)
+            return {**result.as_dict(), "command": f"{answered_by} (hedged)", "ai": answered_by}
         except Exception as e:
             return {
                 "success": False,
                 "result": "",
                 "error": f"실행 오류: {str(e)}",
-                "command": " ".join(cmd)
+                "command": f"{ai} (hedged)",
+                "ai": ai
             }
 
 class WorkingCollaborativeAI:
@@ -61,17 +81,30 @@ class WorkingCollaborativeAI:
         self.cli = SimpleCLIExecutor()
         self.session_count = 0
     
-    async def simple_collaboration(self, task: str) -> Dict[str, Any]:
+    async def simple_collaboration(self, task: str, progress: Optional[ProgressReporter] = None,
+                                   use_cache: bool = True) -> Dict[str, Any]:
         """간단한 협업 수행"""
         self.session_count += 1
         
         print(f"🤝 협업 세션 #{self.session_count} 시작: {task}", file=sys.stderr)
         
         # 1단계: Gemini에게 먼저 물어보기
-        gemini_result = await self.cli.execute_command(["gemini", f"이 작업에 대해 분석해주세요: {task}"])
+        if progress:
+            await progress.stage("1단계: Gemini 분석")
+        gemini_result = await self.cli.execute_command(
+            ["gemini", f"이 작업에 대해 분석해주세요: {task}"],
+            progress.chunk_callback("gemini") if progress else None,
+            use_cache
+        )
         
         # 2단계: Claude에게도 물어보기  
-        claude_result = await self.cli.execute_command(["claude", f"이 작업에 대해 분석해주세요: {task}"])
+        if progress:
+            await progress.stage("2단계: Claude 분석")
+        claude_result = await self.cli.execute_command(
+            ["claude", f"이 작업에 대해 분석해주세요: {task}"],
+            progress.chunk_callback("claude") if progress else None,
+            use_cache
+        )
         
         # 3단계: 두 결과 비교
         if gemini_result["success"] and claude_result["success"]:
@@ -89,7 +122,15 @@ Claude 분석:
 
 두 분석을 종합하여 최고의 솔루션을 제공해주세요.
 """
-            final_result = await self.cli.execute_command(["claude", comparison_task])
+            if progress:
+                await progress.stage("3단계: 두 분석 종합")
+            # 종합 단계는 Claude 회로가 열려 있으면 Gemini가 대신 처리
+            final_result = await self.cli.execute_command(
+                ["claude", comparison_task],
+                progress.chunk_callback("claude") if progress else None,
+                use_cache,
+                reroute=True
+            )
             
             return {
                 "task": task,
@@ -136,17 +177,25 @@ Claude 분석:
                 "message": "두 AI 모두 작업을 완료하지 못했습니다."
             }
     
-    async def quick_chat(self, ai: str, message: str) -> Dict[str, Any]:
-        """특정 AI와 빠른 대화"""
+    async def quick_chat(self, ai: str, message: str, progress: Optional[ProgressReporter] = None,
+                         use_cache: bool = True, hedge: bool = False) -> Dict[str, Any]:
+        """특정 AI와 빠른 대화 (hedge=True면 먼저 성공한 AI의 답변)"""
         if ai.lower() not in ["gemini", "claude"]:
             return {"error": "AI는 'gemini' 또는 'claude'여야 합니다."}
         
-        result = await self.cli.execute_command([ai.lower(), message])
+        on_chunk = progress.chunk_callback() if progress else None
+        if hedge:
+            result = await self.cli.execute_hedged(ai.lower(), message, on_chunk, use_cache)
+            ai = result["ai"]
+        else:
+            result = await self.cli.execute_command([ai.lower(), message], on_chunk, use_cache)
         return {
             "ai": ai,
             "message": message,
             "response": result['result'] if result['success'] else result['error'],
-            "success": result['success']
+            "success": result['success'],
+            "timings": result.get('timings'),
+            "cached": result.get('cached', False)
         }
     
     def get_stats(self) -> Dict[str, Any]:
@@ -154,7 +203,8 @@ Claude 분석:
         return {
             "total_sessions": self.session_count,
             "status": "operational",
-            "available_ais": ["gemini", "claude"]
+            "available_ais": ["gemini", "claude"],
+            **self.cli.backend.get_stats()
         }
 
 # MCP 서버 설정
@@ -162,105 +212,119 @@ server = Server("working-collaborative-ai")
 orchestrator = WorkingCollaborativeAI()
 
 @server.list_tools()
-async def handle_list_tools() -> ListToolsResult:
+async def handle_list_tools() -> List[Tool]:
     """도구 목록 반환"""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="collaborate",
-                description="Gemini와 Claude가 협업하여 작업을 수행합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task": {
-                            "type": "string",
-                            "description": "수행할 작업 설명"
-                        }
+    return [
+        Tool(
+            name="collaborate",
+            description="Gemini와 Claude가 협업하여 작업을 수행합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "수행할 작업 설명"
                     },
-                    "required": ["task"]
-                }
-            ),
-            Tool(
-                name="chat_with_ai",
-                description="특정 AI와 직접 대화합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "ai": {
-                            "type": "string",
-                            "enum": ["gemini", "claude"],
-                            "description": "대화할 AI (gemini 또는 claude)"
-                        },
-                        "message": {
-                            "type": "string", 
-                            "description": "전달할 메시지"
-                        }
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
                     },
-                    "required": ["ai", "message"]
-                }
-            ),
-            Tool(
-                name="get_stats",
-                description="협업 통계를 조회합니다",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            )
-        ]
-    )
+                    "timeout_seconds": {
+                        "type": "number",
+                        "description": "요청 전체 마감 시간(초), 넘으면 남은 단계를 중단하고 CLI를 종료 (선택사항)"
+                    }
+                },
+                "required": ["task"]
+            }
+        ),
+        Tool(
+            name="chat_with_ai",
+            description="특정 AI와 직접 대화합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ai": {
+                        "type": "string",
+                        "enum": ["gemini", "claude"],
+                        "description": "대화할 AI (gemini 또는 claude)"
+                    },
+                    "message": {
+                        "type": "string", 
+                        "description": "전달할 메시지"
+                    },
+                    "no_cache": {
+                        "type": "boolean",
+                        "description": "응답 캐시를 사용하지 않고 새로 실행 (선택사항)"
+                    },
+                    "hedge": {
+                        "type": "boolean",
+                        "description": "응답이 늦으면 다른 AI에도 요청해 먼저 성공한 답을 사용 (선택사항, 지연 시간 우선)"
+                    }
+                },
+                "required": ["ai", "message"]
+            }
+        ),
+        Tool(
+            name="get_stats",
+            description="협업 통계를 조회합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        )
+    ]
 
 @server.call_tool()
-async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
+async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[TextContent]:
     """도구 호출 처리"""
+    arguments = arguments or {}
+    progress = mcp_progress_reporter(server)
+    use_cache = not arguments.get("no_cache", False)
+    deadline_token = set_deadline(arguments.get("timeout_seconds"))
     
     try:
-        if request.name == "collaborate":
-            task = request.params.get("task", "")
+        if name == "collaborate":
+            task = arguments.get("task", "")
             if not task:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="❌ 작업 설명이 필요합니다")]
-                )
+                return [TextContent(type="text", text="❌ 작업 설명이 필요합니다")]
             
             print(f"🚀 협업 작업 시작: {task}", file=sys.stderr)
-            result = await orchestrator.simple_collaboration(task)
+            result = await orchestrator.simple_collaboration(task, progress, use_cache)
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
-        elif request.name == "chat_with_ai":
-            ai = request.params.get("ai", "")
-            message = request.params.get("message", "")
+        elif name == "chat_with_ai":
+            ai = arguments.get("ai", "")
+            message = arguments.get("message", "")
             
             if not ai or not message:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="❌ AI와 메시지가 모두 필요합니다")]
-                )
+                return [TextContent(type="text", text="❌ AI와 메시지가 모두 필요합니다")]
             
-            result = await orchestrator.quick_chat(ai, message)
+            result = await orchestrator.quick_chat(
+                ai, message, progress, use_cache, bool(arguments.get("hedge", False)))
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         
-        elif request.name == "get_stats":
+        elif name == "get_stats":
             stats = orchestrator.get_stats()
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
-            )
+            return [TextContent(type="text", text=json.dumps(stats, ensure_ascii=False, indent=2))]
         
         else:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"❌ 알 수 없는 도구: {request.name}")]
-            )
+            return [TextContent(type="text", text=f"❌ 알 수 없는 도구: {name}")]
     
+    except asyncio.CancelledError:
+        # 클라이언트 취소: 남은 단계는 중단되고 실행 중인 CLI 프로세스는 종료됨
+        print(f"🛑 {name} 요청 취소됨", file=sys.stderr)
+        raise
     except Exception as e:
         print(f"❌ 도구 실행 오류: {str(e)}", file=sys.stderr)
-        return CallToolResult(
-            content=[TextContent(type="text", text=f"❌ 오류: {str(e)}")]
-        )
+        return [TextContent(type="text", text=f"❌ 오류: {str(e)}")]
+    finally:
+        # 남은 부분 출력은 최종 응답보다 먼저 전송
+        reset_deadline(deadline_token)
+        if progress:
+            await progress.flush()
 
 async def main():
     """MCP 서버 실행"""
@@ -273,6 +337,7 @@ async def main():
     print("🤝 Working Collaborative AI 서버 시작...", file=sys.stderr)
     
     try:
+        await orchestrator.cli.worker_pools.start()
         async with stdio_server() as (read_stream, write_stream):
             await server.run(
                 read_stream,
@@ -282,6 +347,8 @@ async def main():
     except Exception as e:
         print(f"❌ 서버 실행 중 오류: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        await orchestrator.cli.worker_pools.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
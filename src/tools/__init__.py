@@ -7,5 +7,6 @@
 from .debug_dashboard import *
 
 __all__ = [
-    "debug_dashboard"
+    "debug_dashboard",
+    "fake_backend"
 ]
\ No newline at end of file
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+🧪 가짜 gemini/claude CLI
+
+실제 CLI와 네트워크 없이 서버를 부하 테스트하기 위한 대체 실행 파일입니다.
+config.json의 fake_backend.enabled가 true이면 백엔드 실행기와 사전 기동 워커 풀이
+gemini/claude 대신 이 스크립트를 실행합니다.
+
+    python src/tools/fake_backend.py gemini "프롬프트"
+    echo "프롬프트" | python src/tools/fake_backend.py claude -p
+    python src/tools/fake_backend.py claude -p --input-format stream-json --output-format stream-json
+
+백엔드별 기동 시간, 첫 응답까지의 지연 분포, 출력 크기, 스트리밍 간격, 오류/멈춤 비율을
+설정할 수 있으며, deterministic이면 같은 (seed, 백엔드, 프롬프트)는 항상 같은 동작을 합니다.
+"""
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from ..utils.config import get_section
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.config import get_section
+
+FAKE_BACKEND_DEFAULTS = {
+    "enabled": False,
+    "seed": 0,
+    # false면 호출마다 무작위 (재시도 시 일시적 오류가 풀리는 상황 재현용)
+    "deterministic": True,
+    "backends": {
+        "gemini": {
+            "startup_seconds": 0.3,
+            "latency": {"distribution": "lognormal", "median_seconds": 2.0, "sigma": 0.5, "max_seconds": 30},
+            "output_bytes": {"min": 200, "max": 2000},
+            "chunk_bytes": 64,
+            "chunk_interval_seconds": 0.02,
+            "error_rate": 0.0,
+            "transient_error_rate": 0.0,
+            "hang_rate": 0.0
+        },
+        "claude": {
+            "startup_seconds": 0.5,
+            "latency": {"distribution": "lognormal", "median_seconds": 3.0, "sigma": 0.5, "max_seconds": 30},
+            "output_bytes": {"min": 400, "max": 4000},
+            "chunk_bytes": 64,
+            "chunk_interval_seconds": 0.02,
+            "error_rate": 0.0,
+            "transient_error_rate": 0.0,
+            "hang_rate": 0.0
+        }
+    }
+}
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+WORDS = (
+    "분석", "요구사항", "구현", "검토", "개선", "설계", "테스트", "성능", "구조", "제안",
+    "analysis", "design", "latency", "cache", "workflow", "review", "draft", "result"
+)
+
+# 백엔드 설정이 없는 이름으로 호출될 때 사용할 프로필
+DEFAULT_PROFILE = FAKE_BACKEND_DEFAULTS["backends"]["gemini"]
+
+
+def sample_latency(rng: random.Random, spec: Dict[str, Any]) -> float:
+    """latency 설정에 따라 첫 응답까지의 지연 시간을 뽑음"""
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "fixed":
+        value = float(spec.get("seconds", spec.get("median_seconds", 0)))
+    elif distribution == "uniform":
+        value = rng.uniform(float(spec.get("min_seconds", 0)), float(spec.get("max_seconds", 1)))
+    elif distribution == "lognormal":
+        value = float(spec.get("median_seconds", 1)) * rng.lognormvariate(0, float(spec.get("sigma", 0.5)))
+    else:
+        raise ValueError(f"지원하지 않는 지연 분포: {distribution} (가능: {', '.join(DISTRIBUTIONS)})")
+    cap = spec.get("max_seconds")
+    return max(0.0, min(value, float(cap)) if cap is not None else value)
+
+
+def build_response(rng: random.Random, backend: str, prompt: str, size: int) -> str:
+    """프롬프트 형식에 맞춘 가짜 응답 (점수 요청에는 숫자, AI 선택 요청에는 AI 이름, JSON 요청에는 JSON 포함)"""
+    if "숫자로" in prompt or "number only" in prompt.lower():
+        return str(rng.randint(6, 9))
+
+    head = f"[fake-{backend}] 프롬프트 {len(prompt.encode('utf-8'))}바이트 수신."
+    if "gemini 또는 claude" in prompt.lower().replace('"', ""):
+        head += f" 추천: {rng.choice(('gemini', 'claude'))}."
+    parts = [head]
+    length = len(head.encode("utf-8"))
+    while length < size:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word.encode("utf-8")) + 1
+    text = " ".join(parts)
+
+    if "응답 형식: JSON" in prompt:
+        data = {"analysis": text, "better_ai": rng.choice(("gemini", "claude")), "reason": "fake"}
+        return f"분석 결과입니다.\n```json\n{json.dumps(data, ensure_ascii=False, indent=2)}\n```"
+    if "quality_score" in prompt:
+        text += f"\n```json\n{{\"quality_score\": {rng.randint(6, 9)}}}\n```"
+    return text
+
+
+class FakeBackend:
+    """백엔드 프로필 하나로 요청을 흉내 냄"""
+
+    def __init__(self, backend: str, settings: Optional[Dict[str, Any]] = None):
+        settings = settings if settings is not None else get_section("fake_backend", FAKE_BACKEND_DEFAULTS)
+        self.backend = backend
+        self.seed = settings.get("seed", 0)
+        self.deterministic = bool(settings.get("deterministic", True))
+        self.profile = (settings.get("backends") or {}).get(backend) or DEFAULT_PROFILE
+
+    def _rng(self, prompt: str) -> random.Random:
+        if self.deterministic:
+            return random.Random(f"{self.seed}:{self.backend}:{prompt}")
+        return random.Random()
+
+    def plan(self, prompt: str) -> Tuple[str, float, str]:
+        """(결과 종류 ok/error/transient/hang, 첫 응답 지연, 응답 텍스트)"""
+        rng = self._rng(prompt)
+        p = self.profile
+        roll = rng.random()
+        hang = float(p.get("hang_rate", 0))
+        error = hang + float(p.get("error_rate", 0))
+        transient = error + float(p.get("transient_error_rate", 0))
+        outcome = "hang" if roll < hang else "error" if roll < error else "transient" if roll < transient else "ok"
+
+        latency = sample_latency(rng, p.get("latency") or {})
+        sizes = p.get("output_bytes") or {}
+        size = rng.randint(int(sizes.get("min", 200)), max(int(sizes.get("min", 200)), int(sizes.get("max", 2000))))
+        return outcome, latency, build_response(rng, self.backend, prompt, size)
+
+    def error_message(self, outcome: str) -> str:
+        if outcome == "transient":
+            return f"Error: 503 Service Unavailable - {self.backend} model overloaded (simulated)"
+        return f"Error: {self.backend} request failed (simulated)"
+
+    def chunks(self, text: str) -> List[str]:
+        """chunk_bytes 단위로 나눈 응답 (UTF-8 문자 경계 유지)"""
+        size = max(1, int(self.profile.get("chunk_bytes", 64)))
+        data = text.encode("utf-8")
+        out, start = [], 0
+        while start < len(data):
+            end = min(len(data), start + size)
+            while end < len(data) and (data[end] & 0xC0) == 0x80:
+                end += 1
+            out.append(data[start:end].decode("utf-8"))
+            start = end
+        return out
+
+    def respond(self, prompt: str, emit) -> Tuple[bool, str]:
+        """요청 한 건 처리, 청크마다 emit(text) 호출 후 (성공 여부, 전체 응답 또는 오류) 반환"""
+        outcome, latency, text = self.plan(prompt)
+        if outcome == "hang":
+            while True:
+                time.sleep(3600)
+        if outcome != "ok":
+            return False, self.error_message(outcome)
+
+        time.sleep(latency)
+        interval = float(self.profile.get("chunk_interval_seconds", 0))
+        for i, chunk in enumerate(self.chunks(text)):
+            if i and interval:
+                time.sleep(interval)
+            emit(chunk)
+        return True, text
+
+
+def parse_args(argv: List[str]) -> Tuple[str, Optional[str], bool]:
+    """(백엔드, argv 프롬프트, stream-json 입력 여부)"""
+    if not argv:
+        raise SystemExit("사용법: fake_backend.py <backend> [-p] [--input-format stream-json] [프롬프트]")
+    backend, rest = argv[0], argv[1:]
+    prompt, stream_json = None, False
+    i = 0
+    while i < len(rest):
+        arg = rest[i]
+        if arg in ("--input-format", "--output-format") and i + 1 < len(rest):
+            if arg == "--input-format" and rest[i + 1] == "stream-json":
+                stream_json = True
+            i += 2
+            continue
+        if not arg.startswith("-"):
+            prompt = arg
+        i += 1
+    return backend, prompt, stream_json
+
+
+def write(text: str):
+    sys.stdout.buffer.write(text.encode("utf-8"))
+    sys.stdout.buffer.flush()
+
+
+def serve_stream_json(fake: FakeBackend):
+    """claude --input-format stream-json 흉내: 줄마다 요청 하나, assistant/result 이벤트로 응답"""
+    for line in sys.stdin:
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        content = message.get("message", {}).get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+        def emit(chunk: str):
+            event = {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": chunk}]}}
+            write(json.dumps(event, ensure_ascii=False) + "\n")
+
+        success, text = fake.respond(content, emit)
+        result = {"type": "result", "subtype": "success" if success else "error_during_execution",
+                  "is_error": not success, "result": text}
+        write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    backend, prompt, stream_json = parse_args(sys.argv[1:] if argv is None else argv)
+    fake = FakeBackend(backend)
+    time.sleep(float(fake.profile.get("startup_seconds", 0)))
+
+    if stream_json:
+        serve_stream_json(fake)
+        return 0
+
+    if prompt is None:
+        prompt = sys.stdin.read()
+    success, text = fake.respond(prompt, write)
+    if not success:
+        sys.stderr.write(text + "\n")
+        return 1
+    write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
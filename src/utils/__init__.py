@@ -4,4 +4,22 @@
 공통 유틸리티 함수들을 포함합니다.
 """
 
-__all__ = []
\ No newline at end of file
+__all__ = [
+    "admission",
+    "backend_runner",
+    "circuit_breaker",
+    "cli_runner",
+    "config",
+    "deadline",
+    "http_transport",
+    "job_manager",
+    "message_log",
+    "progress",
+    "prompt_budget",
+    "response_cache",
+    "rpc_server",
+    "stdio_transport",
+    "structured_output",
+    "worker_pool",
+    "workflow_engine"
+]
@@ -0,0 +1,138 @@
+"""
+🚦 백엔드 동시 실행 제한
+
+백엔드별/전체 동시 CLI 실행 수를 제한하고, 초과 요청은 제한된 크기의 대기열에서
+도착 순서대로 기다리게 합니다. 대기열이 가득 차거나 대기 시간이 너무 길면 바로 거절합니다.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from .config import get_section
+
+CONCURRENCY_DEFAULTS = {
+    "max_total": 8,
+    "max_queue": 64,
+    "max_queue_wait_seconds": 300,
+    "backends": {
+        "gemini": 4,
+        "claude": 4
+    }
+}
+
+
+class AdmissionRejected(RuntimeError):
+    """대기열이 가득 찼거나 대기 시간을 넘겨 실행이 거절됨"""
+
+
+class AdmissionController:
+    """백엔드별/전체 동시 실행 제한과 FIFO 대기열"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings if settings is not None else get_section("concurrency", CONCURRENCY_DEFAULTS)
+        self.max_total = int(settings.get("max_total") or 0)
+        self.max_queue = int(settings.get("max_queue") or 0)
+        wait = settings.get("max_queue_wait_seconds")
+        self.max_queue_wait = float(wait) if wait else None
+        self.backend_limits: Dict[str, int] = {k: int(v) for k, v in (settings.get("backends") or {}).items()}
+        self.running: Dict[str, int] = {}
+        self.total_running = 0
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._queue_times: Deque[float] = deque(maxlen=500)
+        self.stats = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0}
+
+    def _has_capacity(self, backend: str) -> bool:
+        if self.max_total and self.total_running >= self.max_total:
+            return False
+        limit = self.backend_limits.get(backend)
+        return not limit or self.running.get(backend, 0) < limit
+
+    def _take(self, backend: str):
+        self.running[backend] = self.running.get(backend, 0) + 1
+        self.total_running += 1
+        self.stats["admitted"] += 1
+
+    def _release(self, backend: str):
+        self.running[backend] -= 1
+        self.total_running -= 1
+        self._wake()
+
+    def _wake(self):
+        """빈 자리가 생기면 대기 중인 요청을 도착 순서대로 깨움 (자리가 없는 백엔드는 건너뜀)"""
+        for entry in list(self._waiters):
+            backend, future = entry
+            if future.done():
+                self._waiters.remove(entry)
+                continue
+            if self._has_capacity(backend):
+                self._waiters.remove(entry)
+                self._take(backend)
+                future.set_result(None)
+
+    async def acquire(self, backend: str) -> float:
+        """실행 슬롯 확보 (대기 시간 초 반환, 거절되면 AdmissionRejected)"""
+        # 대기 중인 요청은 모두 자리가 없어 기다리는 중이므로, 자리가 있으면 바로 실행해도 순서가 깨지지 않음
+        if self._has_capacity(backend):
+            self._take(backend)
+            self._queue_times.append(0.0)
+            return 0.0
+
+        if self.max_queue and len(self._waiters) >= self.max_queue:
+            self.stats["rejected_full"] += 1
+            raise AdmissionRejected(
+                f"요청이 많아 {backend} 실행 대기열이 가득 찼습니다 "
+                f"(실행 중 {self.total_running}개, 대기 {len(self._waiters)}개). 잠시 후 다시 시도해주세요."
+            )
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        entry = (backend, future)
+        self._waiters.append(entry)
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if not (future.done() and not future.cancelled()):
+                self.stats["rejected_timeout"] += 1
+                raise AdmissionRejected(
+                    f"{backend} 실행 대기 시간이 {self.max_queue_wait:g}초를 넘었습니다. 잠시 후 다시 시도해주세요."
+                )
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소되면 바로 반납
+                self._release(backend)
+            raise
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+            if not future.done():
+                future.cancel()
+
+        waited = time.perf_counter() - started
+        self._queue_times.append(waited)
+        return waited
+
+    @asynccontextmanager
+    async def slot(self, backend: str) -> AsyncIterator[float]:
+        """async with controller.slot("gemini") as queued_seconds: ..."""
+        waited = await self.acquire(backend)
+        try:
+            yield waited
+        finally:
+            self._release(backend)
+
+    def get_stats(self) -> Dict[str, Any]:
+        times: List[float] = sorted(self._queue_times)
+        return {
+            "limits": {"total": self.max_total, "queue": self.max_queue, **self.backend_limits},
+            "running": {"total": self.total_running, **self.running},
+            "waiting": len(self._waiters),
+            "queue_seconds": {
+                "avg": round(sum(times) / len(times), 4) if times else 0,
+                "p95": round(times[min(len(times) - 1, int(len(times) * 0.95))], 4) if times else 0,
+                "max": round(times[-1], 4) if times else 0
+            },
+            **self.stats
+        }
@@ -0,0 +1,336 @@
+"""
+🎛️ 백엔드 호출 계층
+
+모든 서버의 gemini/claude 호출이 거치는 공통 경로입니다.
+응답 캐시 조회 → (사전 기동 워커 풀 또는 CLI 실행) → 캐시 저장 순으로 처리합니다.
+같은 백엔드에 같은 프롬프트가 동시에 들어오면 실행 중인 호출 하나에 합류시킵니다 (single-flight).
+지연 시간이 중요한 호출은 헤징(hedging)으로 다른 백엔드에도 요청해 먼저 성공한 응답을 사용할 수 있습니다.
+실제 CLI 실행은 동시 실행 제한(admission)을 통과해야 시작됩니다.
+호출자는 요청 마감 시간(deadline)까지만 기다리며, 기다리는 호출자가 모두 떠나면 CLI 프로세스가 종료됩니다.
+백엔드별 회로 차단기가 열려 있으면 CLI를 호출하지 않고 즉시 실패하거나 (reroute=True) 다른 백엔드로 보냅니다.
+"""
+import asyncio
+import dataclasses
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import deadline
+from .admission import AdmissionController, AdmissionRejected
+from .circuit_breaker import HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+from .cli_runner import ChunkCallback, CLIRunResult, run_prompt
+from .config import get_section
+from .response_cache import ResponseCache, cache_key, get_response_cache
+from .worker_pool import WorkerPoolManager, get_worker_pools
+
+logger = logging.getLogger(__name__)
+
+HEDGING_DEFAULTS = {
+    "delay_seconds": 10.0,
+    "percentile": 95,
+    "min_samples": 20,
+    "history_size": 200,
+    "alternates": {"gemini": "claude", "claude": "gemini"}
+}
+
+
+class _Flight:
+    """실행 중인 호출 하나와 그 결과를 기다리는 호출자들"""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.subscribers: List[ChunkCallback] = []
+        self.chunks: List[str] = []
+
+    async def broadcast(self, text: str):
+        """부분 출력을 모든 호출자에게 전달 (한 호출자의 콜백 오류가 다른 호출자에 영향 없음)"""
+        self.chunks.append(text)
+        for callback in list(self.subscribers):
+            try:
+                await callback(text)
+            except Exception as e:
+                logger.debug(f"부분 출력 전달 실패: {e}")
+
+
+class BackendRunner:
+    """캐시와 워커 풀을 포함한 백엔드 실행기"""
+
+    def __init__(self, worker_pools: Optional[WorkerPoolManager] = None,
+                 cache: Optional[ResponseCache] = None,
+                 admission: Optional[AdmissionController] = None,
+                 breakers: Optional[BreakerRegistry] = None):
+        self.worker_pools = worker_pools or get_worker_pools()
+        self.cache = cache or get_response_cache()
+        self.admission = admission or AdmissionController()
+        self.breakers = breakers or BreakerRegistry()
+        self._inflight: Dict[str, _Flight] = {}
+        self.stats = {"executions": 0, "coalesced": 0, "abandoned": 0, "timed_out": 0,
+                      "retries": 0, "rerouted": 0}
+        self.hedging = get_section("hedging", HEDGING_DEFAULTS)
+        self.hedge_stats = {"requests": 0, "fired": 0, "primary_wins": 0, "hedge_wins": 0}
+        # 백엔드별 최근 성공 응답 시간 (헤지 지연 학습용)
+        self.latencies: Dict[str, Deque[float]] = {}
+
+    def _variant(self, ai: str) -> str:
+        """같은 프롬프트라도 실행 방식(명령줄 플래그)이 다르면 다른 캐시 키"""
+        pool = self.worker_pools.get(ai)
+        return " ".join(pool.command) if pool else ai
+
+    async def _run(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback]) -> CLIRunResult:
+        pool = self.worker_pools.get(ai)
+        if pool:
+            result = await pool.execute(prompt, on_chunk)
+            result.command = f"{ai} (warm pool)"
+            return result
+        return await run_prompt(ai, prompt, on_chunk)
+
+    def is_available(self, ai: str) -> bool:
+        """ai의 회로가 닫혀 있거나 시험 호출이 가능한지"""
+        return self.breakers.get(ai).is_available()
+
+    async def execute(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                      use_cache: bool = True, reroute: bool = False) -> CLIRunResult:
+        """프롬프트 실행 (use_cache=False면 캐시를 건너뛰고 새 응답으로 갱신)
+
+        reroute=True면 ai의 회로가 열려 있을 때 정상인 다른 백엔드로 실행하며,
+        실제로 응답한 백엔드는 결과의 backend에 기록됩니다.
+        """
+        if reroute and not self.is_available(ai):
+            alternate = self.breakers.reroute(ai)
+            if alternate:
+                self.stats["rerouted"] += 1
+                logger.info(f"🔀 {ai} 회로 차단 중 - {alternate}로 전환")
+                ai = alternate
+        result = await self._execute(ai, prompt, on_chunk, use_cache)
+        result.backend = ai
+        return result
+
+    async def _execute(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback],
+                       use_cache: bool) -> CLIRunResult:
+        started = time.perf_counter()
+        key = cache_key(ai, prompt, self._variant(ai))
+        if deadline.expired():
+            self.stats["timed_out"] += 1
+            return CLIRunResult(returncode=None, stdout="", stderr="",
+                                error="요청 마감 시간이 지나 실행하지 않았습니다")
+
+        if use_cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                elapsed = round(time.perf_counter() - started, 6)
+                if on_chunk:
+                    await on_chunk(cached.text)
+                logger.info(f"🗄️ {ai} 캐시 적중 ({elapsed * 1000:.2f}ms)")
+                return CLIRunResult(
+                    returncode=0,
+                    stdout=cached.text,
+                    stderr="",
+                    timings={"spawn": 0.0, "first_byte": elapsed, "exit": elapsed},
+                    output_bytes=cached.size,
+                    command=f"{ai} (cache)",
+                    cached=True
+                )
+        else:
+            self.cache.record_bypass()
+
+        return await self._join_flight(key, ai, prompt, on_chunk)
+
+    @staticmethod
+    def _circuit_open(ai: str, breaker: CircuitBreaker) -> CLIRunResult:
+        return CLIRunResult(
+            returncode=None, stdout="", stderr="", command=f"{ai} (circuit open)",
+            error=f"{ai} 회로 차단 중: 최근 호출이 계속 실패해 {math.ceil(breaker.retry_after())}초 동안 호출하지 않습니다"
+        )
+
+    async def _attempt(self, ai: str, prompt: str, on_chunk: ChunkCallback) -> CLIRunResult:
+        """회로 확인 → 슬롯 확보 → CLI 실행 한 번 (결과를 회로 차단기에 기록)
+
+        회로가 열려 있으면 실행 대기열에 들어가지 않고 바로 실패합니다.
+        """
+        breaker = self.breakers.get(ai)
+        if not breaker.allow():
+            return self._circuit_open(ai, breaker)
+        probe = breaker.state == HALF_OPEN
+        try:
+            async with self.admission.slot(ai) as queued:
+                if probe and breaker.state == OPEN:
+                    # 대기하는 동안 다른 시험 호출이 실패해 회로가 다시 열림
+                    return self._circuit_open(ai, breaker)
+                self.stats["executions"] += 1
+                result = await self._run(ai, prompt, on_chunk)
+        except AdmissionRejected as e:
+            breaker.release()
+            logger.warning(f"🚦 {ai} 실행 거절: {e}")
+            return CLIRunResult(returncode=None, stdout="", stderr="", error=str(e))
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record(result.success, result.timings.get("exit"))
+        result.timings["queue"] = round(queued, 4)
+        return result
+
+    async def _run_and_store(self, key: str, ai: str, prompt: str, on_chunk: ChunkCallback) -> CLIRunResult:
+        retry = self.breakers.retry
+        attempt = 1
+        while True:
+            result = await self._attempt(ai, prompt, on_chunk)
+            if result.success or attempt >= retry.max_attempts or not retry.is_transient(result.error_text):
+                break
+            if not self.is_available(ai):
+                break
+            delay = retry.delay(attempt)
+            left = deadline.remaining()
+            if left is not None and delay >= left:
+                break
+            self.stats["retries"] += 1
+            logger.info(f"🔁 {ai} 일시적 오류 - {delay:.1f}초 후 재시도 ({attempt}/{retry.max_attempts - 1}): {result.error_text}")
+            await asyncio.sleep(delay)
+            attempt += 1
+        if result.success and result.timings.get("exit") is not None:
+            history = self.latencies.setdefault(ai, deque(maxlen=int(self.hedging["history_size"])))
+            history.append(result.timings["exit"])
+        # 잘리거나 임시 파일로 넘어간 출력은 전체 응답이 아니므로 저장하지 않음
+        if result.success and not result.truncated and not result.partial:
+            await self.cache.put(key, ai, result.stdout)
+        return result
+
+    async def _join_flight(self, key: str, ai: str, prompt: str,
+                           on_chunk: Optional[ChunkCallback]) -> CLIRunResult:
+        """같은 키로 실행 중인 호출이 있으면 합류, 없으면 새로 시작
+
+        호출자 수를 세어 두고, 취소되거나 시간이 초과된 호출자는 빠지기만 하며
+        마지막 호출자가 떠날 때만 실제 CLI 실행을 취소합니다 (프로세스 그룹 종료).
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(self._run_and_store(key, ai, prompt, flight.broadcast))
+            self._inflight[key] = flight
+
+            def forget(_task: asyncio.Task, flight: _Flight = flight):
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+            flight.task.add_done_callback(forget)
+        else:
+            self.stats["coalesced"] += 1
+            logger.info(f"🔗 {ai} 동일 요청 실행 중 - 결과 공유")
+            if on_chunk and flight.chunks:
+                await on_chunk("".join(flight.chunks))
+
+        def detach(timed_out: bool = False):
+            if not flight.task.done():
+                self.stats["abandoned"] += 1
+                if flight.waiters == 1:
+                    flight.task.cancel()
+                    if timed_out:
+                        # 응답하지 않는 백엔드는 실패로 기록 (회로 차단 판단에 반영)
+                        self.breakers.get(ai).record(False, timeout)
+
+        timeout = deadline.call_timeout()
+        flight.waiters += 1
+        if on_chunk:
+            flight.subscribers.append(on_chunk)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(flight.task), timeout=timeout)
+        except asyncio.TimeoutError:
+            detach(timed_out=True)
+            self.stats["timed_out"] += 1
+            logger.warning(f"⏳ {ai} 응답 시간 초과 ({timeout:.1f}초)")
+            return CLIRunResult(returncode=None, stdout="", stderr="",
+                                timings={"exit": round(timeout, 4)},
+                                error=f"{ai} 응답 시간 초과 ({timeout:.1f}초)")
+        except asyncio.CancelledError:
+            detach()
+            raise
+        finally:
+            flight.waiters -= 1
+            if on_chunk in flight.subscribers:
+                flight.subscribers.remove(on_chunk)
+
+        # 호출자마다 독립된 결과 객체 (timings 등을 수정해도 서로 영향 없음)
+        return dataclasses.replace(result, timings=dict(result.timings))
+
+    def hedge_delay(self, ai: str) -> float:
+        """헤지 요청까지 기다릴 시간 (기록이 충분하면 응답 시간 백분위수, 아니면 delay_seconds)"""
+        history = self.latencies.get(ai)
+        percentile = self.hedging.get("percentile")
+        if not percentile or not history or len(history) < int(self.hedging["min_samples"]):
+            return float(self.hedging["delay_seconds"])
+        ordered = sorted(history)
+        index = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * float(percentile) / 100) - 1))
+        return ordered[index]
+
+    async def execute_hedged(self, ai: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             use_cache: bool = True) -> Tuple[str, CLIRunResult]:
+        """헤징 실행: ai가 hedge_delay 안에 성공하지 못하면 다른 백엔드에도 요청하고
+        먼저 성공한 응답을 (응답한 백엔드, 결과)로 반환, 늦은 쪽은 취소되어 CLI 프로세스가 종료됨"""
+        alternate = self.hedging.get("alternates", {}).get(ai)
+        self.hedge_stats["requests"] += 1
+        primary = asyncio.create_task(self.execute(ai, prompt, on_chunk, use_cache))
+        if not alternate:
+            return ai, await primary
+
+        delay = self.hedge_delay(ai)
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if primary in done and primary.result().success:
+                self.hedge_stats["primary_wins"] += 1
+                return ai, primary.result()
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+        self.hedge_stats["fired"] += 1
+        logger.info(f"🏁 {ai} 응답 지연({delay:.1f}s) - {alternate}에도 요청")
+        hedge = asyncio.create_task(self.execute(alternate, prompt, None, use_cache))
+        owners = {primary: ai, hedge: alternate}
+        pending = {task for task in owners if not task.done()}
+        try:
+            while True:
+                for task in owners:
+                    if task.done() and not task.cancelled() and task.exception() is None and task.result().success:
+                        winner = owners[task]
+                        self.hedge_stats["primary_wins" if winner == ai else "hedge_wins"] += 1
+                        result = task.result()
+                        result.timings["hedge_delay"] = round(delay, 4)
+                        return winner, result
+                if not pending:
+                    break
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in owners:
+                if not task.done():
+                    task.cancel()
+
+        # 둘 다 실패하면 원래 백엔드의 결과 반환
+        if primary.exception() is not None:
+            raise primary.exception()
+        return ai, primary.result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker_pools": self.worker_pools.get_stats(),
+            "response_cache": self.cache.get_stats(),
+            "single_flight": {"in_flight": len(self._inflight), **self.stats},
+            "concurrency": self.admission.get_stats(),
+            "circuit_breakers": self.breakers.get_stats(),
+            "hedging": {
+                **self.hedge_stats,
+                "delays": {ai: round(self.hedge_delay(ai), 3) for ai in self.hedging.get("alternates", {})}
+            }
+        }
+
+
+_runner: Optional[BackendRunner] = None
+
+
+def get_backend_runner() -> BackendRunner:
+    """프로세스 전역 백엔드 실행기"""
+    global _runner
+    if _runner is None:
+        _runner = BackendRunner()
+    return _runner
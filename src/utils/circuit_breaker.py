@@ -0,0 +1,205 @@
+"""
+🔌 백엔드 회로 차단기와 재시도
+
+백엔드별로 최근 호출의 실패율/지연을 보고 회로를 엽니다.
+- closed: 정상 호출, 최근 window_seconds 동안의 결과를 기록
+- open: 실패율이나 느린 호출 비율이 기준을 넘으면 open_seconds 동안 호출하지 않고 즉시 실패
+- half_open: 대기 시간이 지나면 시험 호출을 허용하고, 성공하면 closed, 실패하면 다시 open
+일시적인 오류(속도 제한, 네트워크 오류 등)는 지터가 있는 지수 백오프로 제한된 횟수만큼 재시도합니다.
+"""
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .config import get_section
+
+CIRCUIT_BREAKER_DEFAULTS = {
+    "enabled": True,
+    "window_seconds": 60,
+    "min_requests": 5,
+    "failure_rate": 0.5,
+    "slow_call_seconds": 120,
+    "slow_call_rate": 0.8,
+    "open_seconds": 30,
+    "half_open_max_calls": 1,
+    # 회로가 열린 백엔드 대신 사용할 백엔드
+    "reroute": {"gemini": "claude", "claude": "gemini"},
+    "retry": {
+        "max_attempts": 3,
+        "base_delay_seconds": 0.5,
+        "max_delay_seconds": 8.0,
+        # 대소문자 구분 없는 정규식, 상태 코드는 "HTTP 503", "status: 429"처럼 앞에 붙은 단어와 함께만 인정
+        "transient_patterns": [
+            r"\b(?:http(?:/[\d.]+)?|status(?: code)?|code|error)\W{0,3}(?:429|50[0234])\b",
+            "rate.?limit", "too many requests", "overloaded", "service unavailable", "bad gateway",
+            "timed out", "timeout", "econnreset", "etimedout", "eai_again",
+            "socket hang up", "temporarily", "try again", "워커 프로세스가 종료되었습니다"
+        ]
+    }
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """백엔드 하나의 회로 차단기"""
+
+    def __init__(self, backend: str, settings: Dict[str, Any]):
+        self.backend = backend
+        self.enabled = bool(settings.get("enabled", True))
+        self.window_seconds = float(settings["window_seconds"])
+        self.min_requests = int(settings["min_requests"])
+        self.failure_rate = float(settings["failure_rate"])
+        self.slow_call_seconds = float(settings["slow_call_seconds"])
+        self.slow_call_rate = float(settings["slow_call_rate"])
+        self.open_seconds = float(settings["open_seconds"])
+        self.half_open_max_calls = int(settings["half_open_max_calls"])
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.times_opened = 0
+        self.short_circuited = 0
+        # (시각, 성공 여부, 느린 호출 여부)
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+
+    def _trim(self, now: float):
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        total = len(self._window)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for _, ok, _ in self._window if not ok)
+        slow = sum(1 for _, _, is_slow in self._window if is_slow)
+        return failures / total, slow / total
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 (open이면 대기 시간이 지난 뒤 half_open으로 전환)"""
+        if not self.enabled:
+            return True
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_seconds:
+                self.short_circuited += 1
+                return False
+            self.state = HALF_OPEN
+            self.half_open_calls = 0
+        if self.state == HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.short_circuited += 1
+                return False
+            self.half_open_calls += 1
+        return True
+
+    def is_available(self) -> bool:
+        """상태를 바꾸지 않고 호출 가능 여부만 확인"""
+        if not self.enabled or self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= self.open_seconds
+        return self.half_open_calls < self.half_open_max_calls
+
+    def release(self):
+        """allow() 후 결과 없이 끝난 호출 (취소 등)의 시험 호출 자리 반납"""
+        if self.state == HALF_OPEN:
+            self.half_open_calls = max(0, self.half_open_calls - 1)
+
+    def record(self, success: bool, duration: Optional[float] = None):
+        """호출 결과 기록"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        slow = duration is not None and duration >= self.slow_call_seconds
+
+        if self.state == HALF_OPEN:
+            self.half_open_calls = max(0, self.half_open_calls - 1)
+            if success and not slow:
+                self.state = CLOSED
+                self._window.clear()
+            else:
+                self._open(now)
+            return
+
+        self._window.append((now, success, slow))
+        self._trim(now)
+        # 성공한 호출로는 회로를 열지 않음 (재시도 끝에 성공한 직후 차단되지 않도록)
+        if (not success or slow) and self.state == CLOSED and len(self._window) >= self.min_requests:
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate or slow_rate >= self.slow_call_rate:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+
+    def retry_after(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "window_calls": len(self._window),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+            "retry_after": round(self.retry_after(), 1)
+        }
+
+
+class RetryPolicy:
+    """일시적 오류에 대한 지터 지수 백오프"""
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.max_attempts = max(1, int(settings["max_attempts"]))
+        self.base_delay = float(settings["base_delay_seconds"])
+        self.max_delay = float(settings["max_delay_seconds"])
+        self._patterns = re.compile(
+            "|".join(f"(?:{p})" for p in settings.get("transient_patterns", [])) or r"(?!)",
+            re.IGNORECASE
+        )
+
+    def is_transient(self, error: Optional[str]) -> bool:
+        return bool(error) and bool(self._patterns.search(error))
+
+    def delay(self, attempt: int) -> float:
+        """attempt번째 실패 후 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class BreakerRegistry:
+    """백엔드별 회로 차단기 모음"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = settings if settings is not None else get_section("circuit_breaker", CIRCUIT_BREAKER_DEFAULTS)
+        self.retry = RetryPolicy(self.settings.get("retry") or CIRCUIT_BREAKER_DEFAULTS["retry"])
+        self.reroute_map: Dict[str, str] = dict(self.settings.get("reroute") or {})
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, backend: str) -> CircuitBreaker:
+        if backend not in self._breakers:
+            self._breakers[backend] = CircuitBreaker(backend, self.settings)
+        return self._breakers[backend]
+
+    def reroute(self, backend: str) -> Optional[str]:
+        """회로가 열린 backend 대신 사용할 수 있는 백엔드 (없으면 None)"""
+        alternate = self.reroute_map.get(backend)
+        if alternate and self.get(alternate).is_available():
+            return alternate
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {backend: breaker.get_stats() for backend, breaker in self._breakers.items()}
+
+    def backends(self) -> List[str]:
+        return list(self._breakers)
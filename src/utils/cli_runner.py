@@ -0,0 +1,409 @@
+"""
+🏃 CLI 서브프로세스 실행기
+
+모든 서버가 공유하는 gemini/claude CLI 실행 계층입니다.
+- stdout/stderr는 바이트 파이프로 읽고 점진적 UTF-8 디코더로 해석
+- 디코딩된 부분 텍스트는 콜백으로 즉시 전달 (스트리밍)
+- 메모리에 보관하는 출력은 spill_threshold_bytes까지, 그 이후는 임시 파일로 내보내고
+  max_output_bytes를 넘는 출력은 버림 (파이프는 끝까지 비워 자식 프로세스가 막히지 않게 함)
+- 임시 파일은 호출이 끝나면 바로 삭제하고, 결과에는 앞부분만 (full_output=True면 전체를) 담음
+- 호출마다 기동/첫 바이트/종료 시각을 기록
+- 큰 프롬프트는 argv 대신 stdin으로 나눠 쓰면서 stdout을 동시에 읽음 (ARG_MAX 제한, 파이프 교착 방지)
+- CLI는 별도 프로세스 그룹으로 실행되고, 취소/시간 초과 시 그룹 전체에 SIGTERM → 유예 후 SIGKILL
+"""
+import asyncio
+import atexit
+import codecs
+import os
+import signal
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .config import PROJECT_ROOT, get_section
+
+ChunkCallback = Callable[[str], Awaitable[None]]
+
+CLI_RUNNER_DEFAULTS = {
+    "read_chunk_size": 4096,
+    "spill_threshold_bytes": 2 * 1024 * 1024,
+    "max_output_bytes": 64 * 1024 * 1024,
+    "max_stderr_bytes": 64 * 1024,
+    "spill_directory": None,
+    "kill_grace_seconds": 5,
+    "stdin_write_chunk_size": 64 * 1024,
+    "stdin_threshold_bytes": 32 * 1024,
+    "backends": {
+        "gemini": {"prompt_mode": "auto", "stdin_args": []},
+        "claude": {"prompt_mode": "auto", "stdin_args": ["-p"]}
+    }
+}
+
+PROMPT_MODES = ("argv", "stdin", "auto")
+
+# 아직 삭제되지 않은 임시 파일 (정상 경로에서는 호출마다 지우고, 종료 시 남은 것만 정리)
+_spill_files: set = set()
+_reapers: set = set()
+
+# POSIX에서는 CLI를 새 세션(프로세스 그룹)으로 띄워 자식 프로세스까지 함께 종료
+SUBPROCESS_GROUP_KWARGS: Dict[str, Any] = {"start_new_session": True} if os.name == "posix" else {}
+
+
+@atexit.register
+def _cleanup_spill_files():
+    for path in list(_spill_files):
+        _remove_spill_file(path)
+
+
+def _remove_spill_file(path: str):
+    _spill_files.discard(path)
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@dataclass
+class RunnerLimits:
+    read_chunk_size: int = CLI_RUNNER_DEFAULTS["read_chunk_size"]
+    spill_threshold_bytes: int = CLI_RUNNER_DEFAULTS["spill_threshold_bytes"]
+    max_output_bytes: int = CLI_RUNNER_DEFAULTS["max_output_bytes"]
+    max_stderr_bytes: int = CLI_RUNNER_DEFAULTS["max_stderr_bytes"]
+    spill_directory: Optional[str] = None
+    stdin_write_chunk_size: int = CLI_RUNNER_DEFAULTS["stdin_write_chunk_size"]
+    kill_grace_seconds: float = CLI_RUNNER_DEFAULTS["kill_grace_seconds"]
+
+    @classmethod
+    def from_config(cls) -> "RunnerLimits":
+        settings = get_section("cli_runner", CLI_RUNNER_DEFAULTS)
+        return cls(
+            read_chunk_size=int(settings["read_chunk_size"]),
+            spill_threshold_bytes=int(settings["spill_threshold_bytes"]),
+            max_output_bytes=int(settings["max_output_bytes"]),
+            max_stderr_bytes=int(settings["max_stderr_bytes"]),
+            spill_directory=settings.get("spill_directory"),
+            stdin_write_chunk_size=int(settings["stdin_write_chunk_size"]),
+            kill_grace_seconds=float(settings["kill_grace_seconds"])
+        )
+
+
+_default_limits: Optional[RunnerLimits] = None
+
+
+def default_limits() -> RunnerLimits:
+    global _default_limits
+    if _default_limits is None:
+        _default_limits = RunnerLimits.from_config()
+    return _default_limits
+
+
+class OutputBuffer:
+    """크기 제한이 있는 출력 버퍼 (메모리 → 임시 파일 → 버림)
+
+    with 블록이 끝나면 임시 파일을 삭제합니다.
+    """
+
+    def __init__(self, spill_threshold: int, max_bytes: int, spill_directory: Optional[str] = None):
+        self.spill_threshold = spill_threshold
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+        self.total_bytes = 0
+        self.truncated = False
+        self.spill_path: Optional[str] = None
+        self._memory: List[str] = []
+        self._memory_bytes = 0
+        self._spill_file = None
+
+    def append(self, raw_size: int, text: str):
+        """디코딩된 텍스트 추가 (raw_size는 원본 바이트 수)"""
+        if not text:
+            self.total_bytes += raw_size
+            return
+        if self.total_bytes >= self.max_bytes:
+            self.truncated = True
+            self.total_bytes += raw_size
+            return
+        self.total_bytes += raw_size
+
+        if self._spill_file is None and self._memory_bytes + raw_size <= self.spill_threshold:
+            self._memory.append(text)
+            self._memory_bytes += raw_size
+            return
+
+        if self._spill_file is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix="mcp-cli-", suffix=".out", dir=self.spill_directory)
+            _spill_files.add(self.spill_path)
+            self._spill_file = os.fdopen(fd, "w", encoding="utf-8")
+            self._spill_file.write("".join(self._memory))
+        self._spill_file.write(text)
+        if self.total_bytes >= self.max_bytes:
+            self.truncated = True
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    def discard(self):
+        """임시 파일 삭제"""
+        self.close()
+        if self.spill_path is not None:
+            _remove_spill_file(self.spill_path)
+            self.spill_path = None
+
+    def __enter__(self) -> "OutputBuffer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.discard()
+
+    @property
+    def partial(self) -> bool:
+        """메모리에 앞부분만 남아 있는지"""
+        return self.spill_path is not None
+    def text(self) -> str:
+        """메모리에 보관된 텍스트 (임시 파일로 넘어간 경우 앞부분)"""
+        return "".join(self._memory)
+
+    def read_full(self) -> str:
+        """전체 보관 출력 (임시 파일 포함)"""
+        if self.spill_path is None:
+            return self.text()
+        self.close()
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+@dataclass
+class CLIRunResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timings: Dict[str, Optional[float]] = field(default_factory=dict)
+    output_bytes: int = 0
+    truncated: bool = False
+    # stdout에 앞부분(spill_threshold_bytes)만 담겼는지
+    partial: bool = False
+    error: Optional[str] = None
+    command: Optional[str] = None
+    cached: bool = False
+    backend: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.returncode == 0
+
+    @property
+    def result_text(self) -> str:
+        """성공시 응답 텍스트 (출력이 잘린 경우 안내 포함)"""
+        if not self.success:
+            return ""
+        text = self.stdout.strip()
+        if self.partial:
+            text += f"\n\n[출력이 {self.output_bytes}바이트로 커서 앞부분만 포함했습니다]"
+        elif self.truncated:
+            text += f"\n\n[출력이 최대 크기를 넘어 잘렸습니다 ({self.output_bytes}바이트)]"
+        return text
+
+    @property
+    def error_text(self) -> Optional[str]:
+        if self.success:
+            return None
+        return self.error or self.stderr.strip() or f"종료 코드 {self.returncode}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """실행기 응답 형식 {"success", "result", "error", "timings", "cached"}"""
+        return {
+            "success": self.success,
+            "result": self.result_text,
+            "error": self.error_text,
+            "timings": self.timings,
+            "cached": self.cached
+        }
+
+
+async def read_stream(stream: asyncio.StreamReader, buffer: OutputBuffer,
+                      on_chunk: Optional[ChunkCallback] = None,
+                      chunk_size: int = CLI_RUNNER_DEFAULTS["read_chunk_size"],
+                      on_first_byte: Optional[Callable[[], None]] = None):
+    """스트림을 EOF까지 읽어 버퍼에 담고, 디코딩된 텍스트를 콜백으로 전달"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    first = True
+
+    while True:
+        chunk = await stream.read(chunk_size)
+        if chunk and first:
+            first = False
+            if on_first_byte:
+                on_first_byte()
+        text = decoder.decode(chunk, final=not chunk)
+        buffer.append(len(chunk), text)
+        if text and on_chunk and not buffer.truncated:
+            await on_chunk(text)
+        if not chunk:
+            break
+
+
+async def write_stdin(stream: asyncio.StreamWriter, data: bytes, chunk_size: int):
+    """입력을 청크 단위로 쓰고 닫음 (자식이 먼저 종료해도 예외 없이 중단)"""
+    try:
+        for offset in range(0, len(data), chunk_size):
+            stream.write(data[offset:offset + chunk_size])
+            await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int):
+    try:
+        if SUBPROCESS_GROUP_KWARGS:
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def terminate_process(process: asyncio.subprocess.Process, grace_seconds: float):
+    """프로세스 그룹에 SIGTERM, grace_seconds 안에 끝나지 않으면 SIGKILL"""
+    if process.returncode is not None:
+        return
+    _signal_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace_seconds)
+    except asyncio.TimeoutError:
+        _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
+
+
+async def reap_process(process: asyncio.subprocess.Process, grace_seconds: float):
+    """취소 중에도 끝까지 종료 처리 (호출 측이 다시 취소되어도 종료 작업은 백그라운드에서 계속 진행)"""
+    task = asyncio.get_running_loop().create_task(terminate_process(process, grace_seconds))
+    _reapers.add(task)
+    task.add_done_callback(_reapers.discard)
+    await asyncio.shield(task)
+
+
+async def collect_process(process: asyncio.subprocess.Process, started: float,
+                          on_chunk: Optional[ChunkCallback] = None,
+                          limits: Optional[RunnerLimits] = None,
+                          stdin_data: Optional[bytes] = None,
+                          full_output: bool = False) -> CLIRunResult:
+    """실행 중인 프로세스의 stdout/stderr를 동시에 읽고 종료까지 대기 (stdin_data가 있으면 동시에 씀)
+
+    full_output=True면 임시 파일로 넘어간 부분까지 max_output_bytes 안에서 전부 stdout에 담습니다.
+    """
+    limits = limits or default_limits()
+    timings: Dict[str, Optional[float]] = {"first_byte": None}
+
+    def mark_first_byte():
+        timings["first_byte"] = round(time.perf_counter() - started, 4)
+
+    with OutputBuffer(limits.spill_threshold_bytes, limits.max_output_bytes, limits.spill_directory) as stdout_buffer, \
+            OutputBuffer(limits.max_stderr_bytes, limits.max_stderr_bytes) as stderr_buffer:
+        background = [asyncio.create_task(
+            read_stream(process.stderr, stderr_buffer, chunk_size=limits.read_chunk_size)
+        )]
+        if stdin_data is not None:
+            background.append(asyncio.create_task(
+                write_stdin(process.stdin, stdin_data, limits.stdin_write_chunk_size)
+            ))
+        try:
+            await read_stream(process.stdout, stdout_buffer, on_chunk, limits.read_chunk_size, mark_first_byte)
+            await asyncio.gather(*background)
+            await process.wait()
+        except BaseException:
+            for task in background:
+                task.cancel()
+            await reap_process(process, limits.kill_grace_seconds)
+            raise
+
+        timings["exit"] = round(time.perf_counter() - started, 4)
+        return CLIRunResult(
+            returncode=process.returncode,
+            stdout=stdout_buffer.read_full() if full_output else stdout_buffer.text(),
+            stderr=stderr_buffer.text(),
+            timings=timings,
+            output_bytes=stdout_buffer.total_bytes,
+            truncated=stdout_buffer.truncated,
+            partial=stdout_buffer.partial and not full_output
+        )
+
+
+async def run_cli(cmd: List[str], on_chunk: Optional[ChunkCallback] = None,
+                  limits: Optional[RunnerLimits] = None,
+                  stdin_text: Optional[str] = None) -> CLIRunResult:
+    """CLI 명령 실행 (기동 실패도 예외 대신 CLIRunResult.error로 반환)
+
+    stdin_text가 없으면 stdin은 /dev/null로 연결되어, stdio MCP 서버의 입력 스트림을
+    자식 프로세스가 읽어 가지 않습니다.
+    """
+    started = time.perf_counter()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin_text is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **SUBPROCESS_GROUP_KWARGS
+        )
+    except FileNotFoundError:
+        return CLIRunResult(returncode=None, stdout="", stderr="",
+                            error=f"{cmd[0]} CLI가 설치되지 않았습니다.")
+    except (OSError, ValueError) as e:
+        return CLIRunResult(returncode=None, stdout="", stderr="", error=f"CLI 실행 오류: {str(e)}")
+    spawned = round(time.perf_counter() - started, 4)
+
+    stdin_data = stdin_text.encode("utf-8") if stdin_text is not None else None
+    result = await collect_process(process, started, on_chunk, limits, stdin_data)
+    result.timings["spawn"] = spawned
+    return result
+
+
+FAKE_BACKEND_SCRIPT = PROJECT_ROOT / "src" / "tools" / "fake_backend.py"
+
+
+def backend_command(backend: str, command: Optional[List[str]] = None) -> List[str]:
+    """백엔드 CLI 실행 명령 (fake_backend.enabled면 실행 파일만 오프라인 부하 테스트용 가짜 CLI로 교체)"""
+    command = list(command or [backend])
+    if get_section("fake_backend").get("enabled"):
+        return [sys.executable, str(FAKE_BACKEND_SCRIPT), backend, *command[1:]]
+    return command
+
+
+def build_invocation(backend: str, prompt: str) -> Tuple[List[str], Optional[str]]:
+    """백엔드 설정에 따라 (명령, stdin 입력) 결정
+
+    prompt_mode가 argv이면 [cli, prompt], stdin이면 [cli, *stdin_args]와 프롬프트를
+    stdin으로 전달하고, auto는 프롬프트가 stdin_threshold_bytes를 넘을 때만 stdin을 사용합니다.
+    """
+    settings = get_section("cli_runner", CLI_RUNNER_DEFAULTS)
+    spec = settings.get("backends", {}).get(backend, {})
+    mode = spec.get("prompt_mode", "argv")
+    if mode not in PROMPT_MODES:
+        raise ValueError(f"지원하지 않는 프롬프트 전달 방식: {mode}")
+
+    use_stdin = mode == "stdin" or (
+        mode == "auto" and len(prompt.encode("utf-8")) > int(settings["stdin_threshold_bytes"])
+    )
+    command = backend_command(backend)
+    if use_stdin:
+        return [*command, *spec.get("stdin_args", [])], prompt
+    return [*command, prompt], None
+
+
+async def run_prompt(backend: str, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                     limits: Optional[RunnerLimits] = None) -> CLIRunResult:
+    """백엔드 CLI에 프롬프트 하나를 실행 (argv/stdin 전달 방식은 설정에 따름)"""
+    cmd, stdin_text = build_invocation(backend, prompt)
+    result = await run_cli(cmd, on_chunk, limits, stdin_text)
+    result.command = " ".join(cmd) + (" < stdin" if stdin_text is not None else "")
+    return result
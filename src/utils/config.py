@@ -0,0 +1,65 @@
+"""
+⚙️ 설정 로더
+
+프로젝트 루트의 config.json (또는 MCP_COLLAB_CONFIG 환경변수가 가리키는 파일)을 읽어
+섹션별 설정을 제공합니다. 파일이 없으면 각 모듈의 기본값이 그대로 사용됩니다.
+"""
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONFIGS_DIR = PROJECT_ROOT / "configs"
+CONFIG_ENV_VAR = "MCP_COLLAB_CONFIG"
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / "config.json"
+
+_loaded_config: Optional[Dict[str, Any]] = None
+
+
+def resolve_path(path: Union[str, Path]) -> Path:
+    """상대 경로는 프로젝트 루트 기준으로 해석"""
+    path = Path(os.path.expanduser(str(path)))
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def load_config(path: Optional[Union[str, Path]] = None, reload: bool = False) -> Dict[str, Any]:
+    """설정 파일 로드 (한 번 읽은 설정은 캐시)"""
+    global _loaded_config
+
+    if _loaded_config is not None and path is None and not reload:
+        return _loaded_config
+
+    config_path = resolve_path(path or os.environ.get(CONFIG_ENV_VAR) or DEFAULT_CONFIG_PATH)
+    config: Dict[str, Any] = {}
+
+    if config_path.exists():
+        try:
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ 설정 파일을 읽을 수 없습니다 ({config_path}): {e}")
+
+    if path is None:
+        _loaded_config = config
+    return config
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def get_section(name: str, defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """설정 섹션 반환 (기본값 위에 설정 파일 값을 덮어씀)"""
+    section = load_config().get(name) or {}
+    return _deep_merge(defaults or {}, section)
@@ -0,0 +1,61 @@
+"""
+⏳ 요청 마감 시간
+
+도구 호출 하나에 마감 시각을 정하면 그 안에서 실행되는 모든 워크플로우 단계와
+CLI 호출이 남은 시간만큼만 기다립니다. contextvars로 전달되므로 호출 경로마다
+인자를 넘길 필요가 없고, asyncio 태스크를 새로 만들어도 그대로 이어집니다.
+"""
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from .config import get_section
+
+DEADLINE_DEFAULTS = {
+    # 도구 호출 하나의 전체 마감 시간 (null이면 무제한)
+    "request_seconds": 900,
+    # CLI 호출 하나의 최대 실행 시간
+    "cli_seconds": 300
+}
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def settings():
+    return get_section("deadlines", DEADLINE_DEFAULTS)
+
+
+def set_deadline(seconds: Optional[float] = None) -> Token:
+    """현재 컨텍스트의 마감 시각 설정 (seconds가 없으면 deadlines.request_seconds, 기존 마감보다 늦출 수 없음)"""
+    if seconds is None:
+        seconds = settings().get("request_seconds")
+    deadline = time.monotonic() + float(seconds) if seconds else None
+    current = _deadline.get()
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token):
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 (초), 마감이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def call_timeout() -> Optional[float]:
+    """CLI 호출 하나에 허용할 시간 (cli_seconds와 남은 요청 시간 중 짧은 쪽)"""
+    limit = settings().get("cli_seconds")
+    left = remaining()
+    candidates = [float(v) for v in (limit, left) if v is not None]
+    return min(candidates) if candidates else None
@@ -0,0 +1,90 @@
+"""
+🌐 Streamable HTTP 전송 계층
+
+mcp.Server 기반 서버를 stdio 대신 HTTP로 띄워 여러 클라이언트가 한 프로세스를 공유하게 합니다.
+(협업 기록, 응답 캐시, 사전 기동 워커 풀, 동시 실행 제한을 모든 클라이언트가 함께 사용)
+- MCP Streamable HTTP: POST로 요청, 진행 알림과 응답은 요청별 SSE 스트림으로 전송
+- 기본은 localhost에만 바인딩, unix_socket을 지정하면 TCP 대신 Unix 소켓 사용
+- starlette/uvicorn은 HTTP 모드에서만 필요 (stdio 모드는 추가 의존성 없음)
+"""
+import contextlib
+import ipaddress
+import logging
+from typing import Any, Dict, Optional
+
+from .config import get_section, resolve_path
+
+logger = logging.getLogger(__name__)
+
+HTTP_DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    # 지정하면 host/port 대신 이 경로의 Unix 소켓에서 대기
+    "unix_socket": None,
+    "path": "/mcp",
+    # true면 SSE 대신 단일 JSON 응답 (진행 알림은 전달되지 않음)
+    "json_response": False,
+    "log_level": "warning"
+}
+
+
+def http_settings(**overrides) -> Dict[str, Any]:
+    """config.json의 http 섹션에 명령행 값(None이 아닌 것만) 덮어쓰기"""
+    settings = dict(get_section("http", HTTP_DEFAULTS))
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+
+def build_app(server, path: str = "/mcp", json_response: bool = False):
+    """mcp.Server를 Streamable HTTP로 노출하는 ASGI 앱"""
+    try:
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.routing import Mount
+    except ImportError as e:
+        raise RuntimeError(
+            f"HTTP 전송에는 mcp>=1.8과 starlette가 필요합니다: pip install -U mcp uvicorn ({e})"
+        ) from e
+
+    session_manager = StreamableHTTPSessionManager(app=server, json_response=json_response)
+
+    async def handle(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+
+    return Starlette(routes=[Mount(path, app=handle)], lifespan=lifespan)
+
+
+async def serve_http(server, host: Optional[str] = None, port: Optional[int] = None,
+                     unix_socket: Optional[str] = None):
+    """종료될 때까지 HTTP로 요청 처리 (인자가 없으면 config.json의 http 섹션 사용)"""
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise RuntimeError("HTTP 전송에는 uvicorn이 필요합니다: pip install uvicorn") from e
+
+    settings = http_settings(host=host, port=port, unix_socket=unix_socket)
+    app = build_app(server, settings["path"], bool(settings["json_response"]))
+    if settings["unix_socket"]:
+        socket_path = str(resolve_path(settings["unix_socket"]))
+        config = uvicorn.Config(app, uds=socket_path, log_level=settings["log_level"])
+        logger.info(f"🌐 Streamable HTTP 대기: unix:{socket_path}{settings['path']}")
+    else:
+        if not _is_loopback(settings["host"]):
+            logger.warning(f"⚠️ {settings['host']}에 바인딩합니다. 인증이 없으므로 신뢰할 수 있는 네트워크에서만 사용하세요")
+        config = uvicorn.Config(app, host=settings["host"], port=int(settings["port"]), log_level=settings["log_level"])
+        logger.info(f"🌐 Streamable HTTP 대기: http://{settings['host']}:{settings['port']}{settings['path']}")
+    await uvicorn.Server(config).serve()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
@@ -0,0 +1,194 @@
+"""
+🗂️ 백그라운드 작업 표
+
+오래 걸리는 협업 작업을 도구 호출과 분리해 실행합니다.
+- submit()은 작업을 asyncio 태스크로 시작하고 바로 작업 ID를 반환
+- 실행 중 단계 전환과 노드별 부분 출력을 작업에 기록해 폴링으로 조회
+- 끝난 작업은 retention_seconds 동안, 최대 max_finished_jobs개까지만 보관
+"""
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .config import get_section
+from .progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+JOB_DEFAULTS = {
+    # 동시에 실행할 수 있는 작업 수, 넘으면 제출 거부
+    "max_active_jobs": 16,
+    "max_finished_jobs": 100,
+    "retention_seconds": 3600,
+    # 노드 하나당 보관할 부분 출력 최대 길이 (넘으면 앞부분을 버림)
+    "max_partial_chars": 20000
+}
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobLimitError(RuntimeError):
+    """실행 중인 작업이 max_active_jobs에 도달함"""
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    description: str
+    status: str = "running"
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    stage: Optional[str] = None
+    stages: List[str] = field(default_factory=list)
+    partial: Dict[str, str] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.created_at
+
+    def status_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "description": self.description,
+            "status": self.status,
+            "current_stage": self.stage,
+            "completed_stages": self.stages[:-1] if not self.finished else list(self.stages),
+            "created_at": _timestamp(self.created_at),
+            "finished_at": _timestamp(self.finished_at),
+            "elapsed_seconds": round(self.elapsed(), 1),
+            "error": self.error
+        }
+
+
+class JobProgress(ProgressReporter):
+    """진행 알림 대신 작업에 단계와 노드별 부분 출력을 기록"""
+
+    def __init__(self, job: Job, max_partial_chars: int):
+        super().__init__(self._ignore)
+        self.job = job
+        self.max_partial_chars = max_partial_chars
+
+    @staticmethod
+    async def _ignore(progress: float, message: Optional[str]):
+        return None
+
+    async def stage(self, message: str):
+        self.job.stage = message
+        self.job.stages.append(message)
+
+    async def partial(self, text: str, label: Optional[str] = None):
+        key = label or "output"
+        self.job.partial[key] = (self.job.partial.get(key, "") + text)[-self.max_partial_chars:]
+
+    async def flush(self):
+        return None
+
+
+class JobManager:
+    """프로세스 안의 작업 표"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or get_section("jobs", JOB_DEFAULTS)
+        self.max_active_jobs = int(settings["max_active_jobs"])
+        self.max_finished_jobs = int(settings["max_finished_jobs"])
+        self.retention_seconds = float(settings["retention_seconds"])
+        self.max_partial_chars = int(settings["max_partial_chars"])
+        self.jobs: Dict[str, Job] = {}
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "rejected": 0, "expired": 0}
+
+    def submit(self, kind: str, description: str,
+               run: Callable[[JobProgress], Awaitable[Any]]) -> Job:
+        """작업 시작 (run은 JobProgress를 받아 결과를 반환하는 코루틴 함수)"""
+        self._prune()
+        active = sum(1 for job in self.jobs.values() if not job.finished)
+        if active >= self.max_active_jobs:
+            self.stats["rejected"] += 1
+            raise JobLimitError(f"실행 중인 작업이 너무 많습니다 ({active}/{self.max_active_jobs})")
+
+        job = Job(job_id=uuid.uuid4().hex[:12], kind=kind, description=description)
+        # 요청 컨텍스트(마감 시간, MCP 요청 정보)를 물려받지 않도록 빈 컨텍스트에서 시작
+        job.task = contextvars.Context().run(asyncio.create_task, self._run(job, run))
+        job.task.add_done_callback(lambda task: self._on_done(job))
+        self.jobs[job.job_id] = job
+        self.stats["submitted"] += 1
+        logger.info(f"🗂️ 작업 {job.job_id} 시작: {kind} - {description[:80]}")
+        return job
+
+    async def _run(self, job: Job, run: Callable[[JobProgress], Awaitable[Any]]):
+        try:
+            job.result = await run(JobProgress(job, self.max_partial_chars))
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"작업 {job.job_id} 실패: {e}")
+        finally:
+            self._finish(job)
+
+    def _on_done(self, job: Job):
+        # 시작하기 전에 취소된 태스크는 _run의 본문이 실행되지 않음
+        if not job.finished:
+            job.status = "cancelled"
+            self._finish(job)
+
+    def _finish(self, job: Job):
+        job.finished_at = time.time()
+        job.task = None
+        if job.status in self.stats:
+            self.stats[job.status] += 1
+        logger.info(f"🗂️ 작업 {job.job_id} 종료: {job.status} ({job.elapsed():.1f}s)")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """실행 중인 작업 취소 (실행 중인 CLI 프로세스도 종료됨), 이미 끝났거나 없으면 False"""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def _prune(self):
+        """보관 기간이 지났거나 개수를 넘은 끝난 작업 삭제"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.finished_at)
+        excess = len(finished) - self.max_finished_jobs
+        for i, job in enumerate(finished):
+            if i < excess or now - job.finished_at > self.retention_seconds:
+                del self.jobs[job.job_id]
+                self.stats["expired"] += 1
+
+    async def close(self):
+        """서버 종료 시 실행 중인 작업 취소"""
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {"tracked": len(self.jobs), "by_status": statuses, **self.stats}
@@ -0,0 +1,205 @@
+"""
+📜 협업 메시지 로그
+
+워크플로우 중 오간 프롬프트/응답을 적은 메모리로 기록합니다.
+- 레코드는 __slots__ 객체, 로그는 max_messages 크기의 링 버퍼 (가장 오래된 것부터 밀려남)
+- 큰 본문은 내용 해시로 한 번만 저장 (같은 프롬프트를 두 AI에 보내도 한 벌)
+- 본문 저장소가 max_memory_bytes를 넘으면 오래된 본문을 디스크로 내보내거나(spill) 버림
+- 본문은 content()로 필요할 때만 읽음 (통계/요약은 메타데이터만 사용)
+"""
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .config import get_section, resolve_path
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LOG_DEFAULTS = {
+    "max_messages": 2000,
+    # 이보다 작은 본문은 해시 없이 레코드에 바로 저장
+    "inline_bytes": 256,
+    "max_memory_bytes": 16 * 1024 * 1024,
+    "spill": {
+        "enabled": False,
+        "directory": "cache/message_log"
+    }
+}
+
+
+class BodyStore:
+    """내용 해시를 키로 하는 참조 계수 본문 저장소 (메모리 LRU + 선택적 디스크 spill)"""
+
+    def __init__(self, max_memory_bytes: int, spill_directory: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_directory = spill_directory
+        if spill_directory:
+            os.makedirs(spill_directory, exist_ok=True)
+        self.memory_bytes = 0
+        self._memory: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._refs: Dict[str, int] = {}
+        self._spilled: Dict[str, int] = {}
+        self.stats = {"stored": 0, "deduplicated": 0, "spilled": 0, "dropped": 0, "disk_reads": 0}
+
+    def put(self, text: str) -> str:
+        """본문 저장 후 키 반환 (메모리나 디스크에 남아 있으면 참조만 늘림)"""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        self._refs[key] = self._refs.get(key, 0) + 1
+        if key in self._memory or key in self._spilled:
+            self.stats["deduplicated"] += 1
+            return key
+        # 처음 보는 본문이거나, 참조는 남아 있지만 한도 초과로 버려진 본문은 다시 저장
+        self._memory[key] = (text, len(data))
+        self.memory_bytes += len(data)
+        self.stats["stored"] += 1
+        self._evict()
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """본문 읽기 (버려진 본문이면 None)"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry[0]
+        if key in self._spilled:
+            self.stats["disk_reads"] += 1
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    return f.read()
+            except OSError as e:
+                logger.warning(f"메시지 본문 읽기 실패 ({key[:12]}): {e}")
+        return None
+
+    def release(self, key: str):
+        """참조 하나 해제 (마지막 참조면 메모리/디스크에서 삭제)"""
+        refs = self._refs.get(key, 0) - 1
+        if refs > 0:
+            self._refs[key] = refs
+            return
+        self._refs.pop(key, None)
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry[1]
+        if self._spilled.pop(key, None) is not None:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.spill_directory, key)
+
+    def _evict(self):
+        while self.memory_bytes > self.max_memory_bytes and self._memory:
+            key, (text, size) = self._memory.popitem(last=False)
+            self.memory_bytes -= size
+            if self.spill_directory:
+                try:
+                    with open(self._path(key), "w", encoding="utf-8") as f:
+                        f.write(text)
+                    self._spilled[key] = size
+                    self.stats["spilled"] += 1
+                    continue
+                except OSError as e:
+                    logger.warning(f"메시지 본문 spill 실패 ({key[:12]}): {e}")
+            self.stats["dropped"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "bodies": len(self._refs),
+            "memory_bytes": self.memory_bytes,
+            "spilled_bodies": len(self._spilled),
+            "spilled_bytes": sum(self._spilled.values()),
+            **self.stats
+        }
+
+
+class MessageRecord:
+    """메시지 하나의 메타데이터 (본문은 inline 또는 저장소 키)"""
+    __slots__ = ("session_id", "from_ai", "to_ai", "stage", "node_id", "timestamp", "size", "inline", "key")
+
+    def __init__(self, session_id: int, from_ai: str, to_ai: str, stage: str, node_id: str,
+                 timestamp: float, size: int, inline: Optional[str], key: Optional[str]):
+        self.session_id = session_id
+        self.from_ai = from_ai
+        self.to_ai = to_ai
+        self.stage = stage
+        self.node_id = node_id
+        self.timestamp = timestamp
+        self.size = size
+        self.inline = inline
+        self.key = key
+
+
+class MessageLog:
+    """추가만 가능한 링 버퍼 메시지 로그"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or get_section("message_log", MESSAGE_LOG_DEFAULTS)
+        spill = settings.get("spill") or {}
+        self.max_messages = max(1, int(settings["max_messages"]))
+        self.inline_bytes = int(settings["inline_bytes"])
+        self.store = BodyStore(
+            int(settings["max_memory_bytes"]),
+            str(resolve_path(spill["directory"])) if spill.get("enabled") else None
+        )
+        self._records: Deque[MessageRecord] = deque()
+        self.total = 0
+        self.evicted = 0
+
+    def append(self, session_id: int, from_ai: str, to_ai: str, stage: str, node_id: str,
+               content: str, timestamp: Optional[float] = None) -> MessageRecord:
+        size = len(content.encode("utf-8"))
+        if size < self.inline_bytes:
+            inline, key = content, None
+        else:
+            inline, key = None, self.store.put(content)
+        record = MessageRecord(session_id, from_ai, to_ai, stage, node_id,
+                               timestamp or time.time(), size, inline, key)
+        if len(self._records) >= self.max_messages:
+            self._discard(self._records.popleft())
+        self._records.append(record)
+        self.total += 1
+        return record
+
+    def _discard(self, record: MessageRecord):
+        if record.key is not None:
+            self.store.release(record.key)
+        self.evicted += 1
+
+    def content(self, record: MessageRecord) -> Optional[str]:
+        """레코드 본문 (저장 한도 초과로 버려졌으면 None)"""
+        if record.key is None:
+            return record.inline
+        return self.store.get(record.key)
+
+    def messages(self, session_id: Optional[int] = None) -> Iterator[MessageRecord]:
+        """보관 중인 레코드 (session_id를 주면 해당 세션만)"""
+        for record in self._records:
+            if session_id is None or record.session_id == session_id:
+                yield record
+
+    def recent(self, count: int) -> List[MessageRecord]:
+        """최근 레코드 count개 (오래된 것부터)"""
+        return list(islice(reversed(self._records), count))[::-1]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        by_ai: Dict[str, int] = {}
+        for record in self._records:
+            by_ai[record.from_ai] = by_ai.get(record.from_ai, 0) + 1
+        return {
+            "messages": len(self._records),
+            "total_recorded": self.total,
+            "evicted": self.evicted,
+            "logical_bytes": sum(record.size for record in self._records),
+            "by_sender": by_ai,
+            "bodies": self.store.get_stats()
+        }
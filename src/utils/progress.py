@@ -0,0 +1,78 @@
+"""
+📡 진행 상황 알림
+
+부분 출력과 단계 전환을 전송 계층(MCP progress notification 등)으로 내보냅니다.
+부분 텍스트는 짧은 간격으로 묶어서 보내 알림 폭주를 막습니다.
+"""
+import time
+from typing import Awaitable, Callable, Optional
+
+# progress, message -> None
+SendFn = Callable[[float, Optional[str]], Awaitable[None]]
+
+
+class ProgressReporter:
+    """진행 알림 전송기 (부분 텍스트는 flush_interval 단위로 합쳐 전송)"""
+
+    def __init__(self, send: SendFn, flush_interval: float = 0.25, max_message_chars: int = 2000):
+        self._send = send
+        self.flush_interval = flush_interval
+        self.max_message_chars = max_message_chars
+        self.progress = 0
+        self._pending = ""
+        self._pending_label: Optional[str] = None
+        self._last_flush = 0.0
+
+    async def _emit(self, message: str):
+        self.progress += 1
+        await self._send(self.progress, message[-self.max_message_chars:])
+
+    async def stage(self, message: str):
+        """단계 전환 알림 (대기 중인 부분 텍스트를 먼저 전송)"""
+        await self.flush()
+        await self._emit(message)
+
+    async def partial(self, text: str, label: Optional[str] = None):
+        """부분 출력 누적 후 간격마다 전송"""
+        if label != self._pending_label:
+            await self.flush()
+            self._pending_label = label
+        self._pending += text
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            await self.flush()
+
+    def chunk_callback(self, label: Optional[str] = None) -> Callable[[str], Awaitable[None]]:
+        """CLI 실행기에 넘길 청크 콜백"""
+        async def on_chunk(text: str):
+            await self.partial(text, label)
+        return on_chunk
+
+    async def flush(self):
+        """누적된 부분 텍스트 전송"""
+        if not self._pending:
+            return
+        text, self._pending = self._pending, ""
+        self._last_flush = time.monotonic()
+        await self._emit(f"[{self._pending_label}] {text}" if self._pending_label else text)
+
+
+def mcp_progress_reporter(server) -> Optional[ProgressReporter]:
+    """현재 MCP 요청에 progressToken이 있으면 진행 알림 전송기 반환 (없으면 None)"""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+
+    async def send(progress: float, message: Optional[str]):
+        try:
+            # related_request_id: Streamable HTTP에서 알림을 해당 요청의 SSE 스트림으로 보냄
+            await ctx.session.send_progress_notification(
+                token, progress, message=message, related_request_id=str(ctx.request_id))
+        except TypeError:
+            # message/related_request_id를 지원하지 않는 구버전 mcp
+            await ctx.session.send_progress_notification(token, progress)
+
+    return ProgressReporter(send)
@@ -0,0 +1,207 @@
+"""
+📏 프롬프트 토큰 예산
+
+후반 단계 프롬프트는 초안, 두 검토, 두 개선안을 통째로 넣기 때문에 단계마다 길어집니다.
+노드 프롬프트를 만들 때 백엔드별 토큰 예산에 맞춰 입력을 줄입니다.
+- 토큰 수는 백엔드별 문자/토큰 비율로 추정 (ASCII와 한글 등은 비율을 따로 적용)
+- 입력 안에 작업 설명이 그대로 반복되면 참조 문구로 바꾸고, 같은 입력이 두 번 들어가면 한 번만 포함
+- 예산을 넘으면 덜 중요한 입력부터 줄임
+  extract: 검토처럼 지적사항이 중요한 글은 항목/개선 제안 줄만 남김
+  truncate: 초안/개선안처럼 전체 흐름이 중요한 글은 앞뒤만 남기고 가운데 생략
+"""
+import logging
+import math
+import re
+import string
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_section
+
+logger = logging.getLogger(__name__)
+
+PROMPT_BUDGET_DEFAULTS = {
+    "enabled": True,
+    "backends": {
+        "gemini": {"max_prompt_tokens": 12000, "ascii_chars_per_token": 4.0, "other_chars_per_token": 1.5},
+        "claude": {"max_prompt_tokens": 12000, "ascii_chars_per_token": 3.5, "other_chars_per_token": 1.2}
+    },
+    # 줄이더라도 입력 하나에 최소한 남길 토큰 수
+    "min_section_tokens": 300,
+    # 이보다 짧은 작업 설명은 입력 안에서 찾아 바꾸지 않음
+    "dedupe_task_min_chars": 80
+}
+
+COMPRESS_MODES = ("extract", "truncate")
+
+TASK_REFERENCE = "(위 작업 설명과 동일)"
+DUPLICATE_REFERENCE = "(앞의 {name} 입력과 동일한 내용)"
+
+# 지적사항/제안으로 보는 줄: 목록 항목, 번호 항목, 제목 또는 개선 관련 단어
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)]|#+)\s+")
+_ACTIONABLE = re.compile(
+    r"개선|제안|수정|보완|추가|필요|권장|누락|문제|오류|부족|고려"
+    r"|should|must|recommend|suggest|fix|improve|missing|consider|add|remove",
+    re.IGNORECASE
+)
+
+
+class BackendBudget:
+    """백엔드 하나의 토큰 추정 비율과 프롬프트 최대 토큰"""
+
+    def __init__(self, max_prompt_tokens: int, ascii_chars_per_token: float = 4.0,
+                 other_chars_per_token: float = 1.5):
+        self.max_prompt_tokens = int(max_prompt_tokens)
+        self.ascii_chars_per_token = float(ascii_chars_per_token)
+        self.other_chars_per_token = float(other_chars_per_token)
+
+    def estimate(self, text: str) -> int:
+        """추정 토큰 수"""
+        if not text:
+            return 0
+        ascii_chars = len(text.encode("ascii", "ignore"))
+        other_chars = len(text) - ascii_chars
+        return math.ceil(ascii_chars / self.ascii_chars_per_token + other_chars / self.other_chars_per_token)
+
+
+def extract_points(text: str, max_tokens: int, budget: BackendBudget) -> str:
+    """지적사항/제안 줄을 우선해 max_tokens 안에 들어가는 줄만 원래 순서대로 남김"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    ranked = sorted(
+        range(len(lines)),
+        key=lambda i: (-(2 * bool(_ACTIONABLE.search(lines[i])) + bool(_LIST_ITEM.match(lines[i]))), i)
+    )
+    marker_tokens = budget.estimate(f"…(원문 {len(lines)}줄 중 {len(lines)}줄만 포함)") + 1
+    kept, used = set(), marker_tokens
+    for i in ranked:
+        cost = budget.estimate(lines[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        kept.add(i)
+        used += cost
+    if not kept:
+        return truncate_text(text, max_tokens, budget)
+    result = "\n".join(lines[i] for i in sorted(kept))
+    if len(kept) < len(lines):
+        result += f"\n…(원문 {len(lines)}줄 중 {len(kept)}줄만 포함)"
+    return result
+
+
+def truncate_text(text: str, max_tokens: int, budget: BackendBudget) -> str:
+    """앞부분 2/3, 뒷부분 1/3을 남기고 가운데를 생략"""
+    tokens = budget.estimate(text)
+    if tokens <= max_tokens:
+        return text
+    keep = max(0, int(len(text) * max_tokens / tokens) - 20)
+    head = keep * 2 // 3
+    tail = keep - head
+    return f"{text[:head]}\n…(중략: 약 {tokens - max_tokens} 토큰 생략)…\n{text[len(text) - tail:] if tail else ''}"
+
+
+@dataclass
+class RenderedPrompt:
+    """렌더링된 프롬프트와 예산 때문에 잘려 나간 입력 토큰 수 (0이면 줄이지 않음)"""
+    text: str
+    elided_tokens: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        return self.elided_tokens > 0
+
+
+class PromptBudget:
+    """노드 입력을 백엔드 예산에 맞게 줄이는 프롬프트 렌더러"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or get_section("prompt_budget", PROMPT_BUDGET_DEFAULTS)
+        self.enabled = bool(settings["enabled"])
+        self.min_section_tokens = int(settings["min_section_tokens"])
+        self.dedupe_task_min_chars = int(settings["dedupe_task_min_chars"])
+        self.backends = {name: BackendBudget(**spec) for name, spec in (settings.get("backends") or {}).items()}
+        self.stats = {"prompts": 0, "deduplicated": 0, "compacted_prompts": 0,
+                      "compacted_sections": 0, "tokens_saved": 0, "over_budget": 0}
+
+    def render(self, template: str, values: Dict[str, Any], backend: str,
+               sections: List[str], compress: Optional[Dict[str, str]] = None,
+               max_tokens: Optional[int] = None) -> RenderedPrompt:
+        """template.format_map(values)와 같되, sections(입력 노드 값)를 예산에 맞게 줄여서 채움
+
+        compress는 {입력 이름: "extract"|"truncate"}로, 앞에 있는 입력일수록 먼저 줄입니다.
+        지정하지 않으면 긴 입력부터 truncate 합니다.
+        max_tokens를 주면 백엔드 기본 예산 대신 사용합니다.
+        """
+        budget = self.backends.get(backend)
+        if not self.enabled or budget is None or not sections:
+            return RenderedPrompt(template.format_map(values))
+
+        self.stats["prompts"] += 1
+        values = dict(values)
+        used = {name for _, name, _, _ in string.Formatter().parse(template) if name}
+        texts = {name: values[name] for name in sections if name in used and isinstance(values.get(name), str)}
+        self._dedupe(template, values, texts)
+
+        empty = dict(values, **{name: "" for name in texts})
+        fixed = budget.estimate(template.format_map(empty))
+        sizes = {name: budget.estimate(text) for name, text in texts.items()}
+        limit = max_tokens if max_tokens is not None else budget.max_prompt_tokens
+        overflow = fixed + sum(sizes.values()) - limit
+        elided = 0
+        if overflow > 0:
+            order = self._compress_order(compress, sizes)
+            before = sum(sizes.values())
+            # 첫 번째: 입력마다 min_section_tokens까지만, 그래도 넘치면 두 번째: 하한 없이 줄임
+            for floor in (self.min_section_tokens, 0):
+                for name, mode in order:
+                    if overflow <= 0:
+                        break
+                    target = max(floor, sizes[name] - overflow)
+                    if target >= sizes[name]:
+                        continue
+                    if mode == "extract":
+                        texts[name] = extract_points(texts[name], target, budget)
+                    else:
+                        texts[name] = truncate_text(texts[name], target, budget)
+                    size = budget.estimate(texts[name])
+                    overflow -= sizes[name] - size
+                    sizes[name] = size
+                    self.stats["compacted_sections"] += 1
+            elided = before - sum(sizes.values())
+            self.stats["compacted_prompts"] += 1
+            self.stats["tokens_saved"] += elided
+            if overflow > 0:
+                self.stats["over_budget"] += 1
+            logger.debug(f"📏 {backend} 프롬프트 축소: {before} → {sum(sizes.values())} 토큰 (고정 {fixed})")
+
+        values.update(texts)
+        return RenderedPrompt(template.format_map(values), elided)
+
+    def _dedupe(self, template: str, values: Dict[str, Any], texts: Dict[str, str]):
+        """작업 설명 반복과 중복 입력을 참조 문구로 교체"""
+        task = values.get("task")
+        replace_task = (isinstance(task, str) and len(task) >= self.dedupe_task_min_chars
+                        and "{task}" in template)
+        seen: Dict[str, str] = {}
+        for name, text in texts.items():
+            if replace_task and task in text:
+                text = text.replace(task, TASK_REFERENCE)
+                self.stats["deduplicated"] += 1
+            if text and text in seen:
+                text = DUPLICATE_REFERENCE.format(name=seen[text])
+                self.stats["deduplicated"] += 1
+            else:
+                seen.setdefault(text, name)
+            texts[name] = text
+
+    @staticmethod
+    def _compress_order(compress: Optional[Dict[str, str]], sizes: Dict[str, int]) -> List[Tuple[str, str]]:
+        order = [(name, mode) for name, mode in (compress or {}).items() if name in sizes]
+        listed = {name for name, _ in order}
+        rest = sorted((name for name in sizes if name not in listed), key=lambda name: -sizes[name])
+        return order + [(name, "truncate") for name in rest]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_prompt_tokens": {name: b.max_prompt_tokens for name, b in self.backends.items()},
+            **self.stats
+        }
@@ -0,0 +1,261 @@
+"""
+🗄️ 백엔드 응답 캐시
+
+(백엔드, 실행 방식, 정규화된 프롬프트)의 해시를 키로 CLI 응답을 저장합니다.
+- 메모리 계층: 바이트 크기 제한이 있는 LRU
+- 디스크 계층(선택): SQLite 파일, 서버 재시작 후에도 유지
+- 모든 항목은 ttl_seconds 후 만료
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .config import get_section, resolve_path
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_DEFAULTS = {
+    "enabled": True,
+    "ttl_seconds": 3600,
+    "max_memory_bytes": 64 * 1024 * 1024,
+    "max_entry_bytes": 4 * 1024 * 1024,
+    "disk": {
+        "enabled": False,
+        "path": "cache/response_cache.sqlite3",
+        "max_entries": 10000
+    }
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """키 계산용 프롬프트 정규화 (줄바꿈 통일, 줄 끝 공백과 앞뒤 빈 줄 제거)"""
+    lines = prompt.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def cache_key(backend: str, prompt: str, variant: str = "") -> str:
+    """(백엔드, 실행 방식, 정규화된 프롬프트)의 SHA-256"""
+    digest = hashlib.sha256()
+    for part in (backend, variant, normalize_prompt(prompt)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    backend: str
+    text: str
+    created_at: float
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) >= self.expires_at
+
+
+class MemoryLRU:
+    """바이트 크기 기준 LRU"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        self.discard(key)
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+
+    def discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteTier:
+    """SQLite 디스크 계층 (동기 API, 호출 측에서 스레드로 실행)"""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = resolve_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, backend TEXT NOT NULL, text TEXT NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT backend, text, created_at, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = CachedResponse(*row)
+            if entry.is_expired():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, entry.backend, entry.text, entry.created_at, entry.expires_at)
+            )
+            # 만료 항목과 max_entries를 넘는 오래된 항목 정리
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """메모리 LRU + 선택적 SQLite 계층"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings if settings is not None else get_section("response_cache", RESPONSE_CACHE_DEFAULTS)
+        self.enabled = bool(settings.get("enabled"))
+        self.ttl_seconds = float(settings.get("ttl_seconds", 3600))
+        self.max_entry_bytes = int(settings.get("max_entry_bytes", RESPONSE_CACHE_DEFAULTS["max_entry_bytes"]))
+        self.memory = MemoryLRU(int(settings.get("max_memory_bytes", RESPONSE_CACHE_DEFAULTS["max_memory_bytes"])))
+        self.disk: Optional[SQLiteTier] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0, "bypassed": 0}
+
+        disk = settings.get("disk") or {}
+        if self.enabled and disk.get("enabled"):
+            try:
+                self.disk = SQLiteTier(disk.get("path", RESPONSE_CACHE_DEFAULTS["disk"]["path"]),
+                                       int(disk.get("max_entries", 10000)))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️ 디스크 캐시를 열 수 없어 메모리 캐시만 사용합니다: {e}")
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """캐시 조회 (메모리 → 디스크, 디스크 적중은 메모리로 승격)"""
+        if not self.enabled:
+            return None
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            if not entry.is_expired():
+                self.stats["memory_hits"] += 1
+                return entry
+            self.memory.discard(key)
+            self.stats["expired"] += 1
+
+        if self.disk is not None:
+            try:
+                entry = await asyncio.to_thread(self.disk.get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 디스크 캐시 조회 실패: {e}")
+                entry = None
+            if entry is not None:
+                self.stats["disk_hits"] += 1
+                self.memory.put(key, entry)
+                return entry
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, backend: str, text: str):
+        """응답 저장 (max_entry_bytes를 넘는 응답은 저장하지 않음)"""
+        if not self.enabled:
+            return
+        now = time.time()
+        entry = CachedResponse(backend=backend, text=text, created_at=now, expires_at=now + self.ttl_seconds)
+        if entry.size > self.max_entry_bytes:
+            return
+        self.memory.put(key, entry)
+        self.stats["stores"] += 1
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.put, key, entry)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 디스크 캐시 저장 실패: {e}")
+
+    def record_bypass(self):
+        self.stats["bypassed"] += 1
+
+    async def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.clear)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+            "evictions": self.memory.evictions,
+            "disk": str(self.disk.path) if self.disk else None,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0,
+            **self.stats
+        }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전역 응답 캐시"""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
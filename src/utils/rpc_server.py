@@ -0,0 +1,164 @@
+"""
+🧩 경량 JSON-RPC(MCP) 서버
+
+직접 작성한 stdio MCP 서버들이 공유하는 요청 분기/도구 등록 계층입니다.
+- 메서드는 분기 테이블(dict)에서 찾고, 도구는 @server.tool(...) 데코레이터로 등록
+- initialize / tools/list 결과는 시작할 때 한 번만 직렬화해 bytes로 재사용
+- 요청 처리는 StdioTransport.serve()의 동시 처리(요청마다 태스크)를 그대로 사용
+- 처리 중인 요청은 id별 태스크로 기억해 두고, notifications/cancelled를 받으면 해당 태스크를 취소 (응답 없음)
+- tools/call은 요청 마감 시간(arguments.timeout_seconds, 없으면 deadlines.request_seconds) 안에서 실행
+
+    server = RPCServer("my-server", "1.0.0")
+
+    @server.tool("echo", "받은 메시지를 돌려줍니다", {"message": {"type": "string"}}, required=["message"])
+    async def echo(arguments):
+        return arguments["message"]
+
+    asyncio.run(server.serve())
+"""
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .deadline import reset_deadline, set_deadline
+from .stdio_transport import StdioTransport, dumps
+
+PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC 오류 코드
+METHOD_NOT_FOUND = -32601
+
+
+@dataclass
+class Tool:
+    """등록된 도구 (handler는 arguments dict를 받아 응답 텍스트를 반환, 동기/비동기 모두 가능)"""
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: Callable[[Dict[str, Any]], Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description, "inputSchema": self.input_schema}
+
+
+class RPCServer:
+    """메서드 분기 테이블과 도구 목록을 가진 MCP 서버"""
+
+    def __init__(self, name: str, version: str, protocol_version: str = PROTOCOL_VERSION):
+        self.name = name
+        self.version = version
+        self.protocol_version = protocol_version
+        self.tools: Dict[str, Tool] = {}
+        self.methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "initialize": self._initialize,
+            "ping": self._ping,
+            "tools/list": self._list_tools,
+            "tools/call": self._call_tool,
+            "notifications/cancelled": self._cancel_request
+        }
+        # 처리 중인 요청 id -> 태스크 (notifications/cancelled로 취소)
+        self._requests: Dict[Any, asyncio.Task] = {}
+        # 메서드 이름 -> 직렬화된 result (요청과 무관하게 항상 같은 응답)
+        self._cached: Dict[str, bytes] = {}
+
+    def tool(self, name: str, description: str, properties: Optional[Dict[str, Any]] = None,
+             required: Optional[List[str]] = None):
+        """도구 등록 데코레이터"""
+        def decorator(handler):
+            schema: Dict[str, Any] = {"type": "object", "properties": properties or {}}
+            if required:
+                schema["required"] = list(required)
+            self.tools[name] = Tool(name, description, schema, handler)
+            self._cached.clear()
+            return handler
+        return decorator
+
+    def method(self, name: str):
+        """JSON-RPC 메서드 등록 데코레이터 (handler는 params dict를 받아 result를 반환)"""
+        def decorator(handler):
+            self.methods[name] = handler
+            self._cached.pop(name, None)
+            return handler
+        return decorator
+
+    def _build_cache(self):
+        """고정 응답을 미리 직렬화"""
+        self._cached = {
+            "initialize": dumps(self._initialize({})),
+            "tools/list": dumps(self._list_tools({}))
+        }
+
+    def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "protocolVersion": self.protocol_version,
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": self.name, "version": self.version}
+        }
+
+    def _ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def _list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"tools": [tool.to_dict() for tool in self.tools.values()]}
+
+    async def _call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        tool_name = params.get("name")
+        tool = self.tools.get(tool_name)
+        arguments = params.get("arguments") or {}
+        deadline_token = set_deadline(arguments.get("timeout_seconds"))
+        try:
+            if tool is None:
+                text = f"❌ 알 수 없는 도구: {tool_name}"
+            else:
+                text = tool.handler(arguments)
+                if inspect.isawaitable(text):
+                    text = await text
+        finally:
+            reset_deadline(deadline_token)
+        return {"content": [{"type": "text", "text": text}]}
+
+    def _cancel_request(self, params: Dict[str, Any]) -> None:
+        """클라이언트가 취소한 요청의 태스크 취소 (이미 끝났거나 모르는 id는 무시)"""
+        task = self._requests.get(params.get("requestId"))
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def handle(self, message: Dict[str, Any]) -> Optional[bytes]:
+        """요청 하나 처리 후 직렬화된 응답 반환 (알림은 None)"""
+        method = message.get("method")
+        request_id = message.get("id")
+
+        result = self._cached.get(method)
+        if result is None:
+            handler = self.methods.get(method)
+            if handler is None:
+                if request_id is None:
+                    return None
+                return dumps({
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {"code": METHOD_NOT_FOUND, "message": f"알 수 없는 메서드: {method}"}
+                })
+            task = asyncio.current_task()
+            if request_id is not None:
+                self._requests[request_id] = task
+            try:
+                value = handler(message.get("params") or {})
+                if inspect.isawaitable(value):
+                    value = await value
+            finally:
+                if request_id is not None and self._requests.get(request_id) is task:
+                    del self._requests[request_id]
+            result = dumps(value)
+
+        if request_id is None:
+            return None
+        return b'{"jsonrpc":"2.0","id":' + dumps(request_id) + b',"result":' + result + b"}"
+
+    async def serve(self, transport: Optional[StdioTransport] = None):
+        """stdin/stdout으로 입력이 끝날 때까지 요청 처리"""
+        self._build_cache()
+        transport = transport or StdioTransport()
+        await transport.start()
+        await transport.serve(self.handle)
@@ -0,0 +1,237 @@
+"""
+📡 asyncio stdin/stdout 전송 계층
+
+직접 작성한 MCP 서버 루프가 공유하는 줄 단위 JSON-RPC 전송입니다.
+- stdin은 connect_read_pipe로 이벤트 루프에서 직접 읽음 (메시지마다 스레드 풀을 거치지 않고, 취소 가능)
+- 한 줄의 최대 크기(max_line_bytes)를 넘는 메시지는 끝까지 버리고 MessageTooLarge로 알림
+- 같은 루프 반복에서 보낸 응답은 모아서 한 번에 쓰고, 쓰기 버퍼가 차면 drain()에서 기다림
+- 파이프가 아닌 stdin/stdout(일반 파일 등)은 스레드 기반 읽기/동기 쓰기로 대체
+- serve()는 요청마다 태스크를 만들어 동시에 처리하고, 끝나는 순서대로 id를 붙여 응답
+- orjson이 설치되어 있으면 JSON 인코딩/디코딩에 사용 (없으면 표준 json)
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from .config import get_section
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STDIO_DEFAULTS = {
+    "max_line_bytes": 16 * 1024 * 1024,
+    # 보내지 않은 응답이 이 크기를 넘으면 바로 씀 (그 전에는 루프 반복 끝에 모아서 씀)
+    "write_coalesce_bytes": 64 * 1024,
+    # 동시에 처리 중인 요청 수 상한 (가득 차면 다음 줄을 읽지 않고 기다림)
+    "max_in_flight": 32
+}
+
+
+def dumps(message: Any) -> bytes:
+    """메시지를 한 줄짜리 UTF-8 JSON으로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """JSON 역직렬화 (형식 오류는 ValueError)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class MessageTooLarge(ValueError):
+    """max_line_bytes를 넘는 입력 줄 (이미 버려졌으므로 다음 메시지는 정상적으로 읽힘)"""
+
+
+class StdioTransport:
+    """stdin에서 줄 단위로 읽고 stdout에 줄 단위로 쓰는 비동기 전송"""
+
+    def __init__(self, max_line_bytes: Optional[int] = None, write_coalesce_bytes: Optional[int] = None,
+                 max_in_flight: Optional[int] = None):
+        settings = get_section("stdio", STDIO_DEFAULTS)
+        self.max_line_bytes = int(max_line_bytes or settings["max_line_bytes"])
+        self.write_coalesce_bytes = int(write_coalesce_bytes or settings["write_coalesce_bytes"])
+        self.max_in_flight = max(1, int(max_in_flight or settings["max_in_flight"]))
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._flush_scheduled = False
+        self.in_flight = 0
+        self.stats = {"received": 0, "sent": 0, "writes": 0, "oversized": 0, "failed": 0, "cancelled": 0,
+                      "peak_in_flight": 0}
+
+    async def start(self):
+        """stdin/stdout을 이벤트 루프에 연결"""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=self.max_line_bytes, loop=loop)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), sys.stdin)
+            self._reader = reader
+        except (ValueError, OSError, NotImplementedError):
+            self._reader = None
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+            self._writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        except (ValueError, OSError, NotImplementedError):
+            self._writer = None
+
+    async def readline(self) -> Optional[bytes]:
+        """다음 줄 (줄바꿈 제외), 입력이 끝나면 None"""
+        # 클라이언트가 응답을 읽지 않아 쓰기 버퍼가 가득 찼으면 새 요청을 받기 전에 대기
+        await self._wait_writable()
+        if self._reader is None:
+            line = await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+            if not line:
+                return None
+            if len(line) > self.max_line_bytes:
+                self.stats["oversized"] += 1
+                raise MessageTooLarge(f"메시지가 너무 큽니다 ({len(line)}바이트 > {self.max_line_bytes}바이트), 무시합니다")
+            self.stats["received"] += 1
+            return line.rstrip(b"\r\n")
+
+        try:
+            line = await self._reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            discarded = await self._discard_line(e.consumed)
+            self.stats["oversized"] += 1
+            raise MessageTooLarge(
+                f"메시지가 너무 큽니다 ({discarded}바이트 이상 > {self.max_line_bytes}바이트), 무시합니다"
+            ) from None
+        self.stats["received"] += 1
+        return line.rstrip(b"\r\n")
+
+    async def _discard_line(self, consumed: int) -> int:
+        """한도를 넘은 줄을 줄바꿈까지 버림 (버린 바이트 수 반환)"""
+        discarded = 0
+        while True:
+            try:
+                discarded += len(await self._reader.readexactly(consumed))
+                discarded += len(await self._reader.readuntil(b"\n"))
+                return discarded
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+            except asyncio.IncompleteReadError as e:
+                return discarded + len(e.partial)
+
+    def send(self, data: bytes):
+        """한 줄 전송 예약 (같은 루프 반복의 전송은 한 번에 씀)"""
+        self._pending.append(data + b"\n")
+        self._pending_bytes += len(data) + 1
+        self.stats["sent"] += 1
+        if self._pending_bytes >= self.write_coalesce_bytes:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def send_json(self, message: Any):
+        self.send(dumps(message))
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        self.stats["writes"] += 1
+        if self._writer is not None:
+            if not self._writer.is_closing():
+                self._writer.write(data)
+        else:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+    async def _wait_writable(self):
+        if self._writer is not None and not self._writer.is_closing():
+            try:
+                await self._writer.drain()
+            except ConnectionError:
+                pass
+
+    async def drain(self):
+        """예약된 전송을 쓰고, 쓰기 버퍼가 가득 차 있으면 비워질 때까지 대기"""
+        self._flush()
+        await self._wait_writable()
+
+    async def serve(self, handle: Callable[[Dict[str, Any]], Awaitable[Union[Dict[str, Any], bytes, None]]]):
+        """입력이 끝날 때까지 요청마다 handle을 태스크로 실행 (끝난 뒤 남은 요청을 기다리고 닫음)
+
+        handle은 응답 dict, 이미 직렬화된 응답 bytes, 또는 응답하지 않을 때 None을 반환합니다.
+        """
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        while True:
+            try:
+                line = await self.readline()
+            except MessageTooLarge as e:
+                print(f"오류: {e}", file=sys.stderr)
+                continue
+            if line is None:
+                break
+            if not line.strip():
+                continue
+            try:
+                message = loads(line)
+            except ValueError as e:
+                print(f"오류: {e}", file=sys.stderr)
+                continue
+            if not isinstance(message, dict):
+                print(f"오류: 지원하지 않는 메시지 형식 ({type(message).__name__})", file=sys.stderr)
+                continue
+
+            await slots.acquire()
+            task = asyncio.create_task(self._dispatch(handle, message, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.close()
+
+    async def _dispatch(self, handle, message: Dict[str, Any], slots: asyncio.Semaphore):
+        """요청 하나를 처리해 응답 전송 (예외는 같은 id의 JSON-RPC 오류로 응답)"""
+        self.in_flight += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+        try:
+            response = await handle(message)
+        except asyncio.CancelledError:
+            # 취소된 요청에는 응답하지 않음 (MCP notifications/cancelled)
+            self.stats["cancelled"] += 1
+            raise
+        except Exception as e:
+            print(f"오류: {e}", file=sys.stderr)
+            self.stats["failed"] += 1
+            response = None
+            if message.get("id") is not None:
+                response = {
+                    "jsonrpc": "2.0",
+                    "id": message.get("id"),
+                    "error": {"code": -32603, "message": str(e)}
+                }
+        finally:
+            self.in_flight -= 1
+            slots.release()
+        if isinstance(response, bytes):
+            self.send(response)
+        elif response is not None:
+            self.send_json(response)
+
+    async def close(self):
+        """남은 응답을 모두 쓰고 stdout 파이프 종료"""
+        if self._writer is not None and not self._writer.is_closing():
+            # 버퍼가 완전히 비워질 때까지 기다린 뒤 닫음
+            self._writer.transport.set_write_buffer_limits(0)
+        await self.drain()
+        if self._writer is not None:
+            self._writer.close()
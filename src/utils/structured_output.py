@@ -0,0 +1,220 @@
+"""
+🧾 구조화된 출력 추출
+
+AI 응답 안의 JSON을 찾아 스키마로 검증합니다.
+- ```json 코드 블록을 먼저, 없으면 본문 중간의 {...}/[...]를 후보로 사용
+- 흔한 오류 보정: 끝의 쉼표, 작은따옴표 문자열, 따옴표 없는 키, 주석, 스마트 따옴표, True/False/None
+- 스키마는 JSON Schema 일부(type, properties, required, enum, minimum, maximum, items)만 지원하며
+  "8" → 8, "Claude" → "claude" 같은 가벼운 형 변환을 함께 수행
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_FENCE = re.compile(r"```[ \t]*(?:json|JSON)?[ \t]*\n(.*?)```", re.DOTALL)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_BARE_KEY = re.compile(r"([{,]\s*)([A-Za-z_][\w-]*)(\s*:)")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = re.compile(r"\b(True|False|None)\b")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_BRACKETS = {"}": "{", "]": "["}
+
+
+class SchemaError(ValueError):
+    """값이 스키마와 맞지 않음"""
+
+
+@dataclass
+class StructuredMatch:
+    """응답에서 찾은 JSON과 원문에서의 위치"""
+    data: Any
+    start: int
+    end: int
+
+    def strip(self, text: str) -> str:
+        """원문에서 JSON 부분을 뺀 텍스트"""
+        return (text[:self.start].rstrip() + "\n" + text[self.end:].lstrip()).strip()
+
+
+def _candidates(text: str) -> Iterator[Tuple[int, int, str]]:
+    """(시작, 끝, JSON 후보) - 코드 블록, 그다음 가장 바깥쪽 괄호 쌍 순서"""
+    for match in _FENCE.finditer(text):
+        yield match.start(), match.end(), match.group(1)
+
+    pairs: List[Tuple[int, int]] = []
+    stack: List[Tuple[str, int]] = []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char in "{[":
+            stack.append((char, i))
+        elif char in "}]":
+            if stack and stack[-1][0] == _BRACKETS[char]:
+                pairs.append((stack.pop()[1], i + 1))
+        elif char == '"' and stack:
+            # 괄호 밖의 따옴표는 일반 문장으로 보고 무시
+            in_string = True
+
+    outermost: List[Tuple[int, int]] = []
+    for start, end in sorted(pairs, key=lambda pair: (pair[0], -pair[1])):
+        if outermost and start < outermost[-1][1]:
+            continue
+        outermost.append((start, end))
+    for start, end in outermost:
+        yield start, end, text[start:end]
+
+
+def repair_json(snippet: str) -> str:
+    """문자열 밖의 흔한 문법 오류를 고친 JSON 텍스트"""
+    snippet = snippet.translate(_SMART_QUOTES)
+    out: List[str] = []
+    outside: List[str] = []
+
+    def flush_outside():
+        segment = "".join(outside)
+        segment = re.sub(r"//[^\n]*|/\*.*?\*/|#[^\n]*", "", segment, flags=re.DOTALL)
+        segment = _PY_LITERALS.sub(lambda m: {"True": "true", "False": "false", "None": "null"}[m.group(1)], segment)
+        out.append(segment)
+        outside.clear()
+
+    i = 0
+    while i < len(snippet):
+        char = snippet[i]
+        if char not in "\"'":
+            outside.append(char)
+            i += 1
+            continue
+        flush_outside()
+        j, chars = i + 1, []
+        while j < len(snippet) and snippet[j] != char:
+            if snippet[j] == "\\" and j + 1 < len(snippet):
+                chars.append(snippet[j:j + 2])
+                j += 2
+                continue
+            chars.append('\\"' if snippet[j] == '"' else snippet[j])
+            j += 1
+        body = "".join(chars)
+        if char == "'":
+            body = body.replace("\\'", "'")
+        out.append(f'"{body}"')
+        i = j + 1
+    flush_outside()
+
+    repaired = "".join(out)
+    repaired = _BARE_KEY.sub(r'\1"\2"\3', repaired)
+    return _TRAILING_COMMA.sub(r"\1", repaired)
+
+
+def loads_lenient(snippet: str) -> Any:
+    """JSON 파싱, 실패하면 보정 후 다시 시도 (그래도 실패하면 ValueError)"""
+    try:
+        return json.loads(snippet, strict=False)
+    except ValueError:
+        return json.loads(repair_json(snippet), strict=False)
+
+
+def coerce(value: Any, schema: Dict[str, Any], path: str = "$") -> Any:
+    """스키마에 맞게 값을 검증/변환 (맞지 않으면 SchemaError)"""
+    expected = schema.get("type")
+
+    if expected == "object":
+        if not isinstance(value, dict):
+            raise SchemaError(f"{path}: object가 아님")
+        missing = [key for key in schema.get("required", []) if key not in value]
+        if missing:
+            raise SchemaError(f"{path}: 필수 항목 누락 {missing}")
+        value = dict(value)
+        for key, sub in (schema.get("properties") or {}).items():
+            if key in value:
+                value[key] = coerce(value[key], sub, f"{path}.{key}")
+        return value
+
+    if expected == "array":
+        if not isinstance(value, list):
+            raise SchemaError(f"{path}: array가 아님")
+        items = schema.get("items")
+        return [coerce(item, items, f"{path}[{i}]") for i, item in enumerate(value)] if items else value
+
+    if expected in ("number", "integer"):
+        if isinstance(value, str):
+            match = _NUMBER.search(value)
+            if not match:
+                raise SchemaError(f"{path}: 숫자가 아님 ({value[:40]!r})")
+            value = float(match.group())
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise SchemaError(f"{path}: 숫자가 아님")
+        if expected == "integer":
+            if value != int(value):
+                raise SchemaError(f"{path}: 정수가 아님 ({value})")
+            value = int(value)
+        if "minimum" in schema and value < schema["minimum"]:
+            raise SchemaError(f"{path}: {value} < {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            raise SchemaError(f"{path}: {value} > {schema['maximum']}")
+
+    elif expected == "boolean":
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            value = value.strip().lower() == "true"
+        if not isinstance(value, bool):
+            raise SchemaError(f"{path}: boolean이 아님")
+
+    elif expected == "string":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if not isinstance(value, str):
+            raise SchemaError(f"{path}: string이 아님")
+
+    if "enum" in schema:
+        value = _match_enum(value, schema["enum"], path)
+    return value
+
+
+def _match_enum(value: Any, options: List[Any], path: str) -> Any:
+    if value in options:
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        text_options = [option for option in options if isinstance(option, str)]
+        for option in text_options:
+            if option.lower() == lowered:
+                return option
+        # "Claude (코드 작성에 강함)"처럼 설명이 붙은 값은 후보가 하나만 들어 있을 때만 인정
+        contained = [option for option in text_options if option.lower() in lowered]
+        if len(contained) == 1:
+            return contained[0]
+    raise SchemaError(f"{path}: {value!r}는 {options} 중 하나가 아님")
+
+
+def extract_structured(text: str, schema: Optional[Dict[str, Any]] = None) -> Optional[StructuredMatch]:
+    """응답에서 (스키마를 만족하는) 첫 번째 JSON 값 찾기, 없으면 None"""
+    if not text:
+        return None
+    for start, end, snippet in _candidates(text):
+        try:
+            data = loads_lenient(snippet)
+            if schema:
+                data = coerce(data, schema)
+        except ValueError:
+            continue
+        return StructuredMatch(data, start, end)
+    return None
+
+
+def extract_number(text: str, low: Optional[float] = None, high: Optional[float] = None) -> Optional[float]:
+    """"8", "8.5/10", "점수: **9**점" 같은 응답에서 범위 안의 첫 숫자"""
+    text = text or ""
+    for match in _NUMBER.finditer(text):
+        # "8/10"의 10, "10점 만점", "1-10" 같은 만점/범위 표기는 건너뜀
+        if text[:match.start()].endswith("/") or re.match(r"\s*(?:점?\s*만점|[-~]\s*\d)", text[match.end():]):
+            continue
+        value = float(match.group())
+        if (low is None or value >= low) and (high is None or value <= high):
+            return value
+    return None
@@ -0,0 +1,342 @@
+"""
+🔥 gemini/claude CLI 사전 기동 워커 풀
+
+요청이 오기 전에 CLI 프로세스를 미리 띄워 두어 Node 런타임 기동, 인증,
+설정 로드 비용을 요청 경로에서 제거합니다.
+
+프로세스는 재사용하지 않습니다. 워커 하나는 요청 하나만 처리하고 종료되며, 그동안
+미리 띄워 둔 예비 워커가 다음 요청을 받습니다. stream-json 프로세스 하나는 대화 하나라서
+한 프로세스로 여러 요청을 처리하면 앞 요청의 맥락이 다음 요청에 섞이기 때문입니다.
+따라서 줄이는 것은 기동 지연뿐이고, 프로세스 수(요청당 하나)는 줄지 않습니다.
+
+프로토콜:
+- oneshot: 미리 띄운 프로세스가 stdin으로 프롬프트를 받고 응답 후 종료
+- stream-json: claude의 --input-format/--output-format stream-json 모드로 메시지 하나를 보내고
+  stdin을 닫아 응답 후 종료
+
+출력은 cli_runner와 같은 크기 제한 버퍼(메모리 → 임시 파일 → 버림)로 읽습니다.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from .cli_runner import (
+    SUBPROCESS_GROUP_KWARGS,
+    ChunkCallback,
+    CLIRunResult,
+    backend_command,
+    collect_process,
+    default_limits,
+    reap_process,
+)
+from .config import get_section
+
+logger = logging.getLogger(__name__)
+
+WORKER_POOL_DEFAULTS = {
+    "enabled": False,
+    "backends": {
+        "gemini": {
+            "size": 2,
+            "protocol": "oneshot",
+            "command": ["gemini"],
+            "max_idle_seconds": 600
+        },
+        "claude": {
+            "size": 2,
+            "protocol": "oneshot",
+            "command": ["claude", "-p"],
+            "max_idle_seconds": 600
+        }
+    }
+}
+
+PROTOCOLS = ("oneshot", "stream-json")
+
+
+class StreamJsonText:
+    """stream-json 출력 조각을 줄 단위로 모아 assistant 텍스트만 on_chunk로 전달
+
+    한 줄이 max_line_chars를 넘으면 그 줄은 진행 표시에서 건너뜀 (최종 결과는 전체 출력에서 다시 읽음)
+    """
+
+    def __init__(self, on_chunk: ChunkCallback, max_line_chars: int):
+        self.on_chunk = on_chunk
+        self.max_line_chars = max_line_chars
+        self._partial = ""
+
+    async def feed(self, text: str):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if len(self._partial) > self.max_line_chars:
+            self._partial = ""
+        for line in lines:
+            event = parse_event(line)
+            if event and event.get("type") == "assistant":
+                for block in event.get("message", {}).get("content", []):
+                    if block.get("type") == "text" and block.get("text"):
+                        await self.on_chunk(block["text"])
+
+
+def parse_event(line: str) -> Optional[Dict[str, Any]]:
+    """stream-json 이벤트 한 줄 파싱 (JSON 객체가 아니면 None)"""
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+class PooledWorker:
+    """풀에서 관리되는 CLI 프로세스 하나 (요청 하나 처리 후 종료)"""
+
+    def __init__(self, backend: str, command: List[str], protocol: str):
+        self.backend = backend
+        self.command = command
+        self.protocol = protocol
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.spawned_at = 0.0
+        self.last_used_at = 0.0
+        self.spawn_seconds = 0.0
+        self.warm = True
+
+    async def spawn(self):
+        """프로세스 기동"""
+        started = time.perf_counter()
+        limits = default_limits()
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # readline 없이 청크 단위로 읽으므로 파이프 버퍼 상한만 명시
+            limit=limits.read_chunk_size * 16,
+            **SUBPROCESS_GROUP_KWARGS
+        )
+        self.spawned_at = self.last_used_at = time.monotonic()
+        self.spawn_seconds = round(time.perf_counter() - started, 4)
+
+    def is_healthy(self, max_idle_seconds: float) -> bool:
+        """살아 있고 너무 오래 유휴 상태가 아닌지 확인"""
+        if self.process is None or self.process.returncode is not None:
+            return False
+        return time.monotonic() - self.last_used_at <= max_idle_seconds
+
+    async def run(self, prompt: str, on_chunk: Optional[ChunkCallback] = None) -> CLIRunResult:
+        """프롬프트 한 건 처리"""
+        started = time.perf_counter()
+        try:
+            if self.protocol == "stream-json":
+                result = await self._run_stream_json(prompt, on_chunk, started)
+            else:
+                result = await self._run_oneshot(prompt, on_chunk, started)
+            # 미리 기동된 워커는 요청 경로에서 기동 비용이 없음
+            result.timings["spawn"] = 0.0 if self.warm else self.spawn_seconds
+            return result
+        finally:
+            self.last_used_at = time.monotonic()
+
+    async def _run_oneshot(self, prompt: str, on_chunk: Optional[ChunkCallback], started: float) -> CLIRunResult:
+        # 큰 프롬프트를 쓰는 동안에도 stdout을 읽어 파이프 교착을 막음
+        return await collect_process(self.process, started, on_chunk, stdin_data=prompt.encode("utf-8"))
+
+    async def _run_stream_json(self, prompt: str, on_chunk: Optional[ChunkCallback], started: float) -> CLIRunResult:
+        limits = default_limits()
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+        stdin_data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        parser = StreamJsonText(on_chunk, limits.spill_threshold_bytes) if on_chunk else None
+        raw = await collect_process(self.process, started, parser.feed if parser else None,
+                                    limits, stdin_data=stdin_data, full_output=True)
+
+        error = None
+        event = None
+        if raw.truncated:
+            error = f"stream-json 출력이 {limits.max_output_bytes}바이트를 넘어 결과를 읽을 수 없습니다"
+        else:
+            events = [e for e in map(parse_event, raw.stdout.splitlines()) if e and e.get("type") == "result"]
+            event = events[-1] if events else None
+            if event is None:
+                error = raw.stderr.strip() or "워커 프로세스가 결과 없이 종료되었습니다"
+
+        if event is not None and (bool(event.get("is_error")) or event.get("subtype", "success") != "success"):
+            error = str(event.get("result") or "").strip() or event.get("subtype")
+        if error:
+            return CLIRunResult(returncode=raw.returncode, stdout="", stderr=raw.stderr, timings=raw.timings,
+                                output_bytes=raw.output_bytes, truncated=raw.truncated, error=error)
+
+        # 일반 실행과 같이 spill_threshold_bytes를 넘는 결과는 앞부분만 담음
+        data = str(event.get("result") or "").encode("utf-8")
+        partial = len(data) > limits.spill_threshold_bytes
+        return CLIRunResult(
+            returncode=0,
+            stdout=data[:limits.spill_threshold_bytes].decode("utf-8", errors="ignore"),
+            stderr=raw.stderr,
+            timings=raw.timings,
+            output_bytes=len(data),
+            partial=partial
+        )
+
+    async def terminate(self):
+        """프로세스 정리"""
+        if self.process is None or self.process.returncode is not None:
+            return
+        await reap_process(self.process, default_limits().kill_grace_seconds)
+
+
+class WorkerPool:
+    """백엔드 하나의 사전 기동 워커 풀 (워커는 요청 하나 처리 후 종료)"""
+
+    def __init__(self, backend: str, command: List[str], protocol: str = "oneshot",
+                 size: int = 2, max_idle_seconds: float = 600):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"지원하지 않는 워커 프로토콜: {protocol}")
+        self.backend = backend
+        self.command = command
+        self.protocol = protocol
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self._idle: List[PooledWorker] = []
+        self._spawning = 0
+        self._closed = False
+        self._background: set = set()
+        self.stats = {"warm_hits": 0, "cold_spawns": 0, "retired": 0, "unhealthy": 0, "spawn_failures": 0,
+                      "failed_requests": 0}
+
+    async def start(self):
+        """풀을 size만큼 미리 채움"""
+        await self._replenish()
+
+    async def _spawn_worker(self) -> Optional[PooledWorker]:
+        worker = PooledWorker(self.backend, self.command, self.protocol)
+        try:
+            await worker.spawn()
+            return worker
+        except (OSError, ValueError) as e:
+            self.stats["spawn_failures"] += 1
+            logger.warning(f"⚠️ {self.backend} 워커 기동 실패: {e}")
+            return None
+
+    async def _replenish(self):
+        missing = self.size - len(self._idle) - self._spawning
+        if missing <= 0 or self._closed:
+            return
+        self._spawning += missing
+        try:
+            workers = await asyncio.gather(*(self._spawn_worker() for _ in range(missing)))
+        finally:
+            self._spawning -= missing
+        for worker in workers:
+            if worker is None:
+                continue
+            if self._closed:
+                await worker.terminate()
+            else:
+                self._idle.append(worker)
+
+    def _schedule(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _acquire(self) -> Optional[PooledWorker]:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.is_healthy(self.max_idle_seconds):
+                self.stats["warm_hits"] += 1
+                return worker
+            self.stats["unhealthy"] += 1
+            self._schedule(worker.terminate())
+
+        self.stats["cold_spawns"] += 1
+        worker = await self._spawn_worker()
+        if worker:
+            worker.warm = False
+        return worker
+
+    async def _release(self, worker: PooledWorker, success: bool):
+        """사용한 워커는 재사용하지 않고 정리 (실패한 워커는 응답 없이 남아 있을 수 있어 강제 종료)"""
+        self.stats["retired"] += 1
+        if not success:
+            self.stats["failed_requests"] += 1
+        await worker.terminate()
+        self._schedule(self._replenish())
+
+    async def execute(self, prompt: str, on_chunk: Optional[ChunkCallback] = None) -> CLIRunResult:
+        """미리 기동된 워커로 프롬프트 실행"""
+        worker = await self._acquire()
+        if worker is None:
+            return CLIRunResult(returncode=None, stdout="", stderr="",
+                                error=f"{self.backend} 워커를 기동할 수 없습니다")
+
+        success = False
+        try:
+            result = await worker.run(prompt, on_chunk)
+            success = result.success
+            return result
+        finally:
+            await self._release(worker, success)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "protocol": self.protocol,
+            "size": self.size,
+            "idle": len(self._idle),
+            **self.stats
+        }
+
+    async def close(self):
+        """모든 워커 종료"""
+        self._closed = True
+        for task in list(self._background):
+            task.cancel()
+        workers, self._idle = self._idle, []
+        await asyncio.gather(*(w.terminate() for w in workers), return_exceptions=True)
+
+
+class WorkerPoolManager:
+    """백엔드별 워커 풀 모음"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings if settings is not None else get_section("worker_pool", WORKER_POOL_DEFAULTS)
+        self.enabled = bool(settings.get("enabled"))
+        self.pools: Dict[str, WorkerPool] = {}
+        if not self.enabled:
+            return
+        for backend, spec in settings.get("backends", {}).items():
+            if int(spec.get("size", 0)) <= 0:
+                continue
+            self.pools[backend] = WorkerPool(
+                backend,
+                backend_command(backend, spec.get("command")),
+                protocol=spec.get("protocol", "oneshot"),
+                size=int(spec["size"]),
+                max_idle_seconds=float(spec.get("max_idle_seconds", 600))
+            )
+
+    def get(self, backend: str) -> Optional[WorkerPool]:
+        return self.pools.get(backend)
+
+    async def start(self):
+        """모든 풀 미리 채우기"""
+        if self.pools:
+            logger.info(f"🔥 사전 기동 워커 풀: {', '.join(f'{b}x{p.size}' for b, p in self.pools.items())}")
+        await asyncio.gather(*(pool.start() for pool in self.pools.values()))
+
+    async def close(self):
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {backend: pool.get_stats() for backend, pool in self.pools.items()}
+
+
+_manager: Optional[WorkerPoolManager] = None
+
+
+def get_worker_pools() -> WorkerPoolManager:
+    """프로세스 전역 워커 풀 관리자"""
+    global _manager
+    if _manager is None:
+        _manager = WorkerPoolManager()
+    return _manager
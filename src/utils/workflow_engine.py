@@ -0,0 +1,659 @@
+"""
+🕸️ 선언적 워크플로우 엔진
+
+협업 단계를 프롬프트 노드의 의존성 그래프(DAG)로 기술하고,
+입력이 준비된 노드부터 즉시 실행하는 스케줄러를 제공합니다.
+그래프 정의는 configs/workflows/ 아래의 JSON(또는 YAML) 파일에서 읽습니다.
+"""
+import asyncio
+import json
+import logging
+import re
+import string
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import deadline
+from .config import get_section, resolve_path
+from .prompt_budget import COMPRESS_MODES, PromptBudget, RenderedPrompt
+from .structured_output import extract_number, extract_structured
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_DEFAULTS = {
+    "directory": "configs/workflows",
+    "default": "collaborative"
+}
+
+SPECULATION_DEFAULTS = {
+    "enabled": True,
+    # 버려질 수 있는 추가 호출의 시간당 한도 (0이면 제한 없음), 넘으면 결정을 기다린 뒤 실행
+    "max_extra_calls_per_hour": 120
+}
+
+SUPPORTED_BACKENDS = ("gemini", "claude")
+OUTPUT_TYPES = ("text", "choice", "score")
+
+# backend, prompt, on_chunk=None -> {"success", "result", "error", "ai"}
+ExecuteFn = Callable[..., Awaitable[Dict[str, Any]]]
+NodeStartHook = Callable[["WorkflowNode", str], Awaitable[None]]
+NodeFinishHook = Callable[["WorkflowNode", "NodeResult"], Awaitable[None]]
+NodeChunkHook = Callable[["WorkflowNode", str], Awaitable[None]]
+
+
+class WorkflowConfigError(ValueError):
+    """워크플로우 정의가 잘못된 경우"""
+
+
+@dataclass
+class WorkflowStageInfo:
+    id: str
+    description: str = ""
+    label: str = ""
+
+
+@dataclass
+class WorkflowNode:
+    id: str
+    stage: str
+    backend: str
+    prompt: str
+    inputs: List[str] = field(default_factory=list)
+    output: Dict[str, Any] = field(default_factory=lambda: {"type": "text"})
+    # 예산 초과시 줄일 입력과 방식 (앞에 있을수록 먼저 줄임)
+    compress: Dict[str, str] = field(default_factory=dict)
+    # backend를 정하는 choice 입력을 기다리지 않고 후보 백엔드 모두에서 미리 실행
+    speculate: bool = False
+    # {"from": 입력 노드, "field": 항목}: 입력 노드 응답의 JSON에 항목이 있으면 호출 없이 그 값을 사용
+    extract: Dict[str, str] = field(default_factory=dict)
+    # 이 노드 프롬프트의 토큰 예산 (없으면 백엔드 기본값)
+    max_prompt_tokens: Optional[int] = None
+
+    def placeholders(self, template: Optional[str] = None) -> List[str]:
+        """템플릿에서 참조하는 변수 이름 목록"""
+        names = []
+        for _, name, _, _ in string.Formatter().parse(template if template is not None else self.prompt):
+            if name:
+                names.append(name)
+        return names
+
+
+@dataclass
+class WorkflowGraph:
+    name: str
+    description: str
+    stages: List[WorkflowStageInfo]
+    nodes: Dict[str, WorkflowNode]
+    result: str
+    quality: List[str] = field(default_factory=list)
+    default_quality_score: float = 8.0
+    variables: List[str] = field(default_factory=lambda: ["task"])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowGraph":
+        """딕셔너리 정의로부터 그래프 생성 및 검증"""
+        try:
+            stages = [
+                WorkflowStageInfo(
+                    id=s["id"],
+                    description=s.get("description", ""),
+                    label=s.get("label", "")
+                )
+                for s in data.get("stages", [])
+            ]
+            nodes: Dict[str, WorkflowNode] = {}
+            for raw in data["nodes"]:
+                prompt = raw["prompt"]
+                if isinstance(prompt, list):
+                    prompt = "\n".join(prompt)
+                output = raw.get("output", {"type": "text"})
+                if isinstance(output, str):
+                    output = {"type": output}
+                compress = raw.get("compress", {})
+                if isinstance(compress, list):
+                    compress = {name: "truncate" for name in compress}
+                node = WorkflowNode(
+                    id=raw["id"],
+                    stage=raw.get("stage", raw["id"]),
+                    backend=raw["backend"],
+                    prompt=prompt,
+                    inputs=list(raw.get("inputs", [])),
+                    output=output,
+                    compress=dict(compress),
+                    speculate=bool(raw.get("speculate", False)),
+                    extract=dict(raw.get("extract") or {}),
+                    max_prompt_tokens=int(raw["max_prompt_tokens"]) if raw.get("max_prompt_tokens") else None
+                )
+                if node.id in nodes:
+                    raise WorkflowConfigError(f"중복된 노드 id: {node.id}")
+                nodes[node.id] = node
+
+            graph = cls(
+                name=data.get("name", "workflow"),
+                description=data.get("description", ""),
+                stages=stages,
+                nodes=nodes,
+                result=data["result"],
+                quality=list(data.get("quality", [])),
+                default_quality_score=float(data.get("default_quality_score", 8.0)),
+                variables=list(data.get("variables", ["task"]))
+            )
+        except KeyError as e:
+            raise WorkflowConfigError(f"워크플로우 정의에 필수 항목이 없습니다: {e}") from e
+
+        graph.validate()
+        return graph
+
+    def validate(self):
+        """참조 무결성과 순환 여부 검사"""
+        known_stages = {s.id for s in self.stages}
+        for node in self.nodes.values():
+            for dep in node.inputs:
+                if dep not in self.nodes:
+                    raise WorkflowConfigError(f"{node.id}: 알 수 없는 입력 노드 '{dep}'")
+            allowed = set(node.inputs) | set(self.variables)
+            for name in node.placeholders() + node.placeholders(node.backend):
+                if name not in allowed:
+                    raise WorkflowConfigError(
+                        f"{node.id}: '{{{name}}}'는 inputs 또는 variables에 선언되어야 합니다"
+                    )
+            if not node.placeholders(node.backend) and node.backend not in SUPPORTED_BACKENDS:
+                raise WorkflowConfigError(f"{node.id}: 지원하지 않는 backend '{node.backend}'")
+            if node.output.get("type", "text") not in OUTPUT_TYPES:
+                raise WorkflowConfigError(f"{node.id}: 지원하지 않는 output 타입 '{node.output.get('type')}'")
+            for name, mode in node.compress.items():
+                if name not in node.inputs:
+                    raise WorkflowConfigError(f"{node.id}: compress의 '{name}'는 inputs에 없습니다")
+                if mode not in COMPRESS_MODES:
+                    raise WorkflowConfigError(f"{node.id}: 지원하지 않는 compress 방식 '{mode}'")
+            if node.max_prompt_tokens is not None and node.max_prompt_tokens <= 0:
+                raise WorkflowConfigError(f"{node.id}: max_prompt_tokens는 양수여야 합니다")
+            if node.speculate:
+                self._validate_speculation(node)
+            if node.extract:
+                self._validate_extract(node)
+            if known_stages and node.stage not in known_stages:
+                raise WorkflowConfigError(f"{node.id}: 정의되지 않은 stage '{node.stage}'")
+
+        for node_id in [self.result] + self.quality:
+            if node_id not in self.nodes:
+                raise WorkflowConfigError(f"결과/품질 노드 '{node_id}'가 존재하지 않습니다")
+
+        self.topological_order()
+
+    def _validate_speculation(self, node: WorkflowNode):
+        names = node.placeholders(node.backend)
+        if len(names) != 1 or node.backend != f"{{{names[0]}}}" or names[0] not in node.inputs:
+            raise WorkflowConfigError(f"{node.id}: speculate 노드의 backend는 '{{입력 노드}}' 하나여야 합니다")
+        choice = self.nodes[names[0]]
+        if choice.output.get("type") != "choice":
+            raise WorkflowConfigError(f"{node.id}: speculate 노드의 backend 입력 '{choice.id}'는 choice 노드여야 합니다")
+        if names[0] in node.placeholders():
+            raise WorkflowConfigError(f"{node.id}: speculate 노드의 prompt는 '{{{choice.id}}}'를 참조할 수 없습니다")
+        for backend in self.speculation_candidates(node):
+            if backend not in SUPPORTED_BACKENDS:
+                raise WorkflowConfigError(f"{node.id}: 지원하지 않는 후보 backend '{backend}'")
+
+    def _validate_extract(self, node: WorkflowNode):
+        source, name = node.extract.get("from"), node.extract.get("field")
+        if source not in node.inputs or not name:
+            raise WorkflowConfigError(f"{node.id}: extract에는 inputs 중 하나인 'from'과 'field'가 필요합니다")
+        schema = self.nodes[source].output.get("schema") or {}
+        if name not in (schema.get("properties") or {}):
+            raise WorkflowConfigError(f"{node.id}: '{source}'의 output.schema에 '{name}' 항목이 없습니다")
+
+    def speculative_input(self, node: WorkflowNode) -> Optional[str]:
+        """speculate 노드의 backend를 정하는 choice 입력 이름 (아니면 None)"""
+        return node.placeholders(node.backend)[0] if node.speculate else None
+
+    def speculation_candidates(self, node: WorkflowNode) -> List[str]:
+        """speculate 노드가 미리 실행할 후보 백엔드 (choice 노드의 choices와 default)"""
+        output = self.nodes[self.speculative_input(node)].output
+        choices = list(output.get("choices", SUPPORTED_BACKENDS))
+        if "default" in output:
+            choices.append(output["default"])
+        return list(dict.fromkeys(choices))
+
+    def topological_order(self) -> List[str]:
+        """위상 정렬 (순환이 있으면 WorkflowConfigError)"""
+        remaining = {node_id: set(node.inputs) for node_id, node in self.nodes.items()}
+        order: List[str] = []
+        while remaining:
+            ready = sorted(node_id for node_id, deps in remaining.items() if not deps)
+            if not ready:
+                raise WorkflowConfigError(f"워크플로우에 순환 의존성이 있습니다: {sorted(remaining)}")
+            for node_id in ready:
+                order.append(node_id)
+                del remaining[node_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def critical_path_length(self) -> int:
+        """의존성상 최소 순차 호출 수 (가장 긴 경로의 노드 수, extract 노드는 추출에 성공한다고 가정)"""
+        depth: Dict[str, int] = {}
+        for node_id in self.topological_order():
+            node = self.nodes[node_id]
+            if node.extract:
+                depth[node_id] = depth[node.extract["from"]]
+                continue
+            choice = self.speculative_input(node)
+            # speculate 노드는 choice 입력과 동시에 실행되므로 choice 노드보다 깊어지지 않음
+            depth[node_id] = max(
+                1 + max((depth[d] for d in node.inputs if d != choice), default=0),
+                depth[choice] if choice else 0
+            )
+        return max(depth.values(), default=0)
+
+    def stage_summary(self) -> List[Dict[str, Any]]:
+        """워크플로우 요약 (단계 id와 설명)"""
+        return [{"stage": s.id, "description": s.description} for s in self.stages]
+
+
+@dataclass
+class NodeResult:
+    node_id: str
+    backend: str
+    success: bool
+    text: str
+    value: Any
+    error: Optional[str]
+    started_at: float
+    finished_at: float
+    prompt: str = ""
+    # output.schema로 응답에서 추출한 JSON (없거나 실패하면 None)
+    data: Optional[Dict[str, Any]] = None
+    # 호출 없이 다른 노드의 JSON에서 값을 가져왔으면 그 노드 id
+    extracted_from: Optional[str] = None
+    # 토큰 예산 때문에 프롬프트 입력에서 잘려 나간 토큰 수
+    elided_tokens: int = 0
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class WorkflowRun:
+    graph: WorkflowGraph
+    variables: Dict[str, str]
+    results: Dict[str, NodeResult] = field(default_factory=dict)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def final_result(self) -> str:
+        return self.results[self.graph.result].text
+
+    def quality_score(self) -> float:
+        """점수를 얻은 품질 노드의 평균 (모두 없으면 기본값)"""
+        missing = self.missing_quality_scores()
+        scores = [self.results[node_id].value for node_id in self.graph.quality if node_id not in missing]
+        if not scores:
+            return self.graph.default_quality_score
+        return sum(scores) / len(scores)
+
+    def missing_quality_scores(self) -> List[str]:
+        """점수를 얻지 못한 품질 노드 (실행되지 않았거나 응답에서 점수를 찾지 못함)"""
+        return [
+            node_id for node_id in self.graph.quality
+            if node_id not in self.results or self.results[node_id].value is None
+        ]
+
+    def prompt_compaction(self) -> Dict[str, Any]:
+        """토큰 예산 때문에 입력이 잘린 노드와 생략된 토큰 수"""
+        nodes = {node_id: r.elided_tokens for node_id, r in self.results.items() if r.elided_tokens}
+        return {"compacted": bool(nodes), "elided_tokens": sum(nodes.values()), "nodes": nodes}
+
+    def stage_timings(self) -> Dict[str, float]:
+        """단계별 소요 시간(초): 단계의 첫 노드 시작부터 마지막 노드 종료까지"""
+        timings: Dict[str, float] = {}
+        for stage in [s.id for s in self.graph.stages] or sorted({n.stage for n in self.graph.nodes.values()}):
+            stage_results = [
+                r for node_id, r in self.results.items()
+                if self.graph.nodes[node_id].stage == stage
+            ]
+            if stage_results:
+                started = min(r.started_at for r in stage_results)
+                finished = max(r.finished_at for r in stage_results)
+                timings[stage] = round(finished - started, 3)
+        timings["total"] = round(self.finished_at - self.started_at, 3)
+        return timings
+
+
+def parse_output(node: WorkflowNode, text: str) -> Any:
+    """노드 output 타입에 맞게 응답을 해석 (choice/score를 찾지 못하면 None)"""
+    output_type = node.output.get("type", "text")
+
+    if output_type == "choice":
+        lowered = text.lower()
+        for choice in node.output.get("choices", SUPPORTED_BACKENDS):
+            if choice.lower() in lowered:
+                return choice
+        return None
+
+    if output_type == "score":
+        return extract_number(text, node.output.get("min", 1), node.output.get("max", 10))
+
+    return text
+
+
+def output_default(node: WorkflowNode) -> Any:
+    """호출 응답도 해석할 수 없을 때 쓸 값 (choice 노드의 default, 그 외 None)"""
+    if node.output.get("type") == "choice":
+        return node.output.get("default", node.output.get("choices", SUPPORTED_BACKENDS)[-1])
+    return None
+
+
+def parse_structured(node: WorkflowNode, text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """output.schema가 있으면 응답에서 JSON 추출 (output.strip이면 JSON을 뺀 본문도 반환)"""
+    schema = node.output.get("schema")
+    if not schema:
+        return None, text
+    match = extract_structured(text, schema)
+    if match is None:
+        return None, text
+    if node.output.get("strip"):
+        text = match.strip(text) or text
+    return match.data, text
+
+
+class SpeculationBudget:
+    """버려질 수 있는 추가 호출의 시간당 한도"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or get_section("speculation", SPECULATION_DEFAULTS)
+        self.enabled = bool(settings["enabled"])
+        self.max_extra_calls_per_hour = int(settings["max_extra_calls_per_hour"])
+        self._recent: deque = deque()
+        self.stats = {"speculated": 0, "kept": 0, "cancelled": 0, "discarded": 0, "skipped": 0}
+
+    def acquire(self, extra_calls: int) -> bool:
+        """추가 호출 extra_calls개를 쓸 수 있으면 기록하고 True"""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > 3600:
+            self._recent.popleft()
+        if self.max_extra_calls_per_hour and len(self._recent) + extra_calls > self.max_extra_calls_per_hour:
+            self.stats["skipped"] += 1
+            return False
+        self._recent.extend([now] * extra_calls)
+        self.stats["speculated"] += 1
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "extra_calls_last_hour": len(self._recent),
+            "max_extra_calls_per_hour": self.max_extra_calls_per_hour,
+            **self.stats
+        }
+
+
+class WorkflowEngine:
+    """그래프의 각 노드를 입력이 준비되는 즉시 실행하는 스케줄러
+
+    실행 상태는 run() 호출마다 만드는 WorkflowRun에만 있고 그래프는 읽기만 하므로,
+    엔진 하나(와 캐시된 그래프)로 여러 워크플로우를 동시에 실행할 수 있습니다.
+    프롬프트는 budget(PromptBudget)으로 백엔드별 토큰 예산에 맞춰 만듭니다.
+    speculate 노드는 나머지 입력이 준비됐을 때 choice 입력이 아직 결정 중이면
+    speculation 한도 안에서 후보 백엔드 모두로 실행하고, 선택된 쪽만 남깁니다.
+    extract 노드는 입력 노드 응답의 JSON에 필요한 항목이 있으면 CLI를 호출하지 않습니다.
+    """
+
+    def __init__(self, execute: ExecuteFn, budget: Optional[PromptBudget] = None,
+                 speculation: Optional[SpeculationBudget] = None):
+        self.execute = execute
+        self.budget = budget or PromptBudget()
+        self.speculation = speculation or SpeculationBudget()
+        self.stats = {"extracted": 0, "extraction_fallbacks": 0}
+
+    async def _call(self, backend: str, prompt: str, on_chunk, execute_options: Optional[Dict[str, Any]]):
+        try:
+            return await self.execute(backend, prompt, on_chunk=on_chunk, **(execute_options or {}))
+        except Exception as e:
+            return {"success": False, "result": "", "error": f"CLI 실행 오류: {str(e)}"}
+
+    async def run(self, graph: WorkflowGraph, variables: Dict[str, str],
+                  on_node_start: Optional[NodeStartHook] = None,
+                  on_node_finish: Optional[NodeFinishHook] = None,
+                  on_chunk: Optional[NodeChunkHook] = None,
+                  execute_options: Optional[Dict[str, Any]] = None) -> WorkflowRun:
+        """워크플로우 실행 (on_chunk가 있으면 노드별 부분 출력을 전달, execute_options는 execute에 그대로 전달)"""
+        missing = [name for name in graph.variables if name not in variables]
+        if missing:
+            raise WorkflowConfigError(f"워크플로우 변수 누락: {missing}")
+
+        run = WorkflowRun(graph=graph, variables=dict(variables), started_at=time.perf_counter())
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def node_values(node: WorkflowNode, inputs: List[str]) -> Dict[str, Any]:
+            values = dict(variables)
+            for dep in inputs:
+                values[dep] = run.results[dep].value
+            return values
+
+        async def finish_node(node: WorkflowNode, backend: str, prompt: RenderedPrompt, response: Dict[str, Any],
+                              started: float, finished: float) -> NodeResult:
+            text = response.get("result") or ""
+            data, body = parse_structured(node, text)
+            value = parse_output(node, body)
+            result = NodeResult(
+                node_id=node.id,
+                backend=response.get("ai") or backend,
+                success=bool(response.get("success")),
+                text=body,
+                value=output_default(node) if value is None else value,
+                error=response.get("error"),
+                started_at=started,
+                finished_at=finished,
+                prompt=prompt.text,
+                data=data,
+                elided_tokens=prompt.elided_tokens
+            )
+            run.results[node.id] = result
+            if on_node_finish:
+                await on_node_finish(node, result)
+            return result
+
+        async def extract_node(node: WorkflowNode) -> Optional[NodeResult]:
+            """입력 노드의 JSON 항목으로 결과를 만듦 (항목이 없거나 해석할 수 없으면 None)"""
+            source = node.extract["from"]
+            await tasks[source]
+            data = run.results[source].data
+            raw = data.get(node.extract["field"]) if run.results[source].success and data else None
+            value = parse_output(node, str(raw)) if raw is not None else None
+            if value is None:
+                self.stats["extraction_fallbacks"] += 1
+                return None
+            self.stats["extracted"] += 1
+            now = time.perf_counter()
+            result = NodeResult(node_id=node.id, backend=run.results[source].backend, success=True,
+                                text=str(raw), value=value, error=None, started_at=now, finished_at=now,
+                                extracted_from=source)
+            run.results[node.id] = result
+            logger.info(f"🧾 {node.id}: {source}의 '{node.extract['field']}' 값 사용 ({raw}), 호출 생략")
+            if on_node_finish:
+                await on_node_finish(node, result)
+            return result
+
+        async def run_node(node: WorkflowNode) -> NodeResult:
+            if node.extract:
+                result = await extract_node(node)
+                if result is not None:
+                    return result
+
+            choice = graph.speculative_input(node)
+            if choice is not None:
+                result = await run_speculative(node, choice)
+                if result is not None:
+                    return result
+
+            if node.inputs:
+                await asyncio.gather(*(tasks[dep] for dep in node.inputs))
+
+            values = node_values(node, node.inputs)
+            backend = node.backend.format_map(values)
+            prompt = self.budget.render(node.prompt, values, backend, node.inputs, node.compress,
+                                        node.max_prompt_tokens)
+
+            if deadline.expired():
+                # 마감 시간이 지나면 남은 단계는 CLI를 호출하지 않고 실패 처리
+                now = time.perf_counter()
+                result = NodeResult(node_id=node.id, backend=backend, success=False, text="", value=None,
+                                    error="요청 마감 시간 초과로 실행하지 않음", started_at=now, finished_at=now,
+                                    prompt=prompt.text)
+                run.results[node.id] = result
+                return result
+
+            if on_node_start:
+                await on_node_start(node, backend)
+
+            node_chunk = None
+            if on_chunk:
+                async def node_chunk(text: str):
+                    await on_chunk(node, text)
+
+            started = time.perf_counter()
+            response = await self._call(backend, prompt.text, node_chunk, execute_options)
+            return await finish_node(node, backend, prompt, response, started, time.perf_counter())
+
+        async def run_speculative(node: WorkflowNode, choice: str) -> Optional[NodeResult]:
+            """후보 백엔드 모두로 미리 실행 후 choice 결과에 맞는 것만 남김 (실행하지 않았으면 None)"""
+            others = [dep for dep in node.inputs if dep != choice]
+            if others:
+                await asyncio.gather(*(tasks[dep] for dep in others))
+            candidates = graph.speculation_candidates(node)
+            if tasks[choice].done() or deadline.expired() or not self.speculation.acquire(len(candidates) - 1):
+                return None
+
+            values = node_values(node, others)
+            prompts = {
+                b: self.budget.render(node.prompt, values, b, others, node.compress, node.max_prompt_tokens)
+                for b in candidates
+            }
+            selected: Dict[str, str] = {}
+            buffers: Dict[str, List[str]] = {b: [] for b in candidates}
+
+            def candidate_chunk(backend: str):
+                if not on_chunk:
+                    return None
+
+                async def chunk(text: str):
+                    # 선택 전에는 후보별로 모아 두었다가 선택된 쪽만 전달
+                    if selected.get("backend") == backend:
+                        await on_chunk(node, text)
+                    elif not selected:
+                        buffers[backend].append(text)
+                return chunk
+
+            logger.info(f"🔮 {node.id}: {'/'.join(candidates)} 동시 실행 ('{choice}' 결정과 병렬)")
+            started = time.perf_counter()
+            calls = {
+                b: asyncio.create_task(self._call(b, prompts[b].text, candidate_chunk(b), execute_options))
+                for b in candidates
+            }
+            try:
+                await tasks[choice]
+                backend = node.backend.format_map(node_values(node, [choice]))
+                if backend not in calls:
+                    return None
+                for b, call in calls.items():
+                    if b != backend:
+                        self.speculation.stats["discarded" if call.done() else "cancelled"] += 1
+                        call.cancel()
+                self.speculation.stats["kept"] += 1
+
+                if on_node_start:
+                    await on_node_start(node, backend)
+                buffer = buffers[backend]
+                index = 0
+                while index < len(buffer):
+                    await on_chunk(node, buffer[index])
+                    index += 1
+                selected["backend"] = backend
+
+                response = await calls[backend]
+                return await finish_node(node, backend, prompts[backend], response, started, time.perf_counter())
+            finally:
+                losers = [call for call in calls.values() if not call.done()]
+                for call in losers:
+                    call.cancel()
+                if losers:
+                    await asyncio.wait(losers)
+
+        for node_id in graph.topological_order():
+            tasks[node_id] = asyncio.create_task(run_node(graph.nodes[node_id]))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                # 취소된 노드의 CLI 프로세스 정리가 끝날 때까지 대기
+                await asyncio.wait(pending)
+            run.finished_at = time.perf_counter()
+
+        return run
+
+
+def _read_definition(path: Path) -> Dict[str, Any]:
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise WorkflowConfigError("YAML 워크플로우에는 PyYAML이 필요합니다: pip install pyyaml")
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def workflow_directory() -> Path:
+    return resolve_path(get_section("workflow", WORKFLOW_DEFAULTS)["directory"])
+
+
+def available_workflows() -> List[str]:
+    """사용 가능한 워크플로우 이름 목록"""
+    directory = workflow_directory()
+    if not directory.is_dir():
+        return []
+    return sorted({
+        p.stem for p in directory.iterdir()
+        if p.suffix in (".json", ".yaml", ".yml")
+    })
+
+
+_graph_cache: Dict[str, WorkflowGraph] = {}
+
+
+def load_workflow(name: Optional[str] = None) -> WorkflowGraph:
+    """configs/workflows/<name>.json|yaml 워크플로우 로드
+
+    클라이언트가 보낸 이름을 그대로 받으므로 경로는 허용하지 않고, 워크플로우 디렉터리 목록에 있는 이름만 로드합니다.
+    """
+    name = str(name or get_section("workflow", WORKFLOW_DEFAULTS)["default"])
+    if not re.fullmatch(r"[\w-]+", name):
+        raise WorkflowConfigError(f"워크플로우 이름에는 경로를 쓸 수 없습니다: '{name}' (사용 가능: {available_workflows()})")
+    if name in _graph_cache:
+        return _graph_cache[name]
+
+    if name not in available_workflows():
+        raise WorkflowConfigError(f"워크플로우 '{name}'를 찾을 수 없습니다 (사용 가능: {available_workflows()})")
+    directory = workflow_directory()
+    path = next(directory / f"{name}{ext}" for ext in (".json", ".yaml", ".yml")
+                if (directory / f"{name}{ext}").exists())
+
+    try:
+        graph = WorkflowGraph.from_dict(_read_definition(path))
+    except (OSError, json.JSONDecodeError) as e:
+        raise WorkflowConfigError(f"워크플로우 파일을 읽을 수 없습니다 ({path}): {e}") from e
+
+    _graph_cache[name] = graph
+    return graph
@@ -0,0 +1,14 @@
+"""
+테스트 공통 설정
+
+- src/를 import 경로에 추가 (서버 모듈은 `servers.<이름>`, 유틸리티는 `utils.<이름>`)
+- 실제 gemini/claude CLI 대신 benchmarks/fake_backend.json의 가짜 CLI 사용
+"""
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+os.environ.setdefault("MCP_COLLAB_CONFIG", str(PROJECT_ROOT / "benchmarks" / "fake_backend.json"))
@@ -0,0 +1,99 @@
+"""동시 실행 제한: FIFO 대기열, 대기열 크기 제한, 대기 시간 초과"""
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, AdmissionRejected
+
+
+def controller(**settings) -> AdmissionController:
+    return AdmissionController({"max_total": 1, "max_queue": 10, "max_queue_wait_seconds": 5, **settings})
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    admission = controller()
+    order = []
+
+    async def worker(name: str):
+        async with admission.slot("gemini"):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        async with admission.slot("gemini"):
+            tasks = []
+            for name in ("a", "b", "c"):
+                tasks.append(asyncio.create_task(worker(name)))
+                await asyncio.sleep(0)
+            assert admission.get_stats()["waiting"] == 3
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    assert order == ["a", "b", "c"]
+    assert admission.stats["queued"] == 3 and admission.total_running == 0
+
+
+def test_idle_backend_does_not_wait_behind_full_backend():
+    admission = controller(max_total=0, backends={"gemini": 1, "claude": 1})
+
+    async def scenario():
+        async with admission.slot("gemini"):
+            waiting = asyncio.create_task(admission.acquire("gemini"))
+            await asyncio.sleep(0)
+            async with admission.slot("claude") as queued:
+                assert queued == 0.0
+        await waiting
+        admission._release("gemini")
+
+    asyncio.run(scenario())
+
+    assert admission.stats["queued"] == 1
+
+
+def test_full_queue_rejects_immediately():
+    admission = controller(max_queue=1)
+
+    async def scenario():
+        async with admission.slot("gemini"):
+            waiting = asyncio.create_task(admission.acquire("gemini"))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected):
+                await admission.acquire("gemini")
+        await waiting
+        admission._release("gemini")
+
+    asyncio.run(scenario())
+
+    assert admission.stats["rejected_full"] == 1 and admission.stats["queued"] == 1
+
+
+def test_queue_wait_timeout_rejects_and_leaves_queue():
+    admission = controller(max_queue_wait_seconds=0.05)
+
+    async def scenario():
+        async with admission.slot("gemini"):
+            with pytest.raises(AdmissionRejected):
+                await admission.acquire("gemini")
+            assert admission.get_stats()["waiting"] == 0
+
+    asyncio.run(scenario())
+
+    assert admission.stats["rejected_timeout"] == 1 and admission.total_running == 0
+
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    admission = controller()
+
+    async def scenario():
+        async with admission.slot("gemini"):
+            waiting = asyncio.create_task(admission.acquire("gemini"))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+        async with admission.slot("gemini") as queued:
+            assert queued == 0.0
+
+    asyncio.run(scenario())
+
+    assert admission.total_running == 0 and admission.get_stats()["waiting"] == 0
@@ -0,0 +1,105 @@
+"""백엔드 실행기 single-flight: 동일 호출 합류, 취소된 호출자 분리"""
+import asyncio
+
+from utils.admission import AdmissionController
+from utils.backend_runner import BackendRunner
+from utils.circuit_breaker import CIRCUIT_BREAKER_DEFAULTS, BreakerRegistry
+from utils.cli_runner import CLIRunResult
+from utils.response_cache import ResponseCache
+from utils.worker_pool import WorkerPoolManager
+
+
+class SlowRunner(BackendRunner):
+    """CLI 대신 delay초 뒤 응답하고 시작/취소를 기록하는 실행기"""
+
+    def __init__(self, delay: float = 0.1):
+        super().__init__(WorkerPoolManager({"enabled": False}), ResponseCache({"enabled": False}),
+                         AdmissionController({}), BreakerRegistry(CIRCUIT_BREAKER_DEFAULTS))
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _run(self, ai, prompt, on_chunk):
+        self.calls += 1
+        if on_chunk:
+            await on_chunk("첫 조각 ")
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if on_chunk:
+            await on_chunk("끝")
+        return CLIRunResult(returncode=0, stdout=f"{ai}: {prompt}", stderr="", timings={"exit": self.delay})
+
+
+def test_identical_calls_share_one_execution():
+    runner = SlowRunner()
+
+    async def scenario():
+        return await asyncio.gather(*(runner.execute("gemini", "같은 질문") for _ in range(3)),
+                                    runner.execute("gemini", "다른 질문"))
+
+    first, second, third, other = asyncio.run(scenario())
+
+    assert runner.calls == 2 and runner.stats["coalesced"] == 2
+    assert first.stdout == second.stdout == third.stdout == "gemini: 같은 질문"
+    assert other.stdout == "gemini: 다른 질문"
+    # 호출자마다 독립된 결과 객체
+    first.timings["queue"] = 99
+    assert second.timings.get("queue") != 99
+    assert not runner._inflight
+
+
+def test_late_joiner_receives_earlier_chunks():
+    runner = SlowRunner()
+    early, late = [], []
+
+    def collect(into):
+        async def on_chunk(text):
+            into.append(text)
+        return on_chunk
+
+    async def scenario():
+        first = asyncio.create_task(runner.execute("claude", "질문", collect(early)))
+        await asyncio.sleep(0.02)
+        second = asyncio.create_task(runner.execute("claude", "질문", collect(late)))
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+
+    assert "".join(early) == "".join(late) == "첫 조각 끝"
+
+
+def test_cancelled_caller_detaches_without_stopping_others():
+    runner = SlowRunner()
+
+    async def scenario():
+        leaving = asyncio.create_task(runner.execute("gemini", "질문"))
+        staying = asyncio.create_task(runner.execute("gemini", "질문"))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return await staying
+
+    result = asyncio.run(scenario())
+
+    assert result.success and runner.calls == 1
+    assert runner.stats["abandoned"] == 1 and runner.cancelled == 0
+
+
+def test_last_caller_leaving_cancels_execution():
+    runner = SlowRunner(delay=5)
+
+    async def scenario():
+        callers = [asyncio.create_task(runner.execute("gemini", "질문")) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        # 취소된 실행이 정리될 때까지 한 번 양보
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert runner.calls == 1 and runner.cancelled == 1
+    assert runner.stats["abandoned"] == 2 and not runner._inflight
@@ -0,0 +1,105 @@
+"""회로 차단기 상태 전환, 재시도 대상 분류, 열린 회로의 대기열 우회"""
+import asyncio
+import time
+
+from utils.admission import AdmissionController
+from utils.backend_runner import BackendRunner
+from utils.circuit_breaker import (
+    CIRCUIT_BREAKER_DEFAULTS,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerRegistry,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from utils.cli_runner import CLIRunResult
+from utils.response_cache import ResponseCache
+from utils.worker_pool import WorkerPoolManager
+
+
+def breaker(**overrides) -> CircuitBreaker:
+    return CircuitBreaker("gemini", {**CIRCUIT_BREAKER_DEFAULTS, "min_requests": 2, "open_seconds": 0.05,
+                                     **overrides})
+
+
+def test_breaker_opens_half_opens_and_closes():
+    b = breaker()
+    b.record(False)
+    assert b.state == CLOSED
+    b.record(False)
+    assert b.state == OPEN and not b.allow()
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert b.allow() and b.state == HALF_OPEN
+    # 시험 호출은 half_open_max_calls개만
+    assert not b.allow()
+    b.record(True)
+    assert b.state == CLOSED and b.allow()
+
+
+def test_failed_probe_reopens():
+    b = breaker()
+    b.record(False)
+    b.record(False)
+    asyncio.run(asyncio.sleep(0.06))
+    assert b.allow()
+    b.record(False)
+    assert b.state == OPEN and b.times_opened == 2
+
+
+def test_retry_classification():
+    retry = RetryPolicy(CIRCUIT_BREAKER_DEFAULTS["retry"])
+    for message in ("Error: 503 Service Unavailable", "HTTP 429", "status code: 502",
+                    "Rate limit exceeded", "model overloaded", "read ECONNRESET"):
+        assert retry.is_transient(message), message
+    for message in ("Error: prompt is longer than 500 characters", "line 504: syntax error",
+                    "invalid api key", "", None):
+        assert not retry.is_transient(message), message
+
+
+class StubRunner(BackendRunner):
+    def __init__(self, admission: AdmissionController, result: CLIRunResult):
+        super().__init__(WorkerPoolManager({"enabled": False}), ResponseCache({"enabled": False}),
+                         admission, BreakerRegistry(dict(CIRCUIT_BREAKER_DEFAULTS, retry={
+                             **CIRCUIT_BREAKER_DEFAULTS["retry"], "base_delay_seconds": 0})))
+        self.result = result
+        self.calls = 0
+
+    async def _run(self, ai, prompt, on_chunk):
+        self.calls += 1
+        return self.result
+
+
+def test_non_transient_error_is_not_retried():
+    failed = CLIRunResult(returncode=1, stdout="", stderr="Error: prompt is longer than 500 characters")
+    runner = StubRunner(AdmissionController({}), failed)
+
+    result = asyncio.run(runner.execute("gemini", "프롬프트", use_cache=False))
+
+    assert not result.success
+    assert runner.calls == 1 and runner.stats["retries"] == 0
+
+
+def test_transient_error_is_retried():
+    failed = CLIRunResult(returncode=1, stdout="", stderr="Error: 503 Service Unavailable")
+    runner = StubRunner(AdmissionController({}), failed)
+
+    asyncio.run(runner.execute("gemini", "프롬프트", use_cache=False))
+
+    assert runner.calls == CIRCUIT_BREAKER_DEFAULTS["retry"]["max_attempts"]
+
+
+def test_open_circuit_fails_without_waiting_for_a_slot():
+    admission = AdmissionController({"max_total": 1, "max_queue": 10, "max_queue_wait_seconds": 5})
+    runner = StubRunner(admission, CLIRunResult(returncode=0, stdout="ok", stderr=""))
+    runner.breakers.get("gemini")._open(time.monotonic())
+
+    async def scenario():
+        async with admission.slot("claude"):
+            return await asyncio.wait_for(runner.execute("gemini", "프롬프트", use_cache=False), 1)
+
+    result = asyncio.run(scenario())
+
+    assert "회로 차단" in result.error_text
+    assert runner.calls == 0 and admission.stats["queued"] == 0
@@ -0,0 +1,34 @@
+"""CLI 실행기: 큰 출력의 임시 파일 정리"""
+import asyncio
+import dataclasses
+import sys
+
+from utils import cli_runner
+from utils.cli_runner import default_limits, run_cli
+
+BIG_OUTPUT = [sys.executable, "-c", "import sys; sys.stdout.write('x' * 300000)"]
+
+
+def test_spill_file_is_removed_after_the_call(tmp_path):
+    limits = dataclasses.replace(default_limits(), spill_threshold_bytes=10_000, spill_directory=str(tmp_path))
+
+    result = asyncio.run(run_cli(BIG_OUTPUT, limits=limits))
+
+    assert result.success and result.partial
+    assert result.output_bytes == 300_000 and len(result.stdout) <= 10_000
+    assert "앞부분만" in result.result_text
+    assert list(tmp_path.iterdir()) == [] and not cli_runner._spill_files
+
+
+def test_full_output_reads_spilled_part_before_removing(tmp_path):
+    limits = dataclasses.replace(default_limits(), spill_threshold_bytes=10_000, spill_directory=str(tmp_path))
+
+    async def run():
+        process = await asyncio.create_subprocess_exec(*BIG_OUTPUT, stdout=asyncio.subprocess.PIPE,
+                                                       stderr=asyncio.subprocess.PIPE)
+        return await cli_runner.collect_process(process, 0.0, limits=limits, full_output=True)
+
+    result = asyncio.run(run())
+
+    assert result.stdout == "x" * 300_000 and not result.partial
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,106 @@
+"""요청 마감 시간: CLI 호출 제한 시간 계산, 마감 연장 금지, 태스크 전파"""
+import asyncio
+
+import pytest
+
+from utils import deadline
+from utils.admission import AdmissionController
+from utils.backend_runner import BackendRunner
+from utils.circuit_breaker import CIRCUIT_BREAKER_DEFAULTS, BreakerRegistry
+from utils.cli_runner import CLIRunResult
+from utils.response_cache import ResponseCache
+from utils.worker_pool import WorkerPoolManager
+
+
+@pytest.fixture
+def cli_seconds(monkeypatch):
+    monkeypatch.setattr(deadline, "settings", lambda: {"request_seconds": 900, "cli_seconds": 5})
+
+
+def test_call_timeout_is_cli_limit_without_deadline(cli_seconds):
+    assert deadline.remaining() is None
+    assert deadline.call_timeout() == 5
+
+
+def test_call_timeout_is_clamped_to_remaining_time(cli_seconds):
+    token = deadline.set_deadline(1)
+    try:
+        assert 0.9 < deadline.call_timeout() <= 1
+    finally:
+        deadline.reset_deadline(token)
+
+    token = deadline.set_deadline(60)
+    try:
+        assert deadline.call_timeout() == 5
+    finally:
+        deadline.reset_deadline(token)
+
+
+def test_nested_deadline_cannot_extend(cli_seconds):
+    outer = deadline.set_deadline(1)
+    try:
+        inner = deadline.set_deadline(60)
+        assert deadline.remaining() <= 1
+        deadline.reset_deadline(inner)
+
+        inner = deadline.set_deadline(0.5)
+        assert deadline.remaining() <= 0.5
+        deadline.reset_deadline(inner)
+        assert 0.5 < deadline.remaining() <= 1
+    finally:
+        deadline.reset_deadline(outer)
+    assert deadline.remaining() is None
+
+
+def test_deadline_reaches_child_tasks_and_expires():
+    async def child():
+        return deadline.remaining(), deadline.expired()
+
+    async def scenario():
+        token = deadline.set_deadline(0.01)
+        try:
+            await asyncio.sleep(0.02)
+            return await asyncio.create_task(child())
+        finally:
+            deadline.reset_deadline(token)
+
+    left, expired = asyncio.run(scenario())
+
+    assert left == 0.0 and expired
+
+
+class HangingRunner(BackendRunner):
+    def __init__(self):
+        super().__init__(WorkerPoolManager({"enabled": False}), ResponseCache({"enabled": False}),
+                         AdmissionController({}), BreakerRegistry(CIRCUIT_BREAKER_DEFAULTS))
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _run(self, ai, prompt, on_chunk):
+        self.calls += 1
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return CLIRunResult(returncode=0, stdout="늦은 응답", stderr="")
+
+
+def test_runner_stops_waiting_at_deadline(cli_seconds):
+    runner = HangingRunner()
+
+    async def scenario():
+        token = deadline.set_deadline(0.05)
+        try:
+            result = await runner.execute("gemini", "질문", use_cache=False)
+            skipped = await runner.execute("gemini", "다른 질문", use_cache=False)
+        finally:
+            deadline.reset_deadline(token)
+        await asyncio.sleep(0)
+        return result, skipped
+
+    result, skipped = asyncio.run(scenario())
+
+    assert "시간 초과" in result.error_text and "마감 시간" in skipped.error_text
+    assert runner.calls == 1 and runner.cancelled == 1
+    assert runner.stats["timed_out"] == 2
@@ -0,0 +1,47 @@
+"""Streamable HTTP 앱으로 tools/list, tools/call 실행 (localhost 임시 포트)"""
+import asyncio
+import importlib
+
+import pytest
+
+uvicorn = pytest.importorskip("uvicorn")
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from utils.http_transport import build_app
+
+CASES = {
+    "servers.mcp_ai_orchestrator": ("execute_gemini", {"prompt": "HTTP 테스트", "no_cache": True}),
+    "servers.collaborative_ai_orchestrator": ("get_collaboration_stats", {}),
+}
+
+
+async def http_session(server, tool_name, arguments):
+    app = build_app(server, "/mcp")
+    http = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(http.serve())
+    try:
+        while not http.started:
+            await asyncio.sleep(0.01)
+        port = http.servers[0].sockets[0].getsockname()[1]
+        async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                tools = await session.list_tools()
+                result = await session.call_tool(tool_name, arguments)
+        return tools, result
+    finally:
+        http.should_exit = True
+        await serving
+
+
+@pytest.mark.parametrize("module_name", sorted(CASES))
+def test_list_and_call_over_http(module_name):
+    module = importlib.import_module(module_name)
+    tool_name, arguments = CASES[module_name]
+
+    tools, result = asyncio.run(asyncio.wait_for(http_session(module.server, tool_name, arguments), 60))
+
+    assert tool_name in {tool.name for tool in tools.tools}
+    assert not result.isError
+    assert not result.content[0].text.startswith("ERROR")
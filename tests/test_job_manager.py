@@ -0,0 +1,115 @@
+"""백그라운드 작업 표: 진행 기록, 취소, 동시 작업 제한, 보관 정리, 마감 시간 분리"""
+import asyncio
+
+import pytest
+
+from utils import deadline
+from utils.job_manager import JOB_DEFAULTS, JobLimitError, JobManager
+
+
+def manager(**overrides) -> JobManager:
+    return JobManager({**JOB_DEFAULTS, **overrides})
+
+
+def test_job_records_stages_partial_output_and_result():
+    jobs = manager(max_partial_chars=5)
+
+    async def run(progress):
+        await progress.stage("1단계")
+        await progress.partial("첫 번째 출력", "draft")
+        await progress.stage("2단계")
+        return {"answer": 42}
+
+    async def scenario():
+        job = jobs.submit("test", "작업", run)
+        assert jobs.get(job.job_id).status == "running"
+        await asyncio.sleep(0.01)
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert job.status == "succeeded" and job.result == {"answer": 42}
+    assert job.status_dict()["completed_stages"] == ["1단계", "2단계"]
+    assert job.partial == {"draft": "번째 출력"}
+    assert jobs.stats["succeeded"] == 1
+
+
+def test_failed_and_cancelled_jobs():
+    jobs = manager()
+
+    async def fail(progress):
+        raise RuntimeError("실패 원인")
+
+    async def hang(progress):
+        await asyncio.sleep(60)
+
+    async def scenario():
+        failed = jobs.submit("test", "실패", fail)
+        hanging = jobs.submit("test", "대기", hang)
+        await asyncio.sleep(0.01)
+        assert jobs.cancel(hanging.job_id)
+        await asyncio.sleep(0.01)
+        assert not jobs.cancel(hanging.job_id)
+        return failed, hanging
+
+    failed, hanging = asyncio.run(scenario())
+
+    assert failed.status == "failed" and failed.error == "실패 원인"
+    assert hanging.status == "cancelled" and hanging.finished_at is not None
+
+
+def test_active_job_limit_rejects_submission():
+    jobs = manager(max_active_jobs=1)
+
+    async def hang(progress):
+        await asyncio.sleep(60)
+
+    async def scenario():
+        jobs.submit("test", "첫 번째", hang)
+        with pytest.raises(JobLimitError):
+            jobs.submit("test", "두 번째", hang)
+        await jobs.close()
+
+    asyncio.run(scenario())
+
+    assert jobs.stats["rejected"] == 1 and jobs.stats["cancelled"] == 1
+
+
+def test_finished_jobs_are_pruned_by_count():
+    jobs = manager(max_finished_jobs=2)
+
+    async def done(progress):
+        return None
+
+    async def scenario():
+        ids = []
+        for i in range(3):
+            ids.append(jobs.submit("test", f"작업 {i}", done).job_id)
+            await asyncio.sleep(0.01)
+        return ids
+
+    first, second, third = asyncio.run(scenario())
+
+    assert jobs.get(first) is None
+    assert jobs.get(second) is not None and jobs.get(third) is not None
+    assert jobs.stats["expired"] == 1
+
+
+def test_job_does_not_inherit_request_deadline():
+    jobs = manager()
+    seen = []
+
+    async def run(progress):
+        seen.append(deadline.remaining())
+
+    async def scenario():
+        token = deadline.set_deadline(1)
+        try:
+            jobs.submit("test", "작업", run)
+        finally:
+            deadline.reset_deadline(token)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+
+    assert seen == [None]
@@ -0,0 +1,97 @@
+"""mcp.Server 기반 서버의 tools/list, tools/call 핸들러를 프로세스 안에서 실행"""
+import asyncio
+import importlib
+import json
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, ListToolsRequest
+
+ALL_SERVERS = [
+    "servers.collaborative_ai_orchestrator",
+    "servers.mcp_ai_orchestrator",
+    "servers.simple_test_server",
+    "servers.working_collaborative_server",
+]
+
+SERVERS = {
+    "servers.collaborative_ai_orchestrator": ("get_collaboration_stats", {}),
+    "servers.mcp_ai_orchestrator": ("execute_gemini", {"prompt": "테스트", "no_cache": True, "timeout_seconds": 30}),
+    "servers.working_collaborative_server": ("chat_with_ai", {"ai": "gemini", "message": "테스트", "no_cache": True}),
+}
+
+
+def list_tools(server):
+    result = asyncio.run(server.request_handlers[ListToolsRequest](ListToolsRequest(method="tools/list")))
+    return result.root.tools
+
+
+def call_tool(server, name, arguments):
+    request = CallToolRequest(method="tools/call", params=CallToolRequestParams(name=name, arguments=arguments))
+    return asyncio.run(server.request_handlers[CallToolRequest](request)).root
+
+
+@pytest.mark.parametrize("module_name", sorted(SERVERS))
+def test_list_and_call_tool(module_name):
+    module = importlib.import_module(module_name)
+    tool_name, arguments = SERVERS[module_name]
+
+    tools = list_tools(module.server)
+    assert tool_name in {tool.name for tool in tools}
+
+    result = call_tool(module.server, tool_name, arguments)
+    assert not result.isError
+    assert result.content and not result.content[0].text.startswith("ERROR")
+
+
+def sample_value(schema):
+    """스키마의 필수 항목만 채운 예시 값"""
+    if schema.get("enum"):
+        return schema["enum"][0]
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return {name: sample_value(schema["properties"][name]) for name in schema.get("required", [])}
+    if kind == "array":
+        return [sample_value(schema.get("items", {}))]
+    return {"string": "테스트", "number": 1, "integer": 1, "boolean": False}[kind]
+
+
+@pytest.mark.parametrize("module_name", ALL_SERVERS)
+def test_every_tool_is_callable(module_name):
+    module = importlib.import_module(module_name)
+    for tool in list_tools(module.server):
+        result = call_tool(module.server, tool.name, sample_value(tool.inputSchema))
+        # 핸들러 시그니처가 맞지 않으면 mcp가 예외를 isError 결과로 바꿔 돌려줌
+        assert not result.isError, (tool.name, result.content)
+        assert result.content, tool.name
+
+
+def test_call_tool_reads_arguments():
+    module = importlib.import_module("servers.collaborative_ai_orchestrator")
+
+    result = call_tool(module.server, "get_job_status", {"job_id": "missing-job"})
+
+    assert "missing-job" in result.content[0].text
+    stats = call_tool(module.server, "get_collaboration_stats", {})
+    assert "jobs" in json.loads(stats.content[0].text)
+
+
+@pytest.mark.parametrize("workflow", ["../configs/workflows/fast", "/etc/passwd", "fast.json", "missing"])
+def test_workflow_must_be_listed_name(workflow):
+    module = importlib.import_module("servers.collaborative_ai_orchestrator")
+    for tool in ("collaborative_task", "submit_collaborative_task"):
+        result = call_tool(module.server, tool, {"task": "작업", "workflow": workflow})
+        assert result.content[0].text.startswith("ERROR: 워크플로우 설정 오류")
+
+
+def test_hedge_is_ignored_with_force_ai(monkeypatch):
+    module = importlib.import_module("servers.mcp_ai_orchestrator")
+
+    async def no_hedge(*args, **kwargs):
+        raise AssertionError("force_ai가 있으면 헤지 요청을 보내면 안 됩니다")
+
+    monkeypatch.setattr(module.orchestrator.cli_executor, "execute_hedged", no_hedge)
+    result = call_tool(module.server, "execute_task",
+                       {"task": "테스트", "force_ai": "claude", "hedge": True, "no_cache": True})
+
+    assert not result.isError
+    assert json.loads(result.content[0].text)["assigned_to"] == "claude"
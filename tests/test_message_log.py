@@ -0,0 +1,40 @@
+"""메시지 로그 본문 저장소: 중복 제거와 한도 초과로 버려진 본문"""
+from utils.message_log import BodyStore
+
+BODY = "본문 " * 200
+
+
+def test_duplicate_body_is_stored_once():
+    store = BodyStore(max_memory_bytes=1024 * 1024)
+    key = store.put(BODY)
+
+    assert store.put(BODY) == key
+    assert store.get(key) == BODY
+    assert store.stats["stored"] == 1 and store.stats["deduplicated"] == 1
+
+
+def test_dropped_body_is_not_deduplicated():
+    size = len(BODY.encode("utf-8"))
+    store = BodyStore(max_memory_bytes=size - 1)
+
+    key = store.put(BODY)
+    assert store.get(key) is None
+    store.put(BODY)
+
+    assert store.stats["deduplicated"] == 0
+    assert store.stats["stored"] == 2 and store.stats["dropped"] == 2
+
+
+def test_dropped_body_is_stored_again():
+    other = "다른 " * 200
+    store = BodyStore(max_memory_bytes=len(BODY.encode("utf-8")) + 10)
+
+    key = store.put(BODY)
+    store.put(other)
+    assert store.get(key) is None
+
+    # 이전 레코드가 아직 참조하고 있어도 새 put은 읽을 수 있는 본문을 돌려줘야 함
+    assert store.put(BODY) == key
+    assert store.get(key) == BODY
+    store.release(key)
+    assert store.get(key) == BODY
@@ -0,0 +1,42 @@
+"""프롬프트 토큰 예산: 생략된 토큰 수 보고와 노드별 예산"""
+import asyncio
+
+from utils.prompt_budget import PROMPT_BUDGET_DEFAULTS, PromptBudget
+from utils.workflow_engine import WorkflowEngine, WorkflowGraph
+
+LONG = "긴 결과 문장입니다. " * 3000
+
+
+def test_render_reports_elided_tokens():
+    budget = PromptBudget(PROMPT_BUDGET_DEFAULTS)
+    values = {"task": "작업", "a": LONG, "b": "짧은 입력"}
+
+    rendered = budget.render("{task}\n{a}\n{b}", values, "claude", ["a", "b"])
+    assert rendered.compacted and rendered.elided_tokens > 0
+    assert "중략" in rendered.text
+
+    full = budget.render("{task}\n{a}\n{b}", values, "claude", ["a", "b"], max_tokens=100_000)
+    assert not full.compacted and full.text == "작업\n" + LONG + "\n짧은 입력"
+
+
+def test_run_reports_compaction():
+    graph = WorkflowGraph.from_dict({
+        "nodes": [
+            {"id": "draft", "backend": "gemini", "prompt": "{task}"},
+            {"id": "small", "backend": "claude", "inputs": ["draft"], "prompt": "{draft}"},
+            {"id": "large", "backend": "claude", "inputs": ["draft"], "prompt": "{draft}",
+             "max_prompt_tokens": 100_000}
+        ],
+        "result": "large"
+    })
+
+    async def execute(backend, prompt, on_chunk=None):
+        return {"success": True, "result": LONG, "ai": backend}
+
+    run = asyncio.run(WorkflowEngine(execute, PromptBudget(PROMPT_BUDGET_DEFAULTS)).run(graph, {"task": "작업"}))
+    compaction = run.prompt_compaction()
+
+    assert compaction["compacted"]
+    assert list(compaction["nodes"]) == ["small"]
+    assert compaction["elided_tokens"] == run.results["small"].elided_tokens > 0
+    assert run.results["large"].prompt == LONG
@@ -0,0 +1,101 @@
+"""응답 캐시: 적중, TTL 만료, 캐시 건너뛰기"""
+import asyncio
+
+from utils.admission import AdmissionController
+from utils.backend_runner import BackendRunner
+from utils.circuit_breaker import CIRCUIT_BREAKER_DEFAULTS, BreakerRegistry
+from utils.cli_runner import CLIRunResult
+from utils.response_cache import ResponseCache, cache_key
+from utils.worker_pool import WorkerPoolManager
+
+
+def cache(**overrides) -> ResponseCache:
+    return ResponseCache({"enabled": True, "ttl_seconds": 60, **overrides})
+
+
+class CountingRunner(BackendRunner):
+    """CLI 대신 호출 횟수를 번호로 돌려주는 실행기"""
+
+    def __init__(self, response_cache: ResponseCache):
+        super().__init__(WorkerPoolManager({"enabled": False}), response_cache,
+                         AdmissionController({}), BreakerRegistry(CIRCUIT_BREAKER_DEFAULTS))
+        self.calls = 0
+
+    async def _run(self, ai, prompt, on_chunk):
+        self.calls += 1
+        return CLIRunResult(returncode=0, stdout=f"응답 {self.calls}", stderr="")
+
+
+def test_key_ignores_trailing_whitespace_but_not_backend():
+    assert cache_key("gemini", "질문  \r\n\n") == cache_key("gemini", "질문")
+    assert cache_key("gemini", "질문") != cache_key("claude", "질문")
+    assert cache_key("claude", "질문", "claude -p") != cache_key("claude", "질문", "claude")
+
+
+def test_memory_hit_and_miss():
+    c = cache()
+
+    async def scenario():
+        assert await c.get("키") is None
+        await c.put("키", "gemini", "응답")
+        return await c.get("키")
+
+    entry = asyncio.run(scenario())
+
+    assert entry.text == "응답" and entry.backend == "gemini"
+    assert c.stats["memory_hits"] == 1 and c.stats["misses"] == 1 and c.stats["stores"] == 1
+
+
+def test_entry_expires_after_ttl():
+    c = cache(ttl_seconds=0.05)
+
+    async def scenario():
+        await c.put("키", "gemini", "응답")
+        fresh = await c.get("키")
+        await asyncio.sleep(0.06)
+        return fresh, await c.get("키")
+
+    fresh, expired = asyncio.run(scenario())
+
+    assert fresh is not None and expired is None
+    assert c.stats["expired"] == 1 and len(c.memory) == 0
+
+
+def test_disk_hit_survives_new_cache(tmp_path):
+    settings = {"disk": {"enabled": True, "path": str(tmp_path / "cache.sqlite3"), "max_entries": 10}}
+    first = cache(**settings)
+    asyncio.run(first.put("키", "claude", "응답"))
+    first.close()
+
+    second = cache(**settings)
+    entry = asyncio.run(second.get("키"))
+    second.close()
+
+    assert entry.text == "응답"
+    assert second.stats["disk_hits"] == 1 and len(second.memory) == 1
+
+
+def test_runner_serves_hits_and_bypass_refreshes():
+    runner = CountingRunner(cache())
+
+    async def scenario():
+        first = await runner.execute("gemini", "질문")
+        hit = await runner.execute("gemini", "질문")
+        bypassed = await runner.execute("gemini", "질문", use_cache=False)
+        refreshed = await runner.execute("gemini", "질문")
+        return first, hit, bypassed, refreshed
+
+    first, hit, bypassed, refreshed = asyncio.run(scenario())
+
+    assert first.stdout == hit.stdout == "응답 1" and hit.cached
+    assert bypassed.stdout == "응답 2" and not bypassed.cached
+    # 건너뛴 호출의 새 응답으로 캐시가 갱신됨
+    assert refreshed.stdout == "응답 2" and refreshed.cached
+    assert runner.calls == 2 and runner.cache.stats["bypassed"] == 1
+
+
+def test_large_response_is_not_stored():
+    c = cache(max_entry_bytes=8)
+    asyncio.run(c.put("키", "gemini", "여덟 바이트를 넘는 응답"))
+
+    assert c.stats["stores"] == 0 and len(c.memory) == 0
@@ -0,0 +1,101 @@
+"""경량 JSON-RPC 서버: 메서드 분기와 고정 응답, 요청 취소(notifications/cancelled), tools/call 마감 시간"""
+import asyncio
+import json
+
+from utils import deadline
+from utils.rpc_server import RPCServer
+
+
+def slow_server():
+    server = RPCServer("test-server", "1.0.0")
+    events = []
+
+    @server.tool("slow", "오래 걸리는 도구")
+    async def slow(arguments):
+        events.append("started")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return "끝"
+
+    @server.tool("remaining", "남은 마감 시간", {"timeout_seconds": {"type": "number"}})
+    def remaining(arguments):
+        return json.dumps(deadline.remaining())
+
+    return server, events
+
+
+def call(request_id, name, arguments=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments or {}}}
+
+
+def test_cancelled_notification_cancels_request():
+    server, events = slow_server()
+
+    async def scenario():
+        request = asyncio.create_task(server.handle(call(7, "slow")))
+        await asyncio.sleep(0.01)
+        notification = {"jsonrpc": "2.0", "method": "notifications/cancelled",
+                        "params": {"requestId": 7, "reason": "사용자 취소"}}
+        assert await server.handle(notification) is None
+        await asyncio.gather(request, return_exceptions=True)
+        return request
+
+    request = asyncio.run(scenario())
+
+    assert request.cancelled()
+    assert events == ["started", "cancelled"]
+    assert not server._requests
+
+
+def test_cancel_for_unknown_request_is_ignored():
+    server, _ = slow_server()
+    notification = {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 99}}
+
+    assert asyncio.run(server.handle(notification)) is None
+
+
+def test_tool_call_runs_within_deadline():
+    server, _ = slow_server()
+
+    async def scenario():
+        limited = json.loads(await server.handle(call(1, "remaining", {"timeout_seconds": 5})))
+        default = json.loads(await server.handle(call(2, "remaining")))
+        return limited, default, deadline.remaining()
+
+    limited, default, after = asyncio.run(scenario())
+
+    assert 4 < float(limited["result"]["content"][0]["text"]) <= 5
+    assert float(default["result"]["content"][0]["text"]) > 5
+    assert after is None
+
+
+def test_dispatch_table_and_cached_responses():
+    server, _ = slow_server()
+
+    @server.method("custom/echo")
+    def echo(params):
+        return params
+
+    server._build_cache()
+
+    async def scenario():
+        listed = json.loads(await server.handle({"jsonrpc": "2.0", "id": 1, "method": "tools/list"}))
+        echoed = json.loads(await server.handle({"jsonrpc": "2.0", "id": "a", "method": "custom/echo",
+                                                 "params": {"x": 1}}))
+        unknown = json.loads(await server.handle({"jsonrpc": "2.0", "id": 2, "method": "missing"}))
+        unknown_tool = json.loads(await server.handle(call(3, "missing")))
+        notification = await server.handle({"jsonrpc": "2.0", "method": "missing"})
+        return listed, echoed, unknown, unknown_tool, notification
+
+    listed, echoed, unknown, unknown_tool, notification = asyncio.run(scenario())
+
+    assert [tool["name"] for tool in listed["result"]["tools"]] == ["slow", "remaining"]
+    assert listed["result"]["tools"][1]["inputSchema"]["properties"] == {"timeout_seconds": {"type": "number"}}
+    assert echoed == {"jsonrpc": "2.0", "id": "a", "result": {"x": 1}}
+    assert unknown["id"] == 2 and unknown["error"]["code"] == -32601
+    assert "알 수 없는 도구" in unknown_tool["result"]["content"][0]["text"]
+    assert notification is None
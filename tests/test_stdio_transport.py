@@ -0,0 +1,75 @@
+"""stdio 전송: 요청별 동시 처리, 동시 처리 상한, 큰 줄과 처리 오류 격리 (실제 파이프로 서버 실행)"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+SERVER = """
+import asyncio, sys
+sys.path.insert(0, sys.argv[1])
+from utils.rpc_server import RPCServer
+from utils.stdio_transport import StdioTransport
+
+server = RPCServer("test-server", "1.0.0")
+
+@server.tool("sleep", "seconds초 뒤 응답")
+async def sleep(arguments):
+    await asyncio.sleep(arguments["seconds"])
+    return f"slept {arguments['seconds']}"
+
+@server.tool("fail", "항상 실패")
+def fail(arguments):
+    raise RuntimeError("도구 오류")
+
+asyncio.run(server.serve(StdioTransport(max_line_bytes=1024, max_in_flight=int(sys.argv[2]))))
+"""
+
+
+def call(request_id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+def exchange(messages, max_in_flight=8):
+    """메시지를 한 번에 보내고 (응답 목록, 소요 시간) 반환"""
+    lines = [m if isinstance(m, str) else json.dumps(m) for m in messages]
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", SERVER, SRC, str(max_in_flight)],
+                               input="\n".join(lines) + "\n", capture_output=True, text=True, timeout=30)
+    elapsed = time.perf_counter() - started
+    assert completed.returncode == 0, completed.stderr
+    return [json.loads(line) for line in completed.stdout.splitlines()], elapsed
+
+
+def test_fast_request_is_not_blocked_by_slow_one():
+    responses, _ = exchange([call(1, "sleep", seconds=0.5), call(2, "sleep", seconds=0),
+                             {"jsonrpc": "2.0", "id": 3, "method": "tools/list"}])
+
+    # 끝나는 순서대로 응답하고 id로 구분
+    assert [r["id"] for r in responses][-1] == 1
+    assert sorted(r["id"] for r in responses) == [1, 2, 3]
+
+
+def test_in_flight_cap_serialises_requests():
+    _, parallel = exchange([call(i, "sleep", seconds=0.4) for i in range(3)], max_in_flight=3)
+    responses, serial = exchange([call(i, "sleep", seconds=0.4) for i in range(3)], max_in_flight=1)
+
+    assert [r["id"] for r in responses] == [0, 1, 2]
+    assert serial - parallel > 0.4
+
+
+def test_oversized_line_and_handler_error_do_not_stop_server():
+    responses, _ = exchange([
+        json.dumps(call(1, "sleep", seconds=0, padding="x" * 2000)),
+        "이것은 JSON이 아님",
+        call(2, "fail"),
+        call(3, "sleep", seconds=0)
+    ])
+
+    by_id = {r["id"]: r for r in responses}
+    assert set(by_id) == {2, 3}
+    assert by_id[2]["error"]["message"] == "도구 오류"
+    assert by_id[3]["result"]["content"][0]["text"] == "slept 0"
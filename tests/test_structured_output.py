@@ -0,0 +1,67 @@
+"""구조화된 출력 추출: 코드 블록, 작은따옴표/따옴표 없는 키 보정, 스키마 검증, 점수 추출"""
+import pytest
+
+from utils.structured_output import SchemaError, coerce, extract_number, extract_structured, loads_lenient
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "better_ai": {"type": "string", "enum": ["gemini", "claude"]},
+        "quality_score": {"type": "number", "minimum": 1, "maximum": 10}
+    },
+    "required": ["better_ai"]
+}
+
+
+def test_fenced_block_and_strip():
+    text = '분석입니다.\n```json\n{"better_ai": "claude", "quality_score": "8"}\n```\n끝.'
+
+    match = extract_structured(text, SCHEMA)
+
+    assert match.data == {"better_ai": "claude", "quality_score": 8.0}
+    assert match.strip(text) == "분석입니다.\n끝."
+
+
+def test_single_quotes_bare_keys_and_trailing_comma():
+    text = "제 의견은 {better_ai: 'Claude', 'reason': 'it\\'s \"good\"', quality_score: 9,} 입니다"
+
+    match = extract_structured(text, SCHEMA)
+
+    assert match.data["better_ai"] == "claude"
+    assert match.data["reason"] == 'it\'s "good"'
+    assert match.data["quality_score"] == 9
+
+
+def test_comments_python_literals_and_smart_quotes():
+    snippet = '{“better_ai”: “gemini”, // 선택\n "final": True, "note": None}'
+
+    assert loads_lenient(snippet) == {"better_ai": "gemini", "final": True, "note": None}
+
+
+def test_skips_candidates_that_fail_schema():
+    text = '예시: {"x": 1} 그리고 결과: {"better_ai": "gemini"}'
+
+    match = extract_structured(text, SCHEMA)
+
+    assert match.data == {"better_ai": "gemini"}
+    assert text[match.start:match.end] == '{"better_ai": "gemini"}'
+
+
+def test_no_match_returns_none():
+    assert extract_structured("JSON이 없는 응답", SCHEMA) is None
+    assert extract_structured('{"better_ai": "둘 다"}', SCHEMA) is None
+    assert extract_structured('{"better_ai": "claude", "quality_score": 11}', SCHEMA) is None
+
+
+def test_enum_with_description_needs_single_candidate():
+    schema = SCHEMA["properties"]["better_ai"]
+    assert coerce("Claude (코드 작성에 강함)", schema) == "claude"
+    with pytest.raises(SchemaError):
+        coerce("gemini와 claude 모두", schema)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("8", 8), ("8.5/10", 8.5), ("점수: **9**점", 9), ("10점 만점에 7점", 7), ("1-10 중 6", 6), ("없음", None)
+])
+def test_extract_number(text, expected):
+    assert extract_number(text, 1, 10) == expected
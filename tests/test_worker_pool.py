@@ -0,0 +1,69 @@
+"""사전 기동 워커 풀: stream-json 워커의 요청별 재기동과 긴 출력 줄 처리"""
+import asyncio
+import dataclasses
+import sys
+from pathlib import Path
+
+from utils.cli_runner import default_limits
+from utils.worker_pool import WorkerPool
+
+FAKE_BACKEND = str(Path(__file__).resolve().parents[1] / "src" / "tools" / "fake_backend.py")
+STREAM_JSON = ["-p", "--input-format", "stream-json", "--output-format", "stream-json"]
+
+
+def emit_result(char, size, lines=1):
+    """stdin 한 줄을 읽고 char * size 텍스트로 assistant 이벤트 lines개와 result 이벤트를 출력하는 명령"""
+    script = (
+        "import json, sys; sys.stdin.readline(); text = sys.argv[1] * int(sys.argv[2])\n"
+        "event = {'type': 'assistant', 'message': {'content': [{'type': 'text', 'text': text}]}}\n"
+        "for _ in range(int(sys.argv[3])): print(json.dumps(event))\n"
+        "print(json.dumps({'type': 'result', 'subtype': 'success', 'result': text}))"
+    )
+    return [sys.executable, "-c", script, char, str(size), str(lines)]
+
+
+async def run_requests(pool, prompts, on_chunk=None):
+    await pool.start()
+    try:
+        return [await pool.execute(prompt, on_chunk) for prompt in prompts]
+    finally:
+        await pool.close()
+
+
+def test_stream_json_worker_serves_one_request():
+    pool = WorkerPool("claude", [sys.executable, FAKE_BACKEND, "claude", *STREAM_JSON],
+                      protocol="stream-json", size=1)
+    results = asyncio.run(run_requests(pool, ["첫 번째 요청", "두 번째 요청"]))
+
+    assert all(result.success and result.stdout for result in results)
+    # 요청마다 새 프로세스(새 대화)를 쓰고, 다음 요청은 미리 보충된 워커를 사용
+    assert pool.stats["retired"] == 2
+    assert pool.stats["warm_hits"] >= 1
+
+
+def test_long_event_line_is_read_within_limits():
+    text = "가" * 200_000
+    chunks = []
+
+    async def on_chunk(chunk):
+        chunks.append(chunk)
+
+    pool = WorkerPool("claude", emit_result("가", 200_000, lines=2), protocol="stream-json", size=1)
+    [result] = asyncio.run(run_requests(pool, ["긴 출력"], on_chunk))
+
+    assert result.success
+    assert result.output_bytes == len(text.encode("utf-8"))
+    assert result.stdout == text and not result.partial
+    assert chunks == [text, text]
+
+
+def test_oversized_output_fails_only_that_request(monkeypatch):
+    small = dataclasses.replace(default_limits(), max_output_bytes=100_000)
+    monkeypatch.setattr("utils.worker_pool.default_limits", lambda: small)
+
+    pool = WorkerPool("claude", emit_result("x", 200_000), protocol="stream-json", size=1)
+    [result] = asyncio.run(run_requests(pool, ["너무 긴 출력"]))
+
+    assert not result.success
+    assert "100000" in result.error
+    assert pool.stats["failed_requests"] == 1
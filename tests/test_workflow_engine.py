@@ -0,0 +1,198 @@
+"""워크플로우 엔진: 실행 순서, extract 대체 호출, 예측 실행"""
+import asyncio
+
+import pytest
+
+from utils.prompt_budget import PROMPT_BUDGET_DEFAULTS, PromptBudget
+from utils.workflow_engine import (
+    SpeculationBudget,
+    WorkflowConfigError,
+    WorkflowEngine,
+    WorkflowGraph,
+    load_workflow,
+)
+
+SPECULATION = {"enabled": True, "max_extra_calls_per_hour": 0}
+
+
+def diamond_graph() -> WorkflowGraph:
+    return WorkflowGraph.from_dict({
+        "nodes": [
+            {"id": "merge", "backend": "claude", "inputs": ["left", "right"], "prompt": "합치기 {left} {right}"},
+            {"id": "right", "backend": "claude", "inputs": ["root"], "prompt": "오른쪽 {root}"},
+            {"id": "left", "backend": "gemini", "inputs": ["root"], "prompt": "왼쪽 {root}"},
+            {"id": "root", "backend": "gemini", "prompt": "{task}"}
+        ],
+        "result": "merge"
+    })
+
+
+def test_topological_order_follows_inputs():
+    assert diamond_graph().topological_order() == ["root", "left", "right", "merge"]
+    assert diamond_graph().critical_path_length() == 3
+
+
+def test_cycle_and_unknown_input_are_rejected():
+    with pytest.raises(WorkflowConfigError):
+        WorkflowGraph.from_dict({"nodes": [
+            {"id": "a", "backend": "gemini", "inputs": ["b"], "prompt": "{b}"},
+            {"id": "b", "backend": "gemini", "inputs": ["a"], "prompt": "{a}"}
+        ], "result": "a"})
+    with pytest.raises(WorkflowConfigError):
+        WorkflowGraph.from_dict({"nodes": [
+            {"id": "a", "backend": "gemini", "inputs": ["missing"], "prompt": "{missing}"}
+        ], "result": "a"})
+
+
+def test_independent_nodes_run_in_parallel_after_their_inputs():
+    async def execute(backend, prompt, on_chunk=None):
+        await asyncio.sleep(0.05)
+        return {"success": True, "result": prompt, "ai": backend}
+
+    _, run = run_graph(diamond_graph(), execute)
+    root, left, right, merge = (run.results[n] for n in ("root", "left", "right", "merge"))
+
+    assert run.final_result == "합치기 왼쪽 작업 오른쪽 작업"
+    assert left.started_at >= root.finished_at and right.started_at >= root.finished_at
+    assert merge.started_at >= max(left.finished_at, right.finished_at)
+    # left와 right는 서로 기다리지 않음
+    assert left.started_at < right.finished_at and right.started_at < left.finished_at
+
+def author_graph() -> WorkflowGraph:
+    return WorkflowGraph.from_dict({
+        "nodes": [
+            {"id": "analysis", "backend": "gemini", "prompt": "분석: {task}",
+             "output": {"type": "text", "schema": {
+                 "type": "object",
+                 "properties": {"better_ai": {"type": "string"}},
+                 "required": ["better_ai"]
+             }}},
+            {"id": "author", "backend": "gemini", "inputs": ["analysis"], "prompt": "결정: {analysis}",
+             "extract": {"from": "analysis", "field": "better_ai"},
+             "output": {"type": "choice", "choices": ["claude", "gemini"], "default": "gemini"}}
+        ],
+        "result": "author"
+    })
+
+
+def run_graph(graph: WorkflowGraph, execute, speculation=None):
+    engine = WorkflowEngine(execute, PromptBudget(PROMPT_BUDGET_DEFAULTS),
+                            SpeculationBudget(speculation or {"enabled": False, "max_extra_calls_per_hour": 0}))
+    return engine, asyncio.run(engine.run(graph, {"task": "작업"}))
+
+
+def scripted(replies):
+    """프롬프트 접두어별 응답을 돌려주는 가짜 execute (호출한 프롬프트를 calls에 기록)"""
+    calls = []
+
+    async def execute(backend, prompt, on_chunk=None):
+        calls.append(prompt)
+        text = next(reply for prefix, reply in replies.items() if prompt.startswith(prefix))
+        return {"success": True, "result": text, "ai": backend}
+
+    return execute, calls
+
+
+def test_extract_uses_matching_choice_without_call():
+    execute, calls = scripted({"분석": '```json\n{"better_ai": "claude"}\n```'})
+    engine, run = run_graph(author_graph(), execute)
+
+    assert run.results["author"].value == "claude"
+    assert run.results["author"].extracted_from == "analysis"
+    assert len(calls) == 1 and engine.stats["extracted"] == 1
+
+
+def test_invalid_extracted_choice_falls_back_to_call():
+    execute, calls = scripted({"분석": '{"better_ai": "둘 다"}', "결정": "claude가 작성"})
+    engine, run = run_graph(author_graph(), execute)
+
+    assert run.results["author"].value == "claude"
+    assert run.results["author"].extracted_from is None
+    assert len(calls) == 2 and engine.stats["extraction_fallbacks"] == 1
+
+
+def test_default_only_after_fallback_call_fails():
+    execute, calls = scripted({"분석": '{"better_ai": "둘 다"}', "결정": "모르겠습니다"})
+    engine, run = run_graph(author_graph(), execute)
+
+    assert run.results["author"].value == "gemini"
+    assert len(calls) == 2
+
+
+def collaborative_execute(better_ai: str):
+    """기본 워크플로우용 가짜 백엔드: 결정 호출은 빠르고 초안은 느림 (초안 시작/취소를 기록)"""
+    events = []
+
+    async def execute(backend, prompt, on_chunk=None, **options):
+        if "이 작업에 대해 분석해주세요" in prompt:
+            return {"success": True, "result": f'{{"analysis": "분석", "better_ai": "{better_ai}"}}', "ai": backend}
+        if "누가 초안을 작성해야 할지" in prompt:
+            await asyncio.sleep(0.05)
+            return {"success": True, "result": "claude", "ai": backend}
+        if "이 토론을 바탕으로" in prompt:
+            events.append(("draft_started", backend))
+            try:
+                await asyncio.sleep(0.3)
+            except asyncio.CancelledError:
+                events.append(("draft_cancelled", backend))
+                raise
+            return {"success": True, "result": f"{backend} 초안", "ai": backend}
+        return {"success": True, "result": '7\n```json\n{"quality_score": 7}\n```', "ai": backend}
+
+    return execute, events
+
+
+def test_speculation_runs_both_drafts_while_author_call_is_pending():
+    execute, events = collaborative_execute("둘 다")
+    engine, run = run_graph(load_workflow("collaborative"), execute, SPECULATION)
+
+    assert ("draft_started", "claude") in events and ("draft_started", "gemini") in events
+    assert events[-1] == ("draft_cancelled", "gemini")
+    assert run.results["draft_author"].extracted_from is None
+    assert run.results["draft"].backend == "claude" and run.results["draft"].text == "claude 초안"
+    assert engine.speculation.stats["kept"] == 1 and engine.speculation.stats["cancelled"] == 1
+
+
+def test_no_speculation_when_author_is_extracted():
+    execute, events = collaborative_execute("gemini")
+    engine, run = run_graph(load_workflow("collaborative"), execute, SPECULATION)
+
+    assert events == [("draft_started", "gemini")]
+    assert run.results["draft_author"].extracted_from == "gemini_analysis"
+    assert engine.speculation.stats["speculated"] == 0
+
+
+def score_graph() -> WorkflowGraph:
+    return WorkflowGraph.from_dict({
+        "nodes": [
+            {"id": "result", "backend": "gemini", "prompt": "{task}"},
+            {"id": "gemini_score", "backend": "gemini", "inputs": ["result"], "prompt": "점수 {result}",
+             "output": {"type": "score", "min": 1, "max": 10}},
+            {"id": "claude_score", "backend": "claude", "inputs": ["result"], "prompt": "점수 {result}",
+             "output": {"type": "score", "min": 1, "max": 10}}
+        ],
+        "result": "result",
+        "quality": ["gemini_score", "claude_score"],
+        "default_quality_score": 8.0
+    })
+
+
+def test_quality_score_averages_present_scores():
+    async def execute(backend, prompt, on_chunk=None):
+        score = {"gemini": "6", "claude": "잘 모르겠습니다"}[backend]
+        return {"success": True, "result": score if prompt.startswith("점수") else "결과", "ai": backend}
+
+    _, run = run_graph(score_graph(), execute)
+
+    assert run.quality_score() == 6
+    assert run.missing_quality_scores() == ["claude_score"]
+
+
+def test_quality_score_default_when_all_missing():
+    async def execute(backend, prompt, on_chunk=None):
+        return {"success": False, "result": "", "error": "실패", "ai": backend}
+
+    _, run = run_graph(score_graph(), execute)
+
+    assert run.quality_score() == 8.0
+    assert run.missing_quality_scores() == ["gemini_score", "claude_score"]